@@ -0,0 +1,257 @@
+"""Asyncio-facing lookup API over the generated datasets.
+
+All consumers in a process share one :class:`DataIndex`.  The initial
+load (file reads plus JSON decoding) runs in a worker thread so the
+event loop keeps serving while data comes in.  Lookups submitted during
+the same loop iteration are queued, identical ones are coalesced onto a
+single future, and the whole batch is resolved in one pass.  Per-operation
+latency histograms are kept for monitoring.
+
+Returned records are shared with the index and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import random
+import re
+import time
+from concurrent.futures import Executor
+from typing import Any
+
+from data_store import DATA_DIR, canonical_name, collect_tables, load_dataset
+from parsers.monster_index import load_monster_lookup
+from parsers.spell_index import load_spell_index
+
+# Upper bounds (seconds) of latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+
+_DIE_RE = re.compile(r"(\d*)d(\d+|%)", re.IGNORECASE)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate quantiles."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket containing the *q* quantile."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"<={b * 1e6:g}us" for b in self.bounds] + [f">{self.bounds[-1] * 1e6:g}us"]
+        return {
+            "count": self.count,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "max_s": self.max,
+            "p50_s": self.quantile(0.50),
+            "p95_s": self.quantile(0.95),
+            "p99_s": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def _first_cell_matches(cell: Any, value: int) -> bool:
+    if isinstance(cell, list):
+        return value in cell
+    text = str(cell).strip()
+    if text.endswith("+") and text[:-1].isdigit():
+        return value >= int(text[:-1])
+    if text.isdigit():
+        n = int(text)
+        return (100 if n == 0 else n) == value
+    return False
+
+
+class DataIndex:
+    """In-memory lookup structures built once from ``data/``."""
+
+    def __init__(self, data_dir: str = DATA_DIR) -> None:
+        self.data_dir = data_dir
+        self.monsters = load_monster_lookup(data_dir)
+
+        self.spells: dict[str, dict[str, Any]] = {}
+        for spell in load_dataset("spells", data_dir) or []:
+            for name in (spell.get("name_clean", ""), spell.get("name", "")):
+                self.spells.setdefault(canonical_name(name), spell)
+
+        spell_index = load_spell_index(data_dir)
+        self.spells_by_class_level: dict[tuple[str, int], tuple[dict[str, Any], ...]] = {}
+        for class_key, levels in spell_index.get("by_class_level", {}).items():
+            for level, entries in levels.items():
+                self.spells_by_class_level[(class_key, int(level))] = tuple(
+                    spell_index["spells"][e["spell_id"]] for e in entries if e.get("spell_id")
+                )
+
+        self.tables = {key: table for key, (_, table) in collect_tables(data_dir).items()}
+
+    def monster(self, name: str) -> dict[str, Any] | None:
+        return self.monsters.get(canonical_name(name))
+
+    def spell(self, name: str) -> dict[str, Any] | None:
+        return self.spells.get(canonical_name(name))
+
+    def spells_for(self, class_key: str, level: int) -> tuple[dict[str, Any], ...]:
+        return self.spells_by_class_level.get((class_key, int(level)), ())
+
+    def table(self, name: str) -> dict[str, Any] | None:
+        return self.tables.get(canonical_name(name))
+
+    def roll_table(self, name: str, roll: int | None = None, rng: random.Random | None = None) -> dict[str, Any] | None:
+        """Roll on a table by the die in its first header cell and return the matching row."""
+        table = self.table(name)
+        if table is None:
+            return None
+        headers = table.get("headers", [])
+        if roll is None:
+            m = _DIE_RE.search(str(headers[0])) if headers else None
+            if m is None:
+                return None
+            count = int(m.group(1) or 1)
+            sides = 100 if m.group(2) == "%" else int(m.group(2))
+            r = rng or random
+            roll = sum(r.randint(1, sides) for _ in range(count))
+        for row in table.get("rows", []):
+            if row and _first_cell_matches(row[0], roll):
+                return {"table_name": table.get("table_name", name), "roll": roll, "row": row}
+        return {"table_name": table.get("table_name", name), "roll": roll, "row": None}
+
+
+class AsyncDataAPI:
+    """Batched, coalescing async front end to a shared :class:`DataIndex`."""
+
+    OPERATIONS = ("monster", "spell", "spells_for", "table", "roll_table")
+
+    def __init__(self, data_dir: str = DATA_DIR, executor: Executor | None = None) -> None:
+        self.data_dir = data_dir
+        self.executor = executor
+        self.index: DataIndex | None = None
+        self.histograms = {op: LatencyHistogram() for op in self.OPERATIONS}
+        self.histograms["load"] = LatencyHistogram()
+        self.coalesced = 0
+        self.batches = 0
+        self._load_task: asyncio.Task | None = None
+        self._pending: dict[tuple, tuple[asyncio.Future, float]] = {}
+        self._flush_scheduled = False
+
+    async def load(self) -> DataIndex:
+        """Load the index once; concurrent callers share the same load."""
+        if self.index is not None:
+            return self.index
+        if self._load_task is None:
+            self._load_task = asyncio.ensure_future(self._load())
+        return await asyncio.shield(self._load_task)
+
+    async def _load(self) -> DataIndex:
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        self.index = await loop.run_in_executor(self.executor, DataIndex, self.data_dir)
+        self.histograms["load"].record(time.perf_counter() - start)
+        return self.index
+
+    def _submit(self, key: tuple) -> asyncio.Future:
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return pending[0]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = (future, time.perf_counter())
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self.batches += 1
+        index = self.index
+        for key, (future, submitted) in pending.items():
+            if future.cancelled():
+                continue
+            op, args = key[0], key[1:]
+            try:
+                future.set_result(getattr(index, op)(*args))
+            except Exception as e:
+                future.set_exception(e)
+            self.histograms[op].record(time.perf_counter() - submitted)
+
+    async def _query(self, op: str, *args: Any) -> Any:
+        await self.load()
+        return await self._submit((op, *args))
+
+    async def monster(self, name: str) -> dict[str, Any] | None:
+        return await self._query("monster", canonical_name(name))
+
+    async def spell(self, name: str) -> dict[str, Any] | None:
+        return await self._query("spell", canonical_name(name))
+
+    async def spells_for(self, class_key: str, level: int) -> tuple[dict[str, Any], ...]:
+        return await self._query("spells_for", class_key, int(level))
+
+    async def table(self, name: str) -> dict[str, Any] | None:
+        return await self._query("table", canonical_name(name))
+
+    async def roll_table(self, name: str, roll: int | None = None) -> dict[str, Any] | None:
+        # Rolls without a fixed value are random and must not be coalesced.
+        if roll is None:
+            await self.load()
+            start = time.perf_counter()
+            result = self.index.roll_table(name)
+            self.histograms["roll_table"].record(time.perf_counter() - start)
+            return result
+        return await self._query("roll_table", canonical_name(name), int(roll))
+
+    async def batch(self, queries: list[tuple]) -> list[Any]:
+        """Run many ``(operation, *args)`` queries concurrently, preserving order."""
+        for query in queries:
+            if query[0] not in self.OPERATIONS:
+                raise ValueError(f"Unknown query operation: {query[0]}")
+        return list(await asyncio.gather(*(getattr(self, q[0])(*q[1:]) for q in queries)))
+
+    def latency_histograms(self) -> dict[str, dict[str, Any]]:
+        return {op: h.snapshot() for op, h in self.histograms.items() if h.count}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "latency": self.latency_histograms(),
+        }
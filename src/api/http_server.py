@@ -0,0 +1,192 @@
+"""Read-only local HTTP API over the generated datasets.
+
+Every response is serialized and gzip-compressed once at startup, keyed
+by request path, so serving a request is a dict lookup plus a write of
+cached bytes.  ETags are strong and derived from the build manifest's
+per-file digests; clients revalidating with ``If-None-Match`` get 304s.
+
+Routes:
+
+- ``/datasets``: names of all datasets
+- ``/data/<dataset>``: a whole dataset file
+- ``/monsters/<name>``, ``/spells/<name>``, ``/tables/<name>``: single records
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, NamedTuple
+from urllib.parse import unquote, urlsplit
+
+from data_store import DATA_DIR, canonical_name, collect_tables, dataset_names, load_dataset, load_manifest
+from parsers.monster_index import load_monster_lookup
+
+# Bodies smaller than this are not worth compressing.
+GZIP_MIN_BYTES = 256
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    gzip_body: bytes | None
+    etag: str
+    status: int = 200
+
+
+def _serialize(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _etag(source_digest: str, path: str) -> str:
+    return hashlib.sha256(f"{source_digest}:{path}".encode("utf-8")).hexdigest()[:32]
+
+
+def _cached(value: Any, source_digest: str, path: str, status: int = 200) -> CachedResponse:
+    body = _serialize(value)
+    gzip_body = None
+    if len(body) >= GZIP_MIN_BYTES:
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            gzip_body = compressed
+    return CachedResponse(body, gzip_body, _etag(source_digest, path), status)
+
+
+def build_routes(data_dir: str = DATA_DIR) -> dict[str, CachedResponse]:
+    """Pre-render every servable response, keyed by canonical request path."""
+    manifest = load_manifest(data_dir)
+    digests = {name: entry["sha256"] for name, entry in manifest.get("files", {}).items()}
+    build_digest = manifest.get("digest", "")
+
+    routes: dict[str, CachedResponse] = {}
+    names = dataset_names(data_dir)
+    routes["/datasets"] = _cached(names, build_digest, "/datasets")
+
+    for name in names:
+        path = f"/data/{name}"
+        routes[path] = _cached(load_dataset(name, data_dir), digests.get(f"{name}.json", build_digest), path)
+
+    # Every alias (including cross-reference-only names) serves the canonical record.
+    monsters_digest = digests.get("monsters.json", build_digest)
+    for alias, monster in load_monster_lookup(data_dir).items():
+        path = f"/monsters/{alias}"
+        routes[path] = _cached(monster, monsters_digest, path)
+
+    spells_digest = digests.get("spells.json", build_digest)
+    for spell in load_dataset("spells", data_dir) or []:
+        for name in (spell.get("name_clean", ""), spell.get("name", "")):
+            path = f"/spells/{canonical_name(name)}"
+            if path not in routes:
+                routes[path] = _cached(spell, spells_digest, path)
+
+    for key, (source, table) in collect_tables(data_dir).items():
+        path = f"/tables/{key}"
+        routes[path] = _cached(table, digests.get(f"{source}.json", build_digest), path)
+
+    return routes
+
+
+def canonical_path(raw_path: str) -> str:
+    """Normalize a request path so record names match case/punctuation-insensitively."""
+    path = unquote(urlsplit(raw_path).path).rstrip("/") or "/"
+    parts = path.split("/", 2)
+    if len(parts) == 3 and parts[1] in {"monsters", "spells", "tables"}:
+        return f"/{parts[1]}/{canonical_name(parts[2])}"
+    return path
+
+
+def accepts_gzip(header: str) -> bool:
+    """True if an ``Accept-Encoding`` header allows gzip: listed, or covered by ``*``, with q > 0."""
+    weights: dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        tag = candidate.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag in {etag, f"{etag}-gzip"}:
+            return True
+    return False
+
+
+def make_handler(routes: dict[str, CachedResponse]) -> type[BaseHTTPRequestHandler]:
+    not_found = _cached({"error": "not found"}, "", "/404", status=404)
+
+    class DataRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "bfrpg-data"
+
+        def _send(self, include_body: bool) -> None:
+            cached = routes.get(canonical_path(self.path), not_found)
+            use_gzip = cached.gzip_body is not None and accepts_gzip(self.headers.get("Accept-Encoding", ""))
+            etag = f"{cached.etag}-gzip" if use_gzip else cached.etag
+
+            if cached.status == 200 and _etag_matches(self.headers.get("If-None-Match", ""), cached.etag):
+                self.send_response(304)
+                self.send_header("ETag", f'"{etag}"')
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return
+
+            body = cached.gzip_body if use_gzip else cached.body
+            self.send_response(cached.status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", f'"{etag}"')
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            if include_body:
+                self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            self._send(include_body=True)
+
+        def do_HEAD(self) -> None:
+            self._send(include_body=False)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return DataRequestHandler
+
+
+def create_server(data_dir: str = DATA_DIR, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    routes = build_routes(data_dir)
+    return ThreadingHTTPServer((host, port), make_handler(routes))
+
+
+def serve(data_dir: str = DATA_DIR, host: str = "127.0.0.1", port: int = 8000) -> None:
+    server = create_server(data_dir, host, port)
+    print(f"Serving {data_dir}/ at http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,175 @@
+"""Result cache for derived queries over the generated datasets.
+
+Entries are keyed by the normalized query plus the manifest digests of
+the dataset files the query reads.  Rebuilding ``data/`` therefore
+invalidates only entries whose inputs actually changed.  The cache is a
+size-bounded LRU, can persist itself to a JSON file between processes,
+and keeps hit/miss/eviction/invalidation counters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from data_store import DATA_DIR, load_manifest
+
+CACHE_VERSION = 2
+
+
+def normalize_query(query: Any) -> Any:
+    """Canonicalize a query's structure: sort mapping keys, turn tuples into lists.
+
+    Equivalent queries built in different ways share one cache entry.
+    String values are kept as they are: results can depend on their case
+    or spacing, so normalizing them is up to the caller.
+    """
+    if isinstance(query, dict):
+        return {str(k): normalize_query(v) for k, v in sorted(query.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(query, (list, tuple)):
+        return [normalize_query(v) for v in query]
+    return query
+
+
+def _dataset_file(name: str) -> str:
+    return name if name.endswith(".json") else f"{name}.json"
+
+
+class QueryCache:
+    """Size-bounded LRU cache invalidated by dataset digests."""
+
+    def __init__(
+        self,
+        data_dir: str = DATA_DIR,
+        max_entries: int = 1024,
+        persist_path: str | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.data_dir = data_dir
+        self.max_entries = max_entries
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._digests: dict[str, str] = {}
+        self.refresh_manifest()
+        if self.persist_path is not None and self.persist_path.exists():
+            self.load()
+
+    def refresh_manifest(self) -> int:
+        """Re-read the manifest and drop entries built from changed files.
+
+        Returns the number of entries invalidated.
+        """
+        manifest = load_manifest(self.data_dir)
+        digests = {name: entry["sha256"] for name, entry in manifest.get("files", {}).items()}
+        with self._lock:
+            self._digests = digests
+            return self._drop_stale()
+
+    def _drop_stale(self) -> int:
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if any(self._digests.get(f) != d for f, d in entry["depends_on"].items())
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def _key(self, query: Any, depends_on: Iterable[str]) -> tuple[str, dict[str, str | None]]:
+        deps = {f: self._digests.get(f) for f in sorted({_dataset_file(d) for d in depends_on})}
+        material = json.dumps({"q": normalize_query(query), "deps": deps}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest(), deps
+
+    def get(self, query: Any, depends_on: Iterable[str]) -> tuple[bool, Any]:
+        """Return ``(found, value)`` for a query, updating LRU order and metrics."""
+        key, _ = self._key(query, depends_on)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry["value"]
+
+    def put(self, query: Any, depends_on: Iterable[str], value: Any) -> None:
+        key, deps = self._key(query, depends_on)
+        with self._lock:
+            self._entries[key] = {"depends_on": deps, "value": value}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, query: Any, depends_on: Iterable[str], compute: Callable[[], Any]) -> Any:
+        """Return the cached result for *query*, computing and storing it on a miss."""
+        depends_on = list(depends_on)
+        found, value = self.get(query, depends_on)
+        if found:
+            return value
+        value = compute()
+        self.put(query, depends_on, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def save(self) -> None:
+        """Write entries (oldest first) to ``persist_path``; values must be JSON-serializable."""
+        if self.persist_path is None:
+            return
+        with self._lock:
+            payload = {
+                "version": CACHE_VERSION,
+                "entries": [[key, entry] for key, entry in self._entries.items()],
+            }
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.persist_path.with_name(self.persist_path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.persist_path)
+
+    def load(self) -> int:
+        """Load persisted entries, discarding any built from stale data files."""
+        if self.persist_path is None or not self.persist_path.exists():
+            return 0
+        try:
+            payload = json.loads(self.persist_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return 0
+        if payload.get("version") != CACHE_VERSION:
+            return 0
+        with self._lock:
+            for key, entry in payload.get("entries", []):
+                self._entries[key] = entry
+            self._drop_stale()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return len(self._entries)
@@ -0,0 +1,181 @@
+"""Build several manual exports (releases, supplements) in one run.
+
+Each document is a manual HTML export plus the directory its data goes
+to.  Every document gets the full build (:func:`build.run_build`, phases
+2-7) into its own directory; nothing is shared between output
+directories, so one document's phase 6 reads the phase-2 tables it just
+wrote, not another document's.
+
+Documents come from a JSON list (``--manifest``)::
+
+    [
+      {"name": "r142", "html": "manual/Basic-Fantasy-RPG-Rules-r142.html", "data_dir": "data"},
+      {"name": "r139", "html": "manual/Basic-Fantasy-RPG-Rules-r139.html", "data_dir": "builds/r139"}
+    ]
+
+or from ``--doc HTML=DATA_DIR`` arguments, named after the HTML file.
+
+With ``--workers N`` the documents are built in a pool of worker
+processes.  The parent imports the parsers and bs4/lxml before the pool
+starts, so forked workers inherit the loaded modules and the patterns
+compiled at import time instead of importing them once per document.
+The indexes the build derives (spell and monster indexes, the element
+records) are specific to each document and are built by its worker.
+A document that fails is reported as an error; the others still build.
+
+The per-document validation reports (``validation_report.json``) are
+collected into one report: the batch passes only when every document
+built and passed validation.
+
+    python src/cli.py batch --manifest documents.json --workers 4 --report batch_report.json
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from build import phase_functions, profiled_functions, run_build
+from extract_text import shared_documents, shared_key
+from parsers.data_validation import VALIDATION_REPORT
+
+
+class Document(NamedTuple):
+    name: str
+    html_path: str
+    data_dir: str
+
+
+class DocumentResult(NamedTuple):
+    name: str
+    status: str  # "pass", "fail" (validation) or "error" (the build raised)
+    seconds: float
+    results: dict[int, Any]
+    report: dict[str, Any] | None
+    error: str | None
+
+
+def parse_document_spec(spec: str) -> Document:
+    """``HTML=DATA_DIR`` as a :class:`Document` named after the HTML file."""
+    html_path, sep, data_dir = spec.partition("=")
+    if not sep or not html_path or not data_dir:
+        raise ValueError(f"Expected HTML=DATA_DIR, got: {spec}")
+    return Document(Path(html_path).stem, html_path, data_dir)
+
+
+def load_documents(path: str) -> list[Document]:
+    """Documents listed in the JSON file at *path*."""
+    entries = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: expected a list of documents")
+    documents = []
+    for i, entry in enumerate(entries):
+        missing = [key for key in ("html", "data_dir") if not entry.get(key)]
+        if missing:
+            raise ValueError(f"{path}: document {i} has no {missing[0]}")
+        documents.append(Document(entry.get("name") or Path(entry["html"]).stem, entry["html"], entry["data_dir"]))
+    return documents
+
+
+def check_documents(documents: list[Document]) -> None:
+    """Raise ValueError for duplicate names or output directories shared by two documents."""
+    names: set[str] = set()
+    dirs: dict[Path, str] = {}
+    for doc in documents:
+        if doc.name in names:
+            raise ValueError(f"Duplicate document name: {doc.name}")
+        names.add(doc.name)
+        out = Path(doc.data_dir).resolve()
+        if out in dirs:
+            raise ValueError(f"Documents {dirs[out]} and {doc.name} both write to {doc.data_dir}")
+        dirs[out] = doc.name
+
+
+def build_document(doc: Document, phases: list[int] | None = None) -> DocumentResult:
+    """Build *doc* into its data directory; errors are returned, not raised."""
+    start = time.perf_counter()
+    try:
+        Path(doc.data_dir).mkdir(parents=True, exist_ok=True)
+        with shared_documents() as cache:
+            results = run_build(doc.data_dir, doc.html_path, phases)
+            for kind in ("soup", "elements"):
+                cache.pop(shared_key(doc.html_path, kind), None)  # keep one document in memory at a time
+    except Exception as e:
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+        return DocumentResult(doc.name, "error", time.perf_counter() - start, {}, None, error)
+    report_path = Path(doc.data_dir) / VALIDATION_REPORT
+    validated = 7 in results and report_path.exists()  # not an older report left in data_dir
+    report = json.loads(report_path.read_text(encoding="utf-8")) if validated else None
+    status = "pass" if report is None or report["summary"]["status"] == "pass" else "fail"
+    return DocumentResult(doc.name, status, time.perf_counter() - start, results, report, None)
+
+
+def _build_one(args: tuple[Document, list[int] | None]) -> DocumentResult:
+    return build_document(*args)
+
+
+def run_batch(
+    documents: list[Document],
+    workers: int = 1,
+    phases: list[int] | None = None,
+    report: Callable[[DocumentResult], None] | None = None,
+) -> list[DocumentResult]:
+    """Build every document, across *workers* processes when more than one; results in input order."""
+    check_documents(documents)
+    results: list[DocumentResult] = []
+
+    def _done(result: DocumentResult) -> None:
+        results.append(result)
+        if report:
+            report(result)
+
+    if workers > 1 and len(documents) > 1:
+        # Imported here so forked workers inherit them already loaded.
+        phase_functions()
+        profiled_functions()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(max_workers=min(workers, len(documents)), mp_context=context) as pool:
+            for result in pool.map(_build_one, [(doc, phases) for doc in documents]):
+                _done(result)
+    else:
+        for doc in documents:
+            _done(build_document(doc, phases))
+    return results
+
+
+def aggregate_reports(documents: list[Document], results: list[DocumentResult]) -> dict[str, Any]:
+    """One report for the batch: a summary plus each document's status and validation summary."""
+    entries: dict[str, Any] = {}
+    critical = warning = 0
+    for doc, result in zip(documents, results):
+        summary = result.report["summary"] if result.report else {}
+        critical += summary.get("critical_count", 0)
+        warning += summary.get("warning_count", 0)
+        entries[doc.name] = {
+            "html": doc.html_path,
+            "data_dir": doc.data_dir,
+            "status": result.status,
+            "seconds": round(result.seconds, 3),
+            "validation": summary or None,
+            "issues": result.report["issues"] if result.report else [],
+            "error": result.error,
+        }
+    counts = {status: sum(r.status == status for r in results) for status in ("pass", "fail", "error")}
+    return {
+        "summary": {
+            "documents": len(results),
+            "passed": counts["pass"],
+            "failed": counts["fail"],
+            "errors": counts["error"],
+            "critical_count": critical,
+            "warning_count": warning,
+            "status": "pass" if counts["pass"] == len(results) else "fail",
+        },
+        "documents": entries,
+    }
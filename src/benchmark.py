@@ -0,0 +1,362 @@
+"""Timing harness for the extraction pipeline.
+
+Each target is one stage of the build: ``load_html``, ``iter_elements``,
+``load_elements``, every ``parse_*`` function (fed the element records
+or part blocks that the phase would build), every ``write_*`` phase entry point and
+``run_phase7``.  A target is called ``warmup`` times untimed and then
+``repeat`` times under :func:`time.perf_counter`.
+
+Runs are appended to a JSON history file together with machine metadata
+(platform, CPU count, Python and library versions, git commit), so any
+two runs can be compared:
+
+    python src/benchmark.py run --label before
+    python src/benchmark.py run --label after
+    python src/benchmark.py compare before after
+
+Targets that need the manual HTML are skipped when it is missing;
+``run_phase7`` only needs ``data/`` and works on a scratch copy of it.
+With ``--scale N`` the HTML targets run against a synthetic manual
+(:mod:`synthetic_manual`) holding N copies of every record list.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from data_store import DATA_DIR
+from extract_text import HTML_PATH, iter_elements, load_elements, load_html
+
+HISTORY_PATH = "bench_history.json"
+LIBRARIES = ("beautifulsoup4", "lxml", "numpy")
+
+
+class Target(NamedTuple):
+    group: str  # "load", "parse", "write" or "validate"
+    name: str
+    fn: Callable[[], Any]
+
+
+class BenchResult(NamedTuple):
+    group: str
+    name: str
+    times: tuple[float, ...]  # seconds per timed call
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.times)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "group": self.group,
+            "name": self.name,
+            "times": list(self.times),
+            "min": self.min,
+            "median": self.median,
+            "mean": self.mean,
+            "stdev": self.stdev,
+        }
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> tuple[float, ...]:
+    """Call *fn* ``warmup`` times untimed, then return ``repeat`` wall-clock timings."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return tuple(times)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def machine_metadata() -> dict[str, Any]:
+    versions = {}
+    for lib in LIBRARIES:
+        try:
+            versions[lib] = metadata.version(lib)
+        except metadata.PackageNotFoundError:
+            versions[lib] = None
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "libraries": versions,
+        "git_commit": _git_commit(),
+    }
+
+
+def extraction_targets(html_path: str, scratch_dir: str) -> list[Target]:
+    """Targets that read the manual HTML; *scratch_dir* receives ``write_*`` output."""
+    from parsers import characters_and_encounters as phase6
+    from parsers import monsters as phase4
+    from parsers import rules_tables as phase2
+    from parsers import spells as phase3
+    from parsers import treasure as phase5
+
+    soup = load_html(html_path)
+    elements = load_elements(html_path)
+    part2 = phase6._collect_blocks(elements, 2, 3)
+    part5 = phase6._collect_blocks(elements, 5, 6)
+    part7 = phase5._collect_part7_blocks(elements)
+    part8 = phase6._collect_blocks(elements, 8, 9)
+
+    targets = [
+        Target("load", "load_html", lambda: load_html(html_path)),
+        Target("load", "iter_elements", lambda: list(iter_elements(soup))),
+        Target("load", "load_elements", lambda: load_elements(html_path)),
+        Target("load", "collect_part7_blocks", lambda: phase5._collect_part7_blocks(elements)),
+        Target("load", "collect_blocks", lambda: phase6._collect_blocks(elements, 2, 3)),
+    ]
+    for name in (
+        "parse_weapons",
+        "parse_armor",
+        "parse_equipment",
+        "parse_vehicles",
+        "parse_class_tables",
+        "parse_saving_throws",
+        "parse_thief_abilities",
+        "parse_attack_bonus",
+    ):
+        targets.append(Target("parse", name, lambda fn=getattr(phase2, name): fn(elements)))
+    targets += [
+        Target("parse", "parse_turning_undead", lambda: phase2.parse_turning_undead(elements)),
+        Target("parse", "parse_spells", lambda: phase3.parse_spells(elements)),
+        Target("parse", "parse_spell_list", lambda: phase3.parse_spell_list(elements)),
+        Target("parse", "parse_monsters", lambda: phase4.parse_monsters(elements)),
+        Target("parse", "parse_treasure_types", lambda: phase5.parse_treasure_types(part7)),
+        Target("parse", "parse_magic_item_tables", lambda: phase5.parse_magic_item_tables(part7)),
+        Target("parse", "parse_magic_items", lambda: phase5.parse_magic_items(part7)),
+        Target("parse", "parse_races", lambda: phase6.parse_races(part2)),
+        Target("parse", "parse_classes", lambda: phase6.parse_classes(part2)),
+        Target("parse", "parse_encounters", lambda: phase6.parse_encounters(part8)),
+        Target("parse", "parse_combat_tables", lambda: phase6.parse_combat_tables(part2, part5)),
+    ]
+    for name, fn in (
+        ("write_phase2_outputs", phase2.write_phase2_outputs),
+        ("write_phase3_outputs", phase3.write_phase3_outputs),
+        ("write_phase4_output", phase4.write_phase4_output),
+        ("write_phase5_outputs", phase5.write_phase5_outputs),
+        ("write_phase6_outputs", phase6.write_phase6_outputs),
+    ):
+        targets.append(Target("write", name, lambda fn=fn: fn(scratch_dir, html_path)))
+    return targets
+
+
+def validation_targets(data_dir: str, scratch_dir: str) -> list[Target]:
+    """``run_phase7`` against a copy of *data_dir*, so the real outputs are untouched."""
+    from parsers.data_validation import run_phase7
+
+    copy = Path(scratch_dir) / "phase7"
+    shutil.copytree(data_dir, copy, dirs_exist_ok=True)
+    return [Target("validate", "run_phase7", lambda: run_phase7(str(copy)))]
+
+
+def run_benchmarks(
+    html_path: str = HTML_PATH,
+    data_dir: str = DATA_DIR,
+    repeat: int = 5,
+    warmup: int = 1,
+    only: str | None = None,
+    progress: Callable[[BenchResult], None] | None = None,
+    scale: int | None = None,
+) -> tuple[list[BenchResult], list[str]]:
+    """Time every target; returns (results, names of skipped targets or groups).
+
+    With *scale*, *html_path* is replaced by a synthetic manual of that
+    scale rendered from *data_dir*.
+    """
+    pattern = re.compile(only) if only else None
+    results: list[BenchResult] = []
+    skipped: list[str] = []
+    with tempfile.TemporaryDirectory() as scratch:
+        if scale is not None:
+            from synthetic_manual import write_manual
+
+            html_path = str(Path(scratch) / f"synthetic-x{scale}.html")
+            write_manual(html_path, scale, data_dir)
+        targets: list[Target] = []
+        if Path(html_path).exists():
+            targets += extraction_targets(html_path, scratch)
+        else:
+            skipped.append(f"load/parse/write (missing {html_path})")
+        if Path(data_dir).is_dir():
+            targets += validation_targets(data_dir, scratch)
+        else:
+            skipped.append(f"run_phase7 (missing {data_dir})")
+
+        for target in targets:
+            if pattern and not pattern.search(target.name):
+                continue
+            result = BenchResult(target.group, target.name, time_call(target.fn, repeat, warmup))
+            results.append(result)
+            if progress:
+                progress(result)
+    return results, skipped
+
+
+def load_history(path: str = HISTORY_PATH) -> list[dict[str, Any]]:
+    p = Path(path)
+    if not p.exists():
+        return []
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def append_history(
+    results: list[BenchResult],
+    path: str = HISTORY_PATH,
+    label: str | None = None,
+    settings: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Append one run (results plus machine metadata) to the history file and return it."""
+    history = load_history(path)
+    run = {
+        "label": label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_metadata(),
+        "settings": settings or {},
+        "results": [r.as_dict() for r in results],
+    }
+    history.append(run)
+    Path(path).write_text(json.dumps(history, indent=2) + "\n", encoding="utf-8")
+    return run
+
+
+def find_run(history: list[dict[str, Any]], ref: str) -> dict[str, Any]:
+    """A run by label (latest match wins) or by index into the history (e.g. "-1")."""
+    for run in reversed(history):
+        if run.get("label") == ref:
+            return run
+    try:
+        return history[int(ref)]
+    except (ValueError, IndexError):
+        raise ValueError(f"No benchmark run matching: {ref}") from None
+
+
+def compare_runs(before: dict[str, Any], after: dict[str, Any]) -> list[dict[str, Any]]:
+    """Per-target median timings of two runs; ``ratio`` > 1 means *after* is slower."""
+    old = {r["name"]: r for r in before.get("results", [])}
+    rows = []
+    for result in after.get("results", []):
+        prev = old.get(result["name"])
+        if prev is None:
+            continue
+        rows.append(
+            {
+                "name": result["name"],
+                "before": prev["median"],
+                "after": result["median"],
+                "ratio": result["median"] / prev["median"] if prev["median"] else float("inf"),
+            }
+        )
+    return rows
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def _print_result(result: BenchResult) -> None:
+    print(
+        f"{result.group:<9}{result.name:<26}"
+        f"median {_format_seconds(result.median):>10}  min {_format_seconds(result.min):>10}"
+        f"  stdev {_format_seconds(result.stdev):>10}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="time every target and append the results to the history")
+    run.add_argument("--html", default=HTML_PATH)
+    run.add_argument("--scale", type=int, help="benchmark a synthetic manual of this scale instead of --html")
+    run.add_argument("--data-dir", default=DATA_DIR)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--only", help="regex on target names")
+    run.add_argument("--label")
+    run.add_argument("--history", default=HISTORY_PATH)
+
+    compare = sub.add_parser("compare", help="compare two runs by label or history index")
+    compare.add_argument("before", nargs="?", default="-2")
+    compare.add_argument("after", nargs="?", default="-1")
+    compare.add_argument("--history", default=HISTORY_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results, skipped = run_benchmarks(
+            args.html, args.data_dir, args.repeat, args.warmup, args.only, _print_result, args.scale
+        )
+        for name in skipped:
+            print(f"skipped  {name}")
+        settings = {"html": args.html, "scale": args.scale, "repeat": args.repeat, "warmup": args.warmup, "only": args.only}
+        append_history(results, args.history, args.label, settings)
+        print(f"{len(results)} targets recorded in {args.history}")
+        return 0
+
+    history = load_history(args.history)
+    try:
+        before, after = find_run(history, args.before), find_run(history, args.after)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{before.get('label') or before['timestamp']} -> {after.get('label') or after['timestamp']}")
+    for row in compare_runs(before, after):
+        print(
+            f"{row['name']:<26}{_format_seconds(row['before']):>10} -> {_format_seconds(row['after']):>10}"
+            f"  x{row['ratio']:.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+"""Run the build phases (2-7) in one process, optionally under the profiler.
+
+The ``generate_*.py`` scripts run one phase each; this runs the same
+phase entry points in order (``make build`` calls it through
+``cli.py build-all``), which lets ``--profile`` trace the whole build:
+
+    python src/build.py --profile
+
+With ``--profile`` every phase, every ``parse_*`` function and the key
+helpers (``load_elements``, ``parse_fragment``, ``elements_between``,
+``table_to_rows``, ``cleanup_payload``, ``run_validation``) are recorded
+as spans.  A
+Chrome trace and a text summary go to ``build_profile/``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+from extract_text import HTML_PATH
+from profiling import Profiler
+
+PROFILE_DIR = "build_profile"
+
+PHASE_NAMES = {
+    2: "rules_tables",
+    3: "spells",
+    4: "monsters",
+    5: "treasure",
+    6: "characters_and_encounters",
+    7: "data_validation",
+}
+
+# Helpers whose spans are split by an argument, to attribute cost per section or dataset.
+PROFILE_LABELS: dict[str, Callable[..., Any]] = {
+    "elements_between": lambda elements, start_header, *args, **kwargs: start_header,
+    "elements_between_parts": lambda elements, start_part, *args, **kwargs: start_part,
+    "cleanup_payload": lambda name, *args, **kwargs: name,
+}
+
+
+def phase_functions() -> dict[int, Callable[[str, str], Any]]:
+    """Entry point per phase, called as ``fn(data_dir, html_path)``."""
+    from parsers.characters_and_encounters import write_phase6_outputs
+    from parsers.data_validation import run_phase7
+    from parsers.monsters import write_phase4_output
+    from parsers.rules_tables import write_phase2_outputs
+    from parsers.spells import write_phase3_outputs
+    from parsers.treasure import write_phase5_outputs
+
+    return {
+        2: write_phase2_outputs,
+        3: write_phase3_outputs,
+        4: write_phase4_output,
+        5: write_phase5_outputs,
+        6: write_phase6_outputs,
+        7: lambda data_dir, html_path: run_phase7(data_dir),
+    }
+
+
+def profiled_functions() -> dict[str, Callable[..., Any]]:
+    """Helpers and parsers traced in ``--profile`` builds, by span name."""
+    import extract_text
+    import section_navigation
+    from parsers import characters_and_encounters, data_validation, monsters, output_cleanup, rules_tables, spells, treasure
+
+    functions: dict[str, Callable[..., Any]] = {
+        "load_html": extract_text.load_html,
+        "load_elements": extract_text.load_elements,
+        "parse_fragment": extract_text.parse_fragment,
+        "table_to_rows": extract_text.table_to_rows,
+        "elements_between": section_navigation.elements_between,
+        "elements_between_parts": section_navigation.elements_between_parts,
+        "cleanup_payload": output_cleanup.cleanup_payload,
+        "run_validation": data_validation.run_validation,
+    }
+    for module in (rules_tables, spells, monsters, treasure, characters_and_encounters):
+        for name, value in vars(module).items():
+            if name.startswith("parse_") and callable(value) and value.__module__ == module.__name__:
+                functions[name] = value
+    return functions
+
+
+def run_build(
+    data_dir: str = "data",
+    html_path: str = HTML_PATH,
+    phases: list[int] | None = None,
+    profiler: Profiler | None = None,
+) -> dict[int, Any]:
+    """Run *phases* (default: all) in order; returns each phase's summary."""
+    phases = sorted(phases or PHASE_NAMES)
+    unknown = [p for p in phases if p not in PHASE_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown build phase: {unknown[0]}")
+    if any(p < 7 for p in phases) and not Path(html_path).exists():
+        raise FileNotFoundError(f"Missing {html_path}. Export the .odt manual to HTML and place it in manual/.")
+
+    functions = phase_functions()
+    results: dict[int, Any] = {}
+    if profiler is None:
+        for phase in phases:
+            results[phase] = functions[phase](data_dir, html_path)
+        return results
+
+    profiler.start()
+    try:
+        with profiler.instrument(profiled_functions(), PROFILE_LABELS):
+            for phase in phases:
+                with profiler.span(f"phase{phase}:{PHASE_NAMES[phase]}", "phase"):
+                    results[phase] = functions[phase](data_dir, html_path)
+    finally:
+        profiler.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--html", default=HTML_PATH)
+    parser.add_argument("--phase", type=int, action="append", dest="phases", help="phase to run (repeatable)")
+    parser.add_argument("--profile", action="store_true", help="trace the build")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc when profiling")
+    args = parser.parse_args()
+
+    profiler = Profiler(memory=not args.no_memory) if args.profile else None
+    try:
+        results = run_build(args.data_dir, args.html, args.phases, profiler)
+    except (FileNotFoundError, ValueError) as e:
+        print(e, file=sys.stderr)
+        raise SystemExit(1)
+    for phase, summary in results.items():
+        print(f"phase {phase} ({PHASE_NAMES[phase]}): {summary}")
+    if profiler is not None:
+        trace_path, summary_path = profiler.write(args.profile_dir)
+        print()
+        print(profiler.format_summary(limit=25))
+        print(f"\nwrote {trace_path} and {summary_path}")
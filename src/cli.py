@@ -0,0 +1,267 @@
+"""Single entry point for building, validating, exporting and benchmarking the data.
+
+    python src/cli.py build-all
+    python src/cli.py build spells monsters
+    python src/cli.py batch --manifest documents.json --workers 4
+    python src/cli.py watch
+    python src/cli.py validate
+    python src/cli.py export bundle dist/bfrpg.json
+    python src/cli.py diff builds/r139 data
+    python src/cli.py bench run --only parse_
+
+(or ``PYTHONPATH=src python -m cli ...``).
+
+``build-all`` runs phases 2-7 in one process through
+:func:`build.run_build`, so the interpreter starts and bs4/lxml are
+imported once instead of once per ``generate_*.py`` script, and the
+manual is parsed once (``extract_text.shared_documents``).
+
+Each command imports what it needs when it runs.  ``validate``,
+``export`` and ``diff`` only read ``data/`` and never import bs4 or
+lxml, so they start in a few milliseconds.  ``--timings`` prints interpreter startup
+(process CPU time before this module ran), the time spent on each lazy
+import, the command's own run time and the peak RSS to stderr.
+"""
+
+from __future__ import annotations
+
+import time
+
+_STARTUP_CPU = time.process_time()
+_START = time.perf_counter()
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+DATA_DIR = "data"
+
+_import_times: dict[str, float] = {}
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import *name*, recording how long it took if it was not loaded yet."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times[name] = time.perf_counter() - start
+    return module
+
+
+def timings() -> dict[str, Any]:
+    return {
+        "startup_cpu_s": _STARTUP_CPU,
+        "imports_s": dict(_import_times),
+        "total_s": time.perf_counter() - _START,
+        "bs4_loaded": "bs4" in sys.modules,
+    }
+
+
+def _print_summary(title: str, summary: dict[str, Any]) -> None:
+    print(title)
+    for k, v in summary.items():
+        print(f"- {k}: {v}")
+
+
+def resolve_phases(values: list[str]) -> list[int]:
+    """Phase numbers for *values*, given as numbers (``3``) or names (``spells``)."""
+    phase_names = lazy_import("build").PHASE_NAMES
+    by_name = {name: phase for phase, name in phase_names.items()}
+    phases = []
+    for value in values:
+        key = value.replace("-", "_")
+        if key.isdigit() and int(key) in phase_names:
+            phases.append(int(key))
+        elif key in by_name:
+            phases.append(by_name[key])
+        else:
+            choices = ", ".join(f"{p} ({n})" for p, n in phase_names.items())
+            raise ValueError(f"Unknown build phase: {value} (choose from {choices})")
+    return sorted(set(phases))
+
+
+def cmd_build(args: argparse.Namespace) -> int:
+    build = lazy_import("build")
+    extract_text = lazy_import("extract_text")
+    phases = None if args.command == "build-all" else resolve_phases(args.phases)
+    profiler = lazy_import("profiling").Profiler(memory=not args.no_memory) if args.profile else None
+    with extract_text.shared_documents():
+        results = build.run_build(args.data_dir, args.html or extract_text.HTML_PATH, phases, profiler)
+    for phase, summary in results.items():
+        _print_summary(f"phase {phase} ({build.PHASE_NAMES[phase]}):", summary)
+    if profiler is not None:
+        trace_path, summary_path = profiler.write(args.profile_dir)
+        print()
+        print(profiler.format_summary(limit=25))
+        print(f"\nwrote {trace_path} and {summary_path}")
+    return 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    batch = lazy_import("batch")
+    documents = batch.load_documents(args.manifest) if args.manifest else []
+    documents += [batch.parse_document_spec(spec) for spec in args.docs or []]
+    if not documents:
+        raise ValueError("No documents: pass --manifest FILE or --doc HTML=DATA_DIR")
+    phases = resolve_phases(args.phases) if args.phases else None
+
+    def report(result: Any) -> None:
+        detail = result.error or ", ".join(f"{k}: {v}" for k, v in (result.report or {}).get("summary", {}).items())
+        print(f"[{result.status.upper()}] {result.name} ({result.seconds:.2f}s) {detail}", flush=True)
+
+    results = batch.run_batch(documents, args.workers, phases, report)
+    aggregated = batch.aggregate_reports(documents, results)
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(aggregated, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print()
+    _print_summary("batch:", aggregated["summary"])
+    return 0 if aggregated["summary"]["status"] == "pass" else 1
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    watch = lazy_import("watch")
+    html_path = args.html or lazy_import("extract_text").HTML_PATH
+    if not os.path.exists(html_path):
+        raise FileNotFoundError(f"Missing {html_path}. Export the .odt manual to HTML and place it in manual/.")
+    watcher = watch.Watcher(html_path, args.data_dir)
+
+    def report(update: Any) -> None:
+        changed = f"{', '.join(update.changed_sections)}: " if update.changed_sections else ""
+        print(
+            f"{time.strftime('%H:%M:%S')} {changed}phases {', '.join(map(str, update.phases)) or 'none'}"
+            f" (parse {update.parse_seconds:.2f}s {update.reparsed}, build {update.build_seconds:.2f}s)",
+            flush=True,
+        )
+
+    report(watcher.build())
+    print(f"watching {html_path} (Ctrl-C to stop)", flush=True)
+    try:
+        watcher.watch(args.interval, report)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    report = lazy_import("parsers.data_validation").run_validation(args.data_dir)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_summary("validation:", report["summary"])
+        for issue in report["issues"]:
+            print(f"  [{issue['severity']}] {issue['check']}: {issue['message']}")
+    return 0 if report["summary"]["status"] == "pass" else 1
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    data_export = lazy_import("data_export")
+    if args.format == "bundle":
+        summary = data_export.export_bundle(args.out, args.data_dir, args.datasets)
+    else:
+        summary = data_export.export_csv(args.out, args.data_dir, args.datasets)
+    _print_summary(f"exported {args.format}:", summary)
+    return 0
+
+
+def cmd_diff(args: argparse.Namespace) -> int:
+    data_diff = lazy_import("data_diff")
+    diffs = data_diff.diff_builds(args.old, args.new, args.datasets)
+    if args.json:
+        print(json.dumps(data_diff.diff_to_json(diffs), indent=2, ensure_ascii=False))
+    else:
+        print(data_diff.format_diff(diffs, args.width))
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    return lazy_import("benchmark").main(args.bench_args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--timings", action="store_true", help="print startup, import and run times to stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (
+        ("build-all", "run every build phase (2-7) in this process"),
+        ("build", "run the given phases, by number or name (e.g. 3, spells, rules-tables)"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        if name == "build":
+            cmd.add_argument("phases", nargs="+")
+        cmd.add_argument("--data-dir", default=DATA_DIR)
+        cmd.add_argument("--html", help="manual HTML export (default: the r142 export in manual/)")
+        cmd.add_argument("--profile", action="store_true", help="trace the build (see build.py)")
+        cmd.add_argument("--profile-dir", default="build_profile")
+        cmd.add_argument("--no-memory", action="store_true", help="skip tracemalloc when profiling")
+        cmd.set_defaults(func=cmd_build)
+
+    batch = sub.add_parser("batch", help="build several manual exports, each into its own data directory")
+    batch.add_argument("--manifest", help="JSON list of {name, html, data_dir} documents")
+    batch.add_argument("--doc", action="append", dest="docs", metavar="HTML=DATA_DIR", help="document to build (repeatable)")
+    batch.add_argument("--phase", action="append", dest="phases", help="phase to run, by number or name (repeatable; default all)")
+    batch.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    batch.add_argument("--report", help="write the combined validation report here")
+    batch.set_defaults(func=cmd_batch)
+
+    watch = sub.add_parser("watch", help="rebuild the phases affected by each save of the manual")
+    watch.add_argument("--data-dir", default=DATA_DIR)
+    watch.add_argument("--html", help="manual HTML export (default: the r142 export in manual/)")
+    watch.add_argument("--interval", type=float, default=0.2, help="polling interval in seconds")
+    watch.set_defaults(func=cmd_watch)
+
+    validate = sub.add_parser("validate", help="run the cross-file checks on data/ without rewriting it")
+    validate.add_argument("--data-dir", default=DATA_DIR)
+    validate.add_argument("--json", action="store_true", help="print the full report")
+    validate.set_defaults(func=cmd_validate)
+
+    export = sub.add_parser("export", help="write the datasets as one JSON bundle or as CSV files")
+    export.add_argument("format", choices=("bundle", "csv"))
+    export.add_argument("out", help="bundle file or CSV directory")
+    export.add_argument("--data-dir", default=DATA_DIR)
+    export.add_argument("--dataset", action="append", dest="datasets", help="dataset to export (repeatable)")
+    export.set_defaults(func=cmd_export)
+
+    diff = sub.add_parser("diff", help="field-level changes between two data builds (directories or bundles)")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--dataset", action="append", dest="datasets", help="dataset to compare (repeatable)")
+    diff.add_argument("--json", action="store_true", help="print the diff as JSON")
+    diff.add_argument("--width", type=int, default=60, help="truncate values to this many characters")
+    diff.set_defaults(func=cmd_diff)
+
+    bench = sub.add_parser("bench", help="run src/benchmark.py with the remaining arguments")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    command_start = time.perf_counter()
+    try:
+        code = args.func(args)
+    except (FileNotFoundError, ValueError) as e:
+        print(e, file=sys.stderr)
+        code = 1
+    if args.timings:
+        report = timings()
+        imported = sum(report["imports_s"].values())
+        print(f"startup  {report['startup_cpu_s'] * 1e3:8.1f} ms cpu", file=sys.stderr)
+        for name, seconds in report["imports_s"].items():
+            print(f"import   {seconds * 1e3:8.1f} ms  {name}", file=sys.stderr)
+        print(f"command  {(time.perf_counter() - command_start - imported) * 1e3:8.1f} ms  {args.command}", file=sys.stderr)
+        print(f"total    {report['total_s'] * 1e3:8.1f} ms  (bs4 loaded: {report['bs4_loaded']})", file=sys.stderr)
+        print(f"peak rss {lazy_import('profiling').peak_rss_mb():8.1f} MiB", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+"""Field-level diff between two data builds, for release changelogs.
+
+Either side is a ``data/`` directory or a bundle written by
+``cli.py export bundle``.  Records are matched by stable keys rather
+than position (``RECORD_KEYS``): monsters by ``name``, spells by
+``name_clean``, tables by ``table_name`` or ``section``, equipment rows
+by their first column, attack bonus rows by the bonus.  When a key repeats (several "Magic Weapons"
+tables), later records get an occurrence suffix, "Magic Weapons #2",
+the way :func:`data_store.collect_tables` names them.  Datasets that are
+objects (``class_tables``, ``treasure_types`` ...) are keyed by their
+top-level keys.
+
+Each dataset is one pass over both sides: the old records go into a
+dict by key, each new record is looked up in it, and what is left over
+was removed.  Matched records that compare equal are skipped; the rest
+are walked field by field.  Nested record lists are matched by
+``table_name``, ``name`` or ``section`` when every item has one (the
+encounter tables), otherwise by position.  Between two directories,
+dataset files with the same SHA-256 are not parsed at all.
+
+The derived files (``SKIPPED_DATASETS``: indexes, validation report,
+manifest) are left out; they change whenever the records they are
+built from do.
+
+Only the standard library and :mod:`data_store` are imported.
+
+    python src/cli.py diff builds/r139 data
+    python src/cli.py diff dist/r139.json data --dataset monsters --json
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from data_store import dataset_names, file_digest, load_dataset
+
+RECORD_KEYS: dict[str, tuple[str, ...]] = {
+    "monsters": ("name",),
+    "spells": ("name_clean",),
+    "magic_items": ("category", "name"),
+    "classes": ("name",),
+    "races": ("name",),
+    "combat_tables": ("table_name",),
+    "magic_item_tables": ("section",),
+    "armor": ("armor_type",),
+    "equipment": ("item",),
+    "weapons": ("weapon",),
+    "vehicles": ("vehicle",),
+    "attack_bonus": ("attack_bonus",),  # fighter_level is blank on the monster-only rows
+    "thief_abilities": ("thief_level",),
+}
+
+# Keys for record lists nested inside a dataset, tried in order.
+NESTED_KEYS = ("table_name", "name", "section")
+
+SKIPPED_DATASETS = {"manifest", "validation_report", "spell_index", "monster_index"}
+
+
+class Change(NamedTuple):
+    path: str  # e.g. "stat_block.armor_class" or "description_paragraphs[2]"
+    kind: str  # "added", "removed" or "changed"
+    old: Any
+    new: Any
+
+
+class DatasetDiff(NamedTuple):
+    name: str
+    status: str  # "added", "removed", "changed" or "unchanged"
+    added: list[str]
+    removed: list[str]
+    changed: dict[str, list[Change]]
+    unchanged: int | None  # None when identical files were not parsed
+
+
+class Source(NamedTuple):
+    path: str
+    names: list[str]
+    load: Callable[[str], Any]
+    digest: Callable[[str], str | None]
+
+
+def open_source(path: str) -> Source:
+    """A data directory or an export bundle; raises FileNotFoundError if *path* does not exist."""
+    p = Path(path)
+    if p.is_dir():
+        return Source(path, dataset_names(path), lambda name: load_dataset(name, path), lambda name: file_digest(p / f"{name}.json"))
+    if not p.is_file():
+        raise FileNotFoundError(f"No data directory or bundle at {path}")
+    bundle = json.loads(p.read_text(encoding="utf-8"))
+    if not isinstance(bundle, dict) or not isinstance(bundle.get("datasets"), dict):
+        raise ValueError(f"{path} is not an export bundle")
+    datasets = bundle["datasets"]
+    return Source(path, sorted(datasets), datasets.get, lambda name: None)
+
+
+def _key_value(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def keyed_records(records: list[Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """*records* by the values of *fields* joined with " / "; repeats get " #2", " #3" ..."""
+    keyed: dict[str, Any] = {}
+    counts: dict[str, int] = {}
+    for i, record in enumerate(records):
+        if isinstance(record, dict) and all(f in record for f in fields):
+            key = " / ".join(_key_value(record[f]) for f in fields)
+        else:
+            key = f"[{i}]"
+        counts[key] = counts.get(key, 0) + 1
+        keyed[key if counts[key] == 1 else f"{key} #{counts[key]}"] = record
+    return keyed
+
+
+def _records(name: str, payload: Any) -> dict[str, Any]:
+    if isinstance(payload, dict):
+        return payload
+    if isinstance(payload, list):
+        return keyed_records(payload, RECORD_KEYS.get(name) or _nested_key(payload) or ())
+    return {"": payload}
+
+
+def _nested_key(items: list[Any]) -> tuple[str, ...] | None:
+    for field in NESTED_KEYS:
+        if items and all(isinstance(item, dict) and field in item for item in items):
+            return (field,)
+    return None
+
+
+def _join(path: str, part: str) -> str:
+    return f"{path}.{part}" if path else part
+
+
+def diff_values(old: Any, new: Any, path: str = "", changes: list[Change] | None = None) -> list[Change]:
+    """Field-level changes from *old* to *new*, appended to *changes*."""
+    changes = [] if changes is None else changes
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key in new:
+                diff_values(value, new[key], _join(path, key), changes)
+            else:
+                changes.append(Change(_join(path, key), "removed", value, None))
+        for key, value in new.items():
+            if key not in old:
+                changes.append(Change(_join(path, key), "added", None, value))
+    elif isinstance(old, list) and isinstance(new, list):
+        key = _nested_key(old)
+        if key and key == _nested_key(new):
+            diff_values(keyed_records(old, key), keyed_records(new, key), path, changes)
+            return changes
+        for i, (a, b) in enumerate(zip(old, new)):
+            diff_values(a, b, f"{path}[{i}]", changes)
+        for i in range(len(new), len(old)):
+            changes.append(Change(f"{path}[{i}]", "removed", old[i], None))
+        for i in range(len(old), len(new)):
+            changes.append(Change(f"{path}[{i}]", "added", None, new[i]))
+    elif old != new or type(old) is not type(new):
+        changes.append(Change(path, "changed", old, new))
+    return changes
+
+
+def diff_dataset(name: str, old: Any, new: Any) -> DatasetDiff:
+    """Match the records of one dataset by key and diff the matched pairs."""
+    if old is None or new is None:
+        status = "added" if old is None else "removed"
+        records = list(_records(name, new if old is None else old))
+        return DatasetDiff(name, status, records if old is None else [], records if new is None else [], {}, 0)
+    remaining = dict(_records(name, old))
+    added: list[str] = []
+    changed: dict[str, list[Change]] = {}
+    unchanged = 0
+    for key, record in _records(name, new).items():
+        if key not in remaining:
+            added.append(key)
+            continue
+        previous = remaining.pop(key)
+        if previous == record:
+            unchanged += 1
+        else:
+            changed[key] = diff_values(previous, record)
+    removed = list(remaining)
+    status = "changed" if added or removed or changed else "unchanged"
+    return DatasetDiff(name, status, added, removed, changed, unchanged)
+
+
+def diff_builds(old_path: str, new_path: str, names: list[str] | None = None) -> list[DatasetDiff]:
+    """Diff every dataset (or *names*) of two builds, skipping ``SKIPPED_DATASETS``."""
+    old, new = open_source(old_path), open_source(new_path)
+    available = sorted(set(old.names) | set(new.names))
+    unknown = [n for n in names or [] if n not in available]
+    if unknown:
+        raise ValueError(f"Unknown dataset: {unknown[0]}")
+    diffs = []
+    for name in names or [n for n in available if n not in SKIPPED_DATASETS]:
+        if name in old.names and name in new.names:
+            digest = old.digest(name)
+            if digest is not None and digest == new.digest(name):
+                diffs.append(DatasetDiff(name, "unchanged", [], [], {}, None))
+                continue
+        diffs.append(diff_dataset(name, old.load(name) if name in old.names else None, new.load(name) if name in new.names else None))
+    return diffs
+
+
+def _short(value: Any, width: int = 60) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def format_diff(diffs: list[DatasetDiff], width: int = 60) -> str:
+    """A changelog: per dataset the added (+), removed (-) and changed (~) records with their fields."""
+    lines = []
+    for d in diffs:
+        if d.status == "unchanged":
+            continue
+        if d.status in ("added", "removed"):
+            lines.append(f"{d.name}: dataset {d.status} ({len(d.added or d.removed)} records)")
+            continue
+        lines.append(f"{d.name}: {len(d.added)} added, {len(d.removed)} removed, {len(d.changed)} changed ({d.unchanged} unchanged)")
+        lines += [f"  + {key}" for key in d.added]
+        lines += [f"  - {key}" for key in d.removed]
+        for key, changes in d.changed.items():
+            lines.append(f"  ~ {key}")
+            for change in changes:
+                if change.kind == "changed":
+                    detail = f"{_short(change.old, width)} -> {_short(change.new, width)}"
+                else:
+                    detail = f"{change.kind} {_short(change.new if change.kind == 'added' else change.old, width)}"
+                lines.append(f"      {change.path or '(value)'}: {detail}")
+    unchanged = sum(d.status == "unchanged" for d in diffs)
+    lines.append(f"{len(diffs) - unchanged} of {len(diffs)} datasets changed")
+    return "\n".join(lines)
+
+
+def diff_to_json(diffs: list[DatasetDiff]) -> dict[str, Any]:
+    """The diff as JSON-ready data, keyed by dataset."""
+    return {
+        d.name: {
+            "status": d.status,
+            "added": d.added,
+            "removed": d.removed,
+            "changed": {key: [change._asdict() for change in changes] for key, changes in d.changed.items()},
+            "unchanged": d.unchanged,
+        }
+        for d in diffs
+    }
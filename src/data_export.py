@@ -0,0 +1,80 @@
+"""Export the generated datasets for consumers that do not read ``data/`` directly.
+
+Two formats:
+
+- ``bundle``: one JSON file holding every dataset by name plus the
+  manifest digest it was built from, for shipping the data as one file.
+- ``csv``: one CSV file per record-list dataset (``monsters``,
+  ``spells``, ``weapons`` ...).  Columns are the union of the record keys
+  in first-seen order; nested values are written as JSON.  Datasets that
+  are not lists of records (``spell_list``, ``encounter_tables`` ...) are
+  skipped.
+
+Only the standard library and :mod:`data_store` are imported, so an
+export never loads the HTML parsing stack.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Any
+
+from data_store import DATA_DIR, dataset_names, load_dataset, load_manifest
+
+FORMATS = ("bundle", "csv")
+
+
+def _select(names: list[str] | None, data_dir: str) -> list[str]:
+    available = dataset_names(data_dir)
+    if not names:
+        return available
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise ValueError(f"Unknown dataset: {unknown[0]}")
+    return names
+
+
+def export_bundle(out_path: str, data_dir: str = DATA_DIR, names: list[str] | None = None) -> dict[str, Any]:
+    """Write the selected datasets (default: all) to one JSON file; returns a summary."""
+    selected = _select(names, data_dir)
+    bundle = {
+        "manifest_digest": load_manifest(data_dir).get("digest"),
+        "datasets": {name: load_dataset(name, data_dir) for name in selected},
+    }
+    path = Path(out_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(bundle, ensure_ascii=False) + "\n", encoding="utf-8")
+    return {"path": str(path), "datasets": len(selected), "bytes": path.stat().st_size}
+
+
+def _is_record_list(payload: Any) -> bool:
+    return isinstance(payload, list) and bool(payload) and all(isinstance(r, dict) for r in payload)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else value
+
+
+def export_csv(out_dir: str, data_dir: str = DATA_DIR, names: list[str] | None = None) -> dict[str, Any]:
+    """Write one CSV per record-list dataset under *out_dir*; returns written and skipped names."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    written: dict[str, int] = {}
+    skipped: list[str] = []
+    for name in _select(names, data_dir):
+        records = load_dataset(name, data_dir)
+        if not _is_record_list(records):
+            skipped.append(name)
+            continue
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        with open(out / f"{name}.csv", "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for record in records:
+                writer.writerow([_cell(record.get(column)) for column in columns])
+        written[name] = len(records)
+    return {"path": str(out), "written": written, "skipped": skipped}
@@ -0,0 +1,96 @@
+"""Shared access to the generated ``data/`` directory and its build manifest.
+
+The manifest records a SHA-256 digest per JSON output so consumers can
+derive cache keys and ETags without re-hashing the files themselves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = "data"
+MANIFEST_FILE = "manifest.json"
+
+
+def canonical_name(name: str) -> str:
+    """Lowercase *name* and collapse punctuation so lookups ignore formatting."""
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+def file_digest(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def dataset_names(data_dir: str = DATA_DIR) -> list[str]:
+    """Return the stems of all generated JSON datasets (excluding the manifest)."""
+    return sorted(p.stem for p in Path(data_dir).glob("*.json") if p.name != MANIFEST_FILE)
+
+
+def build_manifest(data_dir: str = DATA_DIR) -> dict[str, Any]:
+    """Hash every dataset file and return the manifest payload."""
+    root = Path(data_dir)
+    files: dict[str, dict[str, Any]] = {}
+    for name in dataset_names(data_dir):
+        path = root / f"{name}.json"
+        files[path.name] = {"sha256": file_digest(path), "bytes": path.stat().st_size}
+
+    combined = hashlib.sha256()
+    for filename, entry in files.items():
+        combined.update(f"{filename}:{entry['sha256']}\n".encode("utf-8"))
+
+    return {"digest": combined.hexdigest(), "files": files}
+
+
+def write_manifest(data_dir: str = DATA_DIR) -> dict[str, Any]:
+    manifest = build_manifest(data_dir)
+    path = Path(data_dir) / MANIFEST_FILE
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return manifest
+
+
+def load_manifest(data_dir: str = DATA_DIR) -> dict[str, Any]:
+    """Return the stored manifest, or compute one if the build did not write it."""
+    path = Path(data_dir) / MANIFEST_FILE
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return build_manifest(data_dir)
+
+
+def load_dataset(name: str, data_dir: str = DATA_DIR) -> Any:
+    """Load ``<data_dir>/<name>.json``; returns None when the file is missing."""
+    path = Path(data_dir) / f"{name}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def collect_tables(data_dir: str = DATA_DIR) -> dict[str, tuple[str, dict[str, Any]]]:
+    """Map canonical table names to (source dataset, table payload)."""
+    tables: dict[str, tuple[str, dict[str, Any]]] = {}
+
+    for table in load_dataset("combat_tables", data_dir) or []:
+        tables.setdefault(canonical_name(table.get("table_name", "")), ("combat_tables", table))
+
+    for group in (load_dataset("encounter_tables", data_dir) or {}).values():
+        for table in group:
+            tables.setdefault(canonical_name(table.get("table_name", "")), ("encounter_tables", table))
+
+    for name, table in (load_dataset("treasure_types", data_dir) or {}).items():
+        tables.setdefault(canonical_name(name), ("treasure_types", {"table_name": name, **table}))
+
+    section_counts: dict[str, int] = {}
+    for table in load_dataset("magic_item_tables", data_dir) or []:
+        section = table.get("section", "")
+        section_counts[section] = section_counts.get(section, 0) + 1
+        table_name = f"{section} #{section_counts[section]}"
+        payload = {"table_name": table_name, **table}
+        tables.setdefault(canonical_name(table_name), ("magic_item_tables", payload))
+        tables.setdefault(canonical_name(section), ("magic_item_tables", payload))
+
+    tables.pop("", None)
+    return tables
@@ -0,0 +1,465 @@
+"""Bulk NPC character generation over the race, class and equipment data.
+
+:class:`CharacterGenerator` compiles the rules once:
+
+- race class lists, ability minimums/maximums, hit die caps and saving
+  throw bonuses are read from the ``restrictions`` and ``saving_throws``
+  prose in ``races.json``
+- class prime requisites come from ``classes.json``
+- hit dice, attack bonus, saving throws and thief skills are dense
+  (class x level) tables from ``class_tables.json``,
+  :mod:`engines.lookup_tables` and ``thief_abilities.json``
+- prices are the normalized ``price_cp`` columns of ``weapons.json``,
+  ``armor.json`` and ``equipment.json``; which weapons and armor each class shops for is
+  the :data:`CLASS_WEAPONS` / :data:`CLASS_ARMOR` preference lists
+
+:meth:`CharacterGenerator.generate_arrays` then builds N characters as
+NumPy arrays: abilities are rolled 3d6 in order, each character takes a
+random race/class pair it qualifies for (rows that qualify for nothing
+are rerolled), and starting gold (3d6 x 10 gp) is spent on a weapon,
+the best affordable armor, a shield, class tools and a basic kit.
+:meth:`~CharacterGenerator.generate` splits large runs into chunks for a
+process pool; :meth:`~CharacterGenerator.iter_characters` streams dicts.
+
+    PYTHONPATH=src python -m engines.characters
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, canonical_name, load_dataset
+from engines.combat import class_hit_dice
+from engines.dice import compile_dice
+from engines.lookup_tables import (
+    CLASS_KEYS,
+    MAX_LEVEL,
+    SAVE_KEYS,
+    class_attack_bonus,
+    class_index,
+    load_rules_arrays,
+    saving_throw,
+)
+from parsers.output_cleanup import CP_PER_COIN
+
+ABILITIES = ("strength", "intelligence", "wisdom", "dexterity", "constitution", "charisma")
+THIEF_SKILLS = ("open_locks", "remove_traps", "pick_pockets", "move_silently", "climb_walls", "hide", "listen")
+STARTING_GOLD = "3d6"  # x 10 gp
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Ability score modifier by score 0..18 (3: -3, 4-5: -2, 6-8: -1, 9-12: 0, 13-15: +1, 16-17: +2, 18: +3).
+ABILITY_MODIFIERS = np.array([-3, -3, -3, -3, -2, -2, -1, -1, -1, 0, 0, 0, 0, 1, 1, 1, 2, 2, 3], dtype=np.int8)
+
+# Shopping lists, in order of preference; names match the equipment datasets.
+CLASS_WEAPONS = {
+    "cleric": ("Mace", "Warhammer", "Club/Cudgel/Walking Staff"),
+    "fighter": ("Longsword/Scimitar", "Battle Axe", "Spear", "Hand Axe", "Dagger"),
+    "magic_user": ("Dagger", "Club/Cudgel/Walking Staff"),
+    "thief": ("Shortsword", "Dagger", "Club/Cudgel/Walking Staff"),
+}
+CLASS_ARMOR = {
+    "cleric": ("Plate Mail", "Chain Mail", "Leather Armor"),
+    "fighter": ("Plate Mail", "Chain Mail", "Leather Armor"),
+    "magic_user": (),
+    "thief": ("Leather Armor",),
+}
+CLASS_SHIELD = {"cleric": True, "fighter": True, "magic_user": False, "thief": False}
+CLASS_ITEMS = {
+    "cleric": ("Holy Symbol",),
+    "fighter": (),
+    "magic_user": (),
+    "thief": ("Thieves' picks and tools",),
+}
+KIT_ITEMS = (
+    "Backpack (Standard or Halfling)",
+    "Wineskin/Waterskin",
+    "Tinderbox, flint and steel",
+    "Torches, 6",
+    "Rations, Dry, one week",
+)
+NO_ARMOR = "No Armor"
+SHIELD = "Shield"
+
+_RACE_KEYS = {"dwarves": "dwarf", "elves": "elf", "halflings": "halfling", "humans": "human"}
+_CLASS_STEMS = {"cleric": "cleric", "fighter": "fighter", "magic_user": "magic user", "thief": "thie"}
+_SAVE_LABELS = {
+    "death_ray_or_poison": "death ray",
+    "magic_wands": "magic wands",
+    "paralysis_or_petrify": "paralysis",
+    "dragon_breath": "dragon breath",
+    "spells": "spells",
+}
+_MINIMUM_RE = re.compile(r"minimum (\w+) of (\d+)", re.IGNORECASE)
+_MAXIMUM_RE = re.compile(r"may not have an? (\w+) higher than (\d+)", re.IGNORECASE)
+_HIT_DIE_CAP_RE = re.compile(r"never roll larger than [\w-]+ dice \(d(\d+)\)", re.IGNORECASE)
+_NO_LARGE_RE = re.compile(r"may not (?:use|employ) Large weapons", re.IGNORECASE)
+_SAVE_BONUS_RE = re.compile(r"\+(\d+) vs\. ([^+]*)", re.IGNORECASE)
+_PRIME_RE = re.compile(r"must have an? (\w+) score of (\d+) or higher", re.IGNORECASE)
+_DIE_RE = re.compile(r"d(\d+)")
+
+
+class RaceRules(NamedTuple):
+    key: str
+    name: str
+    classes: tuple[str, ...]
+    minimums: np.ndarray  # (ability,), 0 when unrestricted
+    maximums: np.ndarray  # (ability,), 18 when unrestricted
+    hit_die_cap: int | None
+    large_weapons: bool
+    save_bonus: np.ndarray  # (save,)
+
+
+class GearItem(NamedTuple):
+    name: str
+    price_cp: int
+
+
+def parse_race(record: dict[str, Any]) -> RaceRules:
+    """Read class options, ability limits, hit die cap and save bonuses from a race's prose fields."""
+    fields = record.get("fields", {})
+    restrictions = str(fields.get("restrictions", ""))
+    first_sentence = restrictions.split(".", 1)[0].lower()
+    if "any" in first_sentence:
+        classes = CLASS_KEYS
+    else:
+        classes = tuple(key for key in CLASS_KEYS if _CLASS_STEMS[key] in canonical_name(first_sentence))
+
+    minimums = np.zeros(len(ABILITIES), dtype=np.int8)
+    maximums = np.full(len(ABILITIES), 18, dtype=np.int8)
+    for pattern, target in ((_MINIMUM_RE, minimums), (_MAXIMUM_RE, maximums)):
+        for ability, value in pattern.findall(restrictions):
+            if ability.lower() in ABILITIES:
+                target[ABILITIES.index(ability.lower())] = int(value)
+    cap = _HIT_DIE_CAP_RE.search(restrictions)
+
+    save_bonus = np.zeros(len(SAVE_KEYS), dtype=np.int8)
+    for bonus, names in _SAVE_BONUS_RE.findall(str(fields.get("saving_throws", ""))):
+        for i, save in enumerate(SAVE_KEYS):
+            if _SAVE_LABELS[save] in names.lower():
+                save_bonus[i] = int(bonus)
+
+    name = str(record.get("name", ""))
+    return RaceRules(
+        key=_RACE_KEYS.get(canonical_name(name), canonical_name(name).replace(" ", "_")),
+        name=name,
+        classes=classes,
+        minimums=minimums,
+        maximums=maximums,
+        hit_die_cap=int(cap.group(1)) if cap else None,
+        large_weapons=_NO_LARGE_RE.search(restrictions) is None,
+        save_bonus=save_bonus,
+    )
+
+
+def parse_prime_requisite(record: dict[str, Any]) -> tuple[str, int] | None:
+    m = _PRIME_RE.search(" ".join(record.get("description_paragraphs", [])) or str(record.get("description", "")))
+    return (m.group(1).lower(), int(m.group(2))) if m and m.group(1).lower() in ABILITIES else None
+
+
+def _cap_hit_dice(expr: str, cap: int | None) -> str:
+    if cap is None:
+        return expr
+    return _DIE_RE.sub(lambda m: f"d{min(int(m.group(1)), cap)}", expr)
+
+
+def _first_affordable(gold: np.ndarray, prices: list[int]) -> np.ndarray:
+    """Index of the first price each budget covers, or -1."""
+    if not prices:
+        return np.full(len(gold), -1, dtype=np.int16)
+    affordable = gold[:, None] >= np.array(prices)[None, :]
+    return np.where(affordable.any(axis=1), affordable.argmax(axis=1), -1).astype(np.int16)
+
+
+class CharacterGenerator:
+    """Compiled character rules; generates characters as arrays or a stream."""
+
+    def __init__(self, data_dir: str = DATA_DIR) -> None:
+        self.data_dir = data_dir
+        self.rules = load_rules_arrays(data_dir)
+        self.races = tuple(parse_race(r) for r in load_dataset("races", data_dir) or [])
+        self.classes = CLASS_KEYS
+
+        self.class_minimums = np.zeros((len(CLASS_KEYS), len(ABILITIES)), dtype=np.int8)
+        for record in load_dataset("classes", data_dir) or []:
+            key = canonical_name(str(record.get("name", ""))).replace(" ", "_")
+            prime = parse_prime_requisite(record)
+            if key in CLASS_KEYS and prime is not None:
+                self.class_minimums[CLASS_KEYS.index(key), ABILITIES.index(prime[0])] = prime[1]
+
+        # Every race/class pair a character may take.
+        self.pairs = np.array(
+            [(r, CLASS_KEYS.index(c)) for r, race in enumerate(self.races) for c in race.classes],
+            dtype=np.int16,
+        ).reshape(-1, 2)
+
+        self.thief_skills = np.zeros((MAX_LEVEL + 1, len(THIEF_SKILLS)), dtype=np.int8)
+        for row in load_dataset("thief_abilities", data_dir) or []:
+            level = str(row.get("thief_level", "")).strip()
+            if level.isdigit() and int(level) <= MAX_LEVEL:
+                self.thief_skills[int(level)] = [int(row.get(skill, 0) or 0) for skill in THIEF_SKILLS]
+
+        weapon_rows = load_dataset("weapons", data_dir) or []
+        weapons = {str(w.get("weapon", "")): w.get("price_cp") for w in weapon_rows}
+        sizes = {str(w.get("weapon", "")): str(w.get("size", "")) for w in weapon_rows}
+        armor_rows = load_dataset("armor", data_dir) or []
+        armor = {str(a.get("armor_type", "")): a.get("price_cp") for a in armor_rows}
+        armor_ac = {str(a.get("armor_type", "")): str(a.get("ac", "")).strip() for a in armor_rows}
+        equipment = {str(e.get("item", "")): e.get("price_cp") for e in load_dataset("equipment", data_dir) or []}
+
+        self.weapons = tuple(
+            GearItem(name, weapons[name])
+            for name in dict.fromkeys(sum(CLASS_WEAPONS.values(), ()))
+            if weapons.get(name) is not None
+        )
+        self.large_weapon = np.array([sizes.get(w.name) == "L" for w in self.weapons], dtype=bool)
+        self.armor = tuple(GearItem(name, price) for name, price in armor.items() if price is not None and name != SHIELD)
+        self.armor_class = np.array([int(armor_ac[a.name] or 11) for a in self.armor], dtype=np.int8)
+        self.shield = GearItem(SHIELD, armor[SHIELD]) if armor.get(SHIELD) is not None else None
+        self.items = tuple(
+            GearItem(name, equipment[name])
+            for name in dict.fromkeys(sum(CLASS_ITEMS.values(), ()) + KIT_ITEMS)
+            if equipment.get(name) is not None
+        )
+        self._no_armor = next((i for i, a in enumerate(self.armor) if a.name == NO_ARMOR), 0)
+
+    # Compilation helpers -------------------------------------------------
+
+    def _gear_codes(self, names: tuple[str, ...], catalog: tuple[GearItem, ...]) -> list[int]:
+        index = {item.name: i for i, item in enumerate(catalog)}
+        return [index[name] for name in names if name in index]
+
+    # Generation ------------------------------------------------------------
+
+    def _roll_qualified(
+        self,
+        n: int,
+        rng: np.random.Generator,
+        pairs: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Roll 3d6 abilities until every row qualifies for one of *pairs*; pick a pair per row."""
+        abilities = np.empty((n, len(ABILITIES)), dtype=np.int8)
+        choice = np.empty(n, dtype=np.intp)
+        pending = np.arange(n)
+        three_d6 = compile_dice("3d6")
+        race_min = np.stack([self.races[r].minimums for r in pairs[:, 0]])
+        race_max = np.stack([self.races[r].maximums for r in pairs[:, 0]])
+        class_min = self.class_minimums[pairs[:, 1]]
+        lower = np.maximum(race_min, class_min)
+        while len(pending):
+            rolled = three_d6.sample(len(pending) * len(ABILITIES), rng).reshape(len(pending), len(ABILITIES))
+            eligible = ((rolled[:, None, :] >= lower[None]) & (rolled[:, None, :] <= race_max[None])).all(axis=2)
+            keys = np.where(eligible, rng.random(eligible.shape), -1.0)
+            ok = eligible.any(axis=1)
+            abilities[pending[ok]] = rolled[ok]
+            choice[pending[ok]] = keys[ok].argmax(axis=1)
+            pending = pending[~ok]
+        return abilities, choice
+
+    def _hit_points(
+        self,
+        race: np.ndarray,
+        cls: np.ndarray,
+        level: np.ndarray,
+        con_mod: np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        caps = np.array([r.hit_die_cap or 0 for r in self.races])
+        groups = (cls.astype(np.int64) * (MAX_LEVEL + 1) + level) * 64 + caps[race]
+        hp = np.empty(len(race), dtype=np.int64)
+        for group in np.unique(groups):
+            idx = np.flatnonzero(groups == group)
+            c, lvl, cap = int(cls[idx[0]]), int(level[idx[0]]), int(caps[race[idx[0]]])
+            expr = _cap_hit_dice(class_hit_dice(CLASS_KEYS[c], lvl, self.data_dir), cap or None)
+            hp[idx] = compile_dice(expr).sample(len(idx), rng) + con_mod[idx] * min(lvl, 9)
+        return np.maximum(hp, level)
+
+    def _shop(self, race: np.ndarray, cls: np.ndarray, gold: np.ndarray) -> dict[str, np.ndarray]:
+        n = len(gold)
+        weapon = np.full(n, -1, dtype=np.int16)
+        armor = np.full(n, self._no_armor, dtype=np.int16)
+        shield = np.zeros(n, dtype=bool)
+        items = np.zeros((n, len(self.items)), dtype=bool)
+        gold = gold.copy()
+        for c, class_key in enumerate(CLASS_KEYS):
+            for r, race_rules in enumerate(self.races):
+                idx = np.flatnonzero((cls == c) & (race == r))
+                if not len(idx):
+                    continue
+                codes = [
+                    i for i in self._gear_codes(CLASS_WEAPONS[class_key], self.weapons)
+                    if race_rules.large_weapons or not self.large_weapon[i]
+                ]
+                pick = _first_affordable(gold[idx], [self.weapons[i].price_cp for i in codes])
+                bought = pick >= 0
+                if codes:
+                    weapon[idx[bought]] = np.array(codes, dtype=np.int16)[pick[bought]]
+                    gold[idx[bought]] -= np.array([self.weapons[i].price_cp for i in codes])[pick[bought]]
+
+                codes = self._gear_codes(CLASS_ARMOR[class_key], self.armor)
+                pick = _first_affordable(gold[idx], [self.armor[i].price_cp for i in codes])
+                bought = pick >= 0
+                if codes:
+                    armor[idx[bought]] = np.array(codes, dtype=np.int16)[pick[bought]]
+                    gold[idx[bought]] -= np.array([self.armor[i].price_cp for i in codes])[pick[bought]]
+
+                if CLASS_SHIELD[class_key] and self.shield is not None:
+                    bought = gold[idx] >= self.shield.price_cp
+                    shield[idx[bought]] = True
+                    gold[idx[bought]] -= self.shield.price_cp
+
+                for i in self._gear_codes(CLASS_ITEMS[class_key] + KIT_ITEMS, self.items):
+                    bought = gold[idx] >= self.items[i].price_cp
+                    items[idx[bought], i] = True
+                    gold[idx[bought]] -= self.items[i].price_cp
+        return {"weapon": weapon, "armor": armor, "shield": shield, "items": items, "gold_cp": gold}
+
+    def generate_arrays(
+        self,
+        n: int,
+        level: int | np.ndarray = 1,
+        race: str | None = None,
+        class_key: str | None = None,
+        seed: int | None = None,
+        rng: np.random.Generator | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Generate *n* characters at *level* (scalar or per-character array).
+
+        Returns arrays: ``race`` / ``class`` (codes into :attr:`races` /
+        :attr:`classes`), ``level``, ``abilities`` (n x 6, :data:`ABILITIES`
+        order), ``hit_points``, ``armor_class``, ``attack_bonus``, ``saves``
+        (n x 5 targets after racial bonuses, :data:`SAVE_KEYS` order),
+        ``thief_skills`` (n x 7 percentages, 0 for non-thieves), ``weapon``
+        / ``armor`` (codes, -1 for no weapon), ``shield``, ``items`` (n x
+        items bought) and ``gold_cp`` left over.
+        """
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        pairs = self.pairs
+        if race is not None:
+            pairs = pairs[[self.races[r].key == race for r in pairs[:, 0]]]
+        if class_key is not None:
+            pairs = pairs[pairs[:, 1] == class_index(class_key)]
+        if not len(pairs):
+            raise ValueError(f"No race/class pair matches race={race!r} class={class_key!r}")
+
+        abilities, choice = self._roll_qualified(n, rng, pairs)
+        race_codes = pairs[choice, 0]
+        class_codes = pairs[choice, 1]
+        levels = np.clip(np.broadcast_to(np.asarray(level, dtype=np.int64), (n,)), 1, MAX_LEVEL)
+        modifiers = ABILITY_MODIFIERS[abilities]
+        con_mod = modifiers[:, ABILITIES.index("constitution")]
+
+        save_bonus = np.stack([r.save_bonus for r in self.races])[race_codes]
+        thief = class_codes == CLASS_KEYS.index("thief")
+        gold = compile_dice(STARTING_GOLD).sample(n, rng) * 10 * CP_PER_COIN["gp"]
+        gear = self._shop(race_codes, class_codes, gold)
+        armor_class = self.armor_class[gear["armor"]] + gear["shield"] + modifiers[:, ABILITIES.index("dexterity")]
+
+        return {
+            "race": race_codes,
+            "class": class_codes,
+            "level": levels,
+            "abilities": abilities,
+            "hit_points": self._hit_points(race_codes, class_codes, levels, con_mod, rng),
+            "armor_class": armor_class.astype(np.int16),
+            "attack_bonus": class_attack_bonus(self.rules, class_codes, levels),
+            "saves": saving_throw(self.rules, class_codes, levels) - save_bonus,
+            "thief_skills": np.where(thief[:, None], self.thief_skills[levels], 0).astype(np.int8),
+            **gear,
+        }
+
+    def describe(self, batch: dict[str, np.ndarray], i: int) -> dict[str, Any]:
+        """One character from a batch, with codes decoded to names."""
+        weapon = int(batch["weapon"][i])
+        character = {
+            "race": self.races[batch["race"][i]].key,
+            "class": self.classes[batch["class"][i]],
+            "level": int(batch["level"][i]),
+            "abilities": dict(zip(ABILITIES, batch["abilities"][i].tolist())),
+            "hit_points": int(batch["hit_points"][i]),
+            "armor_class": int(batch["armor_class"][i]),
+            "attack_bonus": int(batch["attack_bonus"][i]),
+            "saves": dict(zip(SAVE_KEYS, batch["saves"][i].tolist())),
+            "weapon": self.weapons[weapon].name if weapon >= 0 else None,
+            "armor": self.armor[batch["armor"][i]].name,
+            "shield": bool(batch["shield"][i]),
+            "items": [item.name for item, has in zip(self.items, batch["items"][i]) if has],
+            "gold_cp": int(batch["gold_cp"][i]),
+        }
+        if self.classes[batch["class"][i]] == "thief":
+            character["thief_skills"] = dict(zip(THIEF_SKILLS, batch["thief_skills"][i].tolist()))
+        return character
+
+    def iter_characters(
+        self,
+        n: int | None = None,
+        seed: int | None = None,
+        batch_size: int = 4096,
+        **options: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream characters (forever when *n* is None), generated in batches."""
+        rng = np.random.default_rng(seed)
+        remaining = n
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            batch = self.generate_arrays(size, rng=rng, **options)
+            for i in range(size):
+                yield self.describe(batch, i)
+            if remaining is not None:
+                remaining -= size
+
+    def generate(
+        self,
+        n: int,
+        seed: int | None = None,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **options: Any,
+    ) -> dict[str, np.ndarray]:
+        """Generate *n* characters in chunks across a process pool.
+
+        Chunks draw from ``SeedSequence(seed).spawn``, so results depend on
+        seed and chunk size, not worker count.  ``workers=1`` runs
+        in-process.
+        """
+        n_chunks = max(1, -(-n // chunk_size))
+        sizes = [chunk_size] * (n_chunks - 1) + [n - chunk_size * (n_chunks - 1)]
+        streams = np.random.SeedSequence(seed).spawn(n_chunks)
+        jobs = [(self, size, stream, options) for size, stream in zip(sizes, streams)]
+
+        workers = workers or min(n_chunks, os.cpu_count() or 1)
+        if workers <= 1 or n_chunks == 1:
+            parts = [_generate_chunk(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_generate_chunk, jobs))
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    def benchmark(self, n: int = 1_000_000, seed: int | None = 0, workers: int | None = None) -> dict[str, Any]:
+        start = time.perf_counter()
+        self.generate(n, seed=seed, workers=workers)
+        elapsed = time.perf_counter() - start
+        return {"characters": n, "seconds": elapsed, "characters_per_second": n / elapsed if elapsed else float("inf")}
+
+
+def _generate_chunk(
+    args: tuple[CharacterGenerator, int, np.random.SeedSequence, dict[str, Any]],
+) -> dict[str, np.ndarray]:
+    generator, size, seed_seq, options = args
+    return generator.generate_arrays(size, rng=np.random.default_rng(seed_seq), **options)
+
+
+if __name__ == "__main__":
+    generator = CharacterGenerator()
+    summary = generator.benchmark()
+    print(f"{summary['characters_per_second']:,.0f} characters/s")
+    for character in generator.iter_characters(3, seed=1):
+        print(
+            f"  {character['race']} {character['class']} {character['level']}: "
+            f"HP {character['hit_points']}, AC {character['armor_class']}, {character['weapon']}, {character['armor']}"
+        )
@@ -0,0 +1,358 @@
+"""Monte Carlo melee combat between two groups, vectorized across bouts.
+
+A :class:`Combatant` describes one side: how many identical creatures,
+their hit point dice, armor class, attack bonus, damage dice per attack,
+and morale.  Builders derive combatants from monster stat blocks and from
+class tables plus ``weapons.json``.
+
+Each round every bout rolls initiative (1d6 per side; ties act
+simultaneously).  Each living attacker picks a random living enemy and
+rolls d20 + attack bonus against its AC for each of its attacks (a
+natural 20 always hits, a natural 1 always misses).  Morale (2d6 over the
+morale score routs the side) is checked when a side suffers its first
+death and again when half of it is down.  A bout ends when a side is
+dead or routed, or after ``max_rounds``.
+
+All bouts in a batch advance together as NumPy arrays.  :func:`simulate`
+splits large runs into chunks that run in a process pool, each with an
+independent RNG stream spawned from one seed.
+
+    PYTHONPATH=src python -m engines.combat
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, canonical_name, load_dataset
+from engines.dice import compile_dice, find_dice
+from engines.lookup_tables import RulesArrays, class_attack_bonus, load_rules_arrays, monster_attack_bonus
+
+DEFAULT_MAX_ROUNDS = 50
+DEFAULT_CHUNK_SIZE = 20_000
+
+# Hit die per class and flat hit points per level after 9th, for classes
+# without a class_tables.json entry.
+CLASS_HIT_DIE = {"fighter": (8, 2), "cleric": (6, 1), "magic_user": (4, 1), "thief": (4, 2)}
+
+_HD_RE = re.compile(r"^\s*(½|\d+)\s*\**\s*(?:([+-])\s*(\d+))?")
+_AB_OVERRIDE_RE = re.compile(r"\((?:AB\s*)?\+(\d+)\)")
+_INT_RE = re.compile(r"\d+")
+
+WIN_A = 0
+WIN_B = 1
+DRAW = -1
+
+
+class Combatant(NamedTuple):
+    name: str
+    count: int
+    hit_points: str  # dice expression per creature
+    armor_class: int
+    attack_bonus: int
+    attacks: tuple[str, ...]  # damage dice per attack per round
+    morale: int | None = None  # None: never checks morale
+
+
+def _variant(value: Any, variant: int) -> str:
+    parts = [p.strip() for p in str(value or "").split("|") if p.strip()]
+    return parts[min(variant, len(parts) - 1)] if parts else ""
+
+
+def _hit_dice_text(value: Any, variant: int) -> str:
+    # Range cleanup turns "1-1" into [1] and "1-3" into [1, 2, 3].
+    if isinstance(value, list) and value:
+        return f"{value[0]}-{value[0]}" if len(value) == 1 else str(value[min(variant, len(value) - 1)])
+    return _variant(value, variant)
+
+
+def _first_int(text: str, default: int) -> int:
+    m = _INT_RE.search(text)
+    return int(m.group(0)) if m else default
+
+
+def parse_hit_dice(text: str) -> tuple[str, int]:
+    """Turn "4", "3+1", "6**", "12 (+10)" or "½ (1d4 hit points)" into (hp dice, attack HD)."""
+    m = _HD_RE.match(text or "")
+    if m is None:
+        explicit = find_dice(text or "")
+        return (explicit[0] if explicit else "1d8"), 1
+    if m.group(1) == "½":
+        explicit = find_dice(text)
+        return (explicit[0] if explicit else "1d4"), 0
+    dice = int(m.group(1))
+    hp = f"{dice}d8" if dice else "1d4"
+    if m.group(2):
+        hp += f"{m.group(2)}{m.group(3)}"
+    return hp, dice
+
+
+def parse_damage(text: str) -> tuple[str, ...]:
+    """One dice expression per attack: "1d4 claw, 1d6 bite" -> ("1d4", "1d6")."""
+    attacks: list[str] = []
+    for segment in (text or "").split(","):
+        first_alternative = re.split(r"\bor\b", segment, maxsplit=1)[0]
+        attacks.extend(d for d in find_dice(first_alternative) if "%" not in d)
+    return tuple(attacks)
+
+
+def monster_combatant(
+    monster: dict[str, Any],
+    count: int = 1,
+    variant: int = 0,
+    rules: RulesArrays | None = None,
+) -> Combatant:
+    """Build a combatant from a ``monsters.json`` record (one stat-block variant)."""
+    rules = rules if rules is not None else load_rules_arrays()
+    block = monster.get("stat_block", {})
+    hd_text = _hit_dice_text(block.get("hit_dice"), variant)
+    hit_points, attack_hd = parse_hit_dice(hd_text)
+    override = _AB_OVERRIDE_RE.search(hd_text)
+    attack_bonus = int(override.group(1)) if override else monster_attack_bonus(rules, attack_hd)
+    morale_text = _variant(block.get("morale"), variant)
+    return Combatant(
+        name=monster.get("name", ""),
+        count=count,
+        hit_points=hit_points,
+        armor_class=_first_int(_variant(block.get("armor_class"), variant), 11),
+        attack_bonus=attack_bonus,
+        attacks=parse_damage(_variant(block.get("damage"), variant)) or ("1d6",),
+        morale=_first_int(morale_text, 12) if _INT_RE.search(morale_text) else None,
+    )
+
+
+def class_hit_dice(class_key: str, level: int, data_dir: str = DATA_DIR) -> str:
+    """Hit dice expression for a class level, e.g. "9d6+1"."""
+    for row in (load_dataset("class_tables", data_dir) or {}).get(class_key, []):
+        if str(row.get("level")) == str(level):
+            return str(row["hit_dice"])
+    die, per_level = CLASS_HIT_DIE[class_key]
+    return f"{min(level, 9)}d{die}" + (f"+{per_level * (level - 9)}" if level > 9 else "")
+
+
+def _weapon_damage(weapon: str, data_dir: str) -> str:
+    # Rows such as "Longsword/Scimitar" match either name.
+    wanted = canonical_name(weapon)
+    for row in load_dataset("weapons", data_dir) or []:
+        names = [canonical_name(n) for n in str(row.get("weapon", "")).split("/")]
+        if wanted in names and find_dice(str(row.get("dmg", ""))):
+            return find_dice(str(row["dmg"]))[0]
+    raise ValueError(f"Unknown weapon: {weapon}")
+
+
+def character_combatant(
+    class_key: str,
+    level: int,
+    weapon: str = "Longsword",
+    armor_class: int = 15,
+    count: int = 1,
+    data_dir: str = DATA_DIR,
+    rules: RulesArrays | None = None,
+) -> Combatant:
+    """Build a combatant for *count* identical characters wielding *weapon*."""
+    rules = rules if rules is not None else load_rules_arrays(data_dir)
+    attack_bonus = class_attack_bonus(rules, class_key, level)
+    damage = _weapon_damage(weapon, data_dir)
+    return Combatant(
+        name=f"{class_key} {level} ({weapon})",
+        count=count,
+        hit_points=class_hit_dice(class_key, level, data_dir),
+        armor_class=armor_class,
+        attack_bonus=attack_bonus,
+        attacks=(damage,),
+        morale=None,
+    )
+
+
+# Simulation ----------------------------------------------------------------
+
+
+def _strike(
+    attacker: Combatant,
+    attackers_alive: np.ndarray,
+    defender: Combatant,
+    defenders_alive: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Damage dealt to each defender slot, shape (bouts, defender.count)."""
+    bouts, n_att = attackers_alive.shape
+    damage = np.zeros((bouts, defender.count), dtype=np.int64)
+    if not attackers_alive.any():
+        return damage
+    # Random living target per attacker: argmin of random keys with dead slots masked out.
+    keys = rng.random((bouts, n_att, defender.count))
+    keys[~np.broadcast_to(defenders_alive[:, None, :], keys.shape)] = np.inf
+    targets = keys.argmin(axis=2)
+    has_target = defenders_alive.any(axis=1)[:, None]
+    flat_targets = (np.arange(bouts)[:, None] * defender.count + targets).ravel()
+    for attack in attacker.attacks:
+        roll = rng.integers(1, 21, size=(bouts, n_att))
+        hit = (roll == 20) | ((roll != 1) & (roll + attacker.attack_bonus >= defender.armor_class))
+        hit &= attackers_alive & has_target
+        dealt = compile_dice(attack).sample(bouts * n_att, rng).reshape(bouts, n_att)
+        dealt = np.where(hit, np.maximum(dealt, 1), 0)
+        totals = np.bincount(flat_targets, weights=dealt.ravel(), minlength=damage.size)
+        damage += totals.astype(np.int64).reshape(damage.shape)
+    return damage
+
+
+def _morale_check(side: Combatant, needs: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    if side.morale is None or not needs.any():
+        return np.zeros_like(needs)
+    return needs & (compile_dice("2d6").sample(len(needs), rng) > side.morale)
+
+
+def simulate_bouts(
+    a: Combatant,
+    b: Combatant,
+    bouts: int,
+    rng: np.random.Generator | None = None,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+) -> dict[str, np.ndarray]:
+    """Fight *bouts* independent battles of side *a* against side *b* in one process.
+
+    Returns arrays: ``winner`` (0 = a, 1 = b, -1 = draw), ``rounds``,
+    ``survivors_a``/``survivors_b``, ``hp_a``/``hp_b`` (remaining totals)
+    and ``routed_a``/``routed_b``.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    hp_a = compile_dice(a.hit_points).sample(bouts * a.count, rng).reshape(bouts, a.count)
+    hp_b = compile_dice(b.hit_points).sample(bouts * b.count, rng).reshape(bouts, b.count)
+    hp_a, hp_b = np.maximum(hp_a, 1), np.maximum(hp_b, 1)
+
+    routed_a = np.zeros(bouts, dtype=bool)
+    routed_b = np.zeros(bouts, dtype=bool)
+    checked = {side: [np.zeros(bouts, dtype=bool), np.zeros(bouts, dtype=bool)] for side in "ab"}
+    rounds = np.zeros(bouts, dtype=np.int64)
+    active = np.arange(bouts)
+
+    for _ in range(max_rounds):
+        if not len(active):
+            break
+        # Only bouts still in progress are simulated; finished ones keep their state.
+        rounds[active] += 1
+        n = len(active)
+        sub_a, sub_b = hp_a[active], hp_b[active]
+        init_a = rng.integers(1, 7, size=n)
+        init_b = rng.integers(1, 7, size=n)
+        a_first, b_first = init_a > init_b, init_b > init_a
+        tie = ~(a_first | b_first)
+
+        alive_a, alive_b = sub_a > 0, sub_b > 0
+        to_b = _strike(a, alive_a & (a_first | tie)[:, None], b, alive_b, rng)
+        to_a = _strike(b, alive_b & (b_first | tie)[:, None], a, alive_a, rng)
+        sub_a -= to_a
+        sub_b -= to_b
+
+        alive_a, alive_b = sub_a > 0, sub_b > 0
+        sub_b -= _strike(a, alive_a & b_first[:, None], b, alive_b, rng)
+        sub_a -= _strike(b, alive_b & a_first[:, None], a, alive_a, rng)
+        hp_a[active], hp_b[active] = sub_a, sub_b
+
+        for combatant, sub, routed, (first, half) in (
+            (a, sub_a, routed_a, checked["a"]),
+            (b, sub_b, routed_b, checked["b"]),
+        ):
+            down = (sub <= 0).sum(axis=1)
+            partial = down < combatant.count
+            needs_first = ~first[active] & (down >= 1) & partial
+            needs_half = ~half[active] & (down * 2 >= combatant.count) & partial
+            first[active] |= needs_first
+            half[active] |= needs_half
+            routed[active] |= _morale_check(combatant, needs_first | needs_half, rng)
+
+        done = (sub_a <= 0).all(axis=1) | (sub_b <= 0).all(axis=1) | routed_a[active] | routed_b[active]
+        active = active[~done]
+
+    survivors_a, survivors_b = (hp_a > 0).sum(axis=1), (hp_b > 0).sum(axis=1)
+    a_out = (survivors_a == 0) | routed_a
+    b_out = (survivors_b == 0) | routed_b
+    winner = np.full(bouts, DRAW, dtype=np.int64)
+    winner[b_out & ~a_out] = WIN_A
+    winner[a_out & ~b_out] = WIN_B
+    return {
+        "winner": winner,
+        "rounds": rounds,
+        "survivors_a": survivors_a,
+        "survivors_b": survivors_b,
+        "hp_a": np.clip(hp_a, 0, None).sum(axis=1),
+        "hp_b": np.clip(hp_b, 0, None).sum(axis=1),
+        "routed_a": routed_a,
+        "routed_b": routed_b,
+    }
+
+
+def _simulate_chunk(args: tuple[Combatant, Combatant, int, np.random.SeedSequence, int]) -> dict[str, np.ndarray]:
+    a, b, bouts, seed_seq, max_rounds = args
+    return simulate_bouts(a, b, bouts, np.random.default_rng(seed_seq), max_rounds)
+
+
+def simulate(
+    a: Combatant,
+    b: Combatant,
+    bouts: int,
+    seed: int | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+) -> dict[str, np.ndarray]:
+    """Run *bouts* battles, chunked across a process pool.
+
+    Each chunk gets its own stream from ``SeedSequence(seed).spawn``, so a
+    given seed and chunk size reproduce the same results regardless of
+    worker count.  ``workers=1`` runs in-process.
+    """
+    n_chunks = max(1, -(-bouts // chunk_size))
+    sizes = [chunk_size] * (n_chunks - 1) + [bouts - chunk_size * (n_chunks - 1)]
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+    jobs = [(a, b, size, stream, max_rounds) for size, stream in zip(sizes, streams)]
+
+    workers = workers or min(n_chunks, os.cpu_count() or 1)
+    if workers <= 1 or n_chunks == 1:
+        parts = [_simulate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, jobs))
+    return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+
+def balance_report(results: dict[str, np.ndarray]) -> dict[str, float]:
+    """Summary statistics for an encounter balance report."""
+    winner = results["winner"]
+    n = len(winner)
+    return {
+        "bouts": n,
+        "win_rate_a": float((winner == WIN_A).mean()) if n else 0.0,
+        "win_rate_b": float((winner == WIN_B).mean()) if n else 0.0,
+        "draw_rate": float((winner == DRAW).mean()) if n else 0.0,
+        "mean_rounds": float(results["rounds"].mean()) if n else 0.0,
+        "mean_survivors_a": float(results["survivors_a"].mean()) if n else 0.0,
+        "mean_survivors_b": float(results["survivors_b"].mean()) if n else 0.0,
+        "rout_rate_a": float(results["routed_a"].mean()) if n else 0.0,
+        "rout_rate_b": float(results["routed_b"].mean()) if n else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    from parsers.monster_index import load_monster_lookup
+
+    monsters = load_monster_lookup()
+    rules = load_rules_arrays()
+    party = character_combatant("fighter", 3, "Longsword", armor_class=16, count=4, rules=rules)
+    for name, count in (("goblin", 8), ("orc", 6), ("ogre", 2)):
+        foe = monster_combatant(monsters[name], count=count, rules=rules)
+        start = time.perf_counter()
+        results = simulate(party, foe, 100_000, seed=0)
+        elapsed = time.perf_counter() - start
+        report = balance_report(results)
+        print(
+            f"4x {party.name} vs {count}x {foe.name}: party wins {report['win_rate_a']:.1%}, "
+            f"{report['mean_rounds']:.1f} rounds avg, {report['bouts'] / elapsed:,.0f} bouts/s"
+        )
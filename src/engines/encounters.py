@@ -0,0 +1,365 @@
+"""Batch random encounter generation from ``encounter_tables.json``.
+
+Each table column (a dungeon level band or a wilderness terrain) is
+compiled once into a direct-indexed lookup array: ``lookup[roll]`` is the
+ID of a resolved encounter entry.  Entries carry the matched monster
+record, which stat-block variant applies, and a compiled sampler for its
+``no_appearing`` dice.  Generating N encounters is one dice sample, one
+fancy-index, and one vectorized number-appearing draw per distinct entry.
+
+Cell resolution rules:
+
+- "Jelly, Green*": the trailing "*" is recorded as ``starred``.
+- "NPC Party: Bandit": ``npc_party`` is set; no monster record.
+- "Alicorn (see Unicorn)": the name is tried first, then the "see" target.
+- "Roc (1d6: 1-3 Large, 4-5 Huge, 6 Giant)": a second roll picks the
+  variant; options align with the record's last stat-block variants.
+- "Hawk, Giant": a qualified name missing from the monster list falls
+  back to its head record ("Hawk") and that record's last variant.
+
+    PYTHONPATH=src python -m engines.encounters
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Iterator, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, canonical_name, load_dataset
+from engines.dice import CompiledDice, compile_dice, dice_range
+from parsers.monster_index import load_monster_lookup
+
+SETTINGS = ("dungeon", "wild", "lair")
+
+_DIE_RE = re.compile(r"\d*d\d+", re.IGNORECASE)
+_LEVEL_RE = re.compile(r"level\s+(\d+)(?:\s*-\s*(\d+)|(\+))?", re.IGNORECASE)
+_SUBROLL_RE = re.compile(r"^(?P<name>[^(]+)\((?P<die>\d*d\d+):\s*(?P<options>[^)]*)\)$", re.IGNORECASE)
+_SUBOPTION_RE = re.compile(r"(\d+)(?:\s*-\s*(\d+))?\s+([^,]+)")
+_SEE_RE = re.compile(r"^(?P<name>[^(]+)\(see\s+(?P<target>[^)]+)\)$", re.IGNORECASE)
+_COUNT_RE = re.compile(r"^\s*(\d*d\d+(?:\s*[-+x*]\s*\d+)?|\d+)\b", re.IGNORECASE)
+_NPC_PREFIX = "npc party:"
+_MAX_DUNGEON_LEVEL = 8
+
+
+class EncounterEntry(NamedTuple):
+    cell: str
+    name: str
+    monster_id: str | None
+    variant: int
+    starred: bool
+    npc_party: str | None
+    match: str  # "name", "see", "head", "npc" or "unresolved"
+    number: dict[str, CompiledDice | None]
+    sub_die: CompiledDice | None = None
+    sub_lookup: np.ndarray | None = None
+
+
+class EncounterTable(NamedTuple):
+    key: str
+    group: str
+    table_name: str
+    column: str
+    die: CompiledDice
+    lookup: np.ndarray
+
+
+def parse_no_appearing(text: str, variant: int = 0) -> dict[str, str | None]:
+    """Split "1d6, Wild 2d4, Lair 2d4 | 1d4, ..." into per-setting dice for one variant."""
+    variants = [v.strip() for v in str(text or "").split("|")]
+    variants = [v for v in variants if v] or [""]
+    part = variants[min(variant, len(variants) - 1)]
+    out: dict[str, str | None] = {"dungeon": None, "wild": None, "lair": None}
+    for segment in part.split(","):
+        segment = segment.strip()
+        setting = "dungeon"
+        for label in ("wild", "lair"):
+            if segment.lower().startswith(label):
+                setting, segment = label, segment[len(label):]
+        m = _COUNT_RE.match(segment)
+        if m and out[setting] is None:
+            out[setting] = re.sub(r"\s+", "", m.group(1).lower())
+    return out
+
+
+def _number_samplers(monster: dict[str, Any] | None, variant: int) -> dict[str, CompiledDice | None]:
+    if monster is None:
+        return {setting: None for setting in SETTINGS}
+    parsed = parse_no_appearing(monster.get("stat_block", {}).get("no_appearing", ""), variant)
+    return {setting: compile_dice(expr) if expr else None for setting, expr in parsed.items()}
+
+
+def _variant_count(monster: dict[str, Any]) -> int:
+    return max((len([v for v in str(value).split("|") if v.strip()]) for value in monster.get("stat_block", {}).values()), default=1)
+
+
+def _die_max(die: CompiledDice) -> int:
+    return dice_range(die.ast)[1]
+
+
+def column_key(header: str) -> list[str]:
+    """Lookup keys for a column header: dungeon levels or terrain names plus "or" alternates."""
+    m = _LEVEL_RE.search(header)
+    if m:
+        first = int(m.group(1))
+        last = int(m.group(2)) if m.group(2) else (_MAX_DUNGEON_LEVEL if m.group(3) else first)
+        return [f"dungeon level {level}" for level in range(first, last + 1)]
+    keys = [canonical_name(header)]
+    if " or " in header:
+        keys += [canonical_name(part) for part in header.split(" or ")]
+    return keys
+
+
+def table_key(name: str | int) -> str:
+    """Normalize 3 / "Level 3" / "dungeon level 12" / "Woods or Forest" to a table key."""
+    if isinstance(name, int) or str(name).strip().isdigit():
+        level = int(name)
+    else:
+        m = _LEVEL_RE.search(str(name))
+        if m is None:
+            return canonical_name(str(name))
+        level = int(m.group(1))
+    return f"dungeon level {min(max(level, 1), _MAX_DUNGEON_LEVEL)}"
+
+
+class EncounterGenerator:
+    """Compiled encounter tables with monster resolution."""
+
+    def __init__(self, data_dir: str = DATA_DIR) -> None:
+        self.data_dir = data_dir
+        self.monsters = load_monster_lookup(data_dir)
+        self.entries: list[EncounterEntry] = []
+        self._entry_ids: dict[str, int] = {}
+        self.tables: dict[str, EncounterTable] = {}
+
+        for group, tables in (load_dataset("encounter_tables", data_dir) or {}).items():
+            for table in tables:
+                self._compile_table(group, table)
+
+    # Compilation ---------------------------------------------------------
+
+    def _resolve(self, text: str) -> tuple[dict[str, Any] | None, str]:
+        monster = self.monsters.get(canonical_name(text))
+        if monster is not None:
+            return monster, "name"
+        if "," in text:
+            head = self.monsters.get(canonical_name(text.split(",", 1)[0]))
+            if head is not None:
+                return head, "head"
+        return None, "unresolved"
+
+    def _entry(self, cell: str, variant_override: int | None = None, name_override: str | None = None) -> int:
+        cache_key = f"{cell}\x00{variant_override}\x00{name_override}"
+        if cache_key in self._entry_ids:
+            return self._entry_ids[cache_key]
+
+        text = cell.strip()
+        starred = text.endswith("*")
+        text = text.rstrip("*").strip()
+        sub_die = sub_lookup = None
+        npc_party = None
+        monster = None
+        match = "unresolved"
+        name = name_override or text
+
+        sub = _SUBROLL_RE.match(text)
+        see = _SEE_RE.match(text)
+        if text.lower().startswith(_NPC_PREFIX):
+            npc_party = text[len(_NPC_PREFIX):].strip()
+            match = "npc"
+        elif sub and variant_override is None:
+            base = sub.group("name").strip()
+            options = _SUBOPTION_RE.findall(sub.group("options"))
+            monster, match = self._resolve(base)
+            sub_die = compile_dice(sub.group("die"))
+            sub_lookup = np.full(_die_max(sub_die) + 1, -1, dtype=np.int64)
+            # Options fill the record's last variants in order.
+            offset = _variant_count(monster) - len(options) if monster else 0
+            for i, (lo, hi, option) in enumerate(options):
+                child = self._entry(cell, max(offset + i, 0), f"{base}, {option.strip()}")
+                sub_lookup[int(lo) : int(hi or lo) + 1] = child
+            name = base
+        elif see:
+            name = name_override or see.group("name").strip()
+            monster, match = self._resolve(name)
+            if match != "name":
+                monster = self.monsters.get(canonical_name(see.group("target")))
+                match = "see" if monster is not None else "unresolved"
+        else:
+            monster, match = self._resolve(sub.group("name").strip() if sub else text)
+
+        variant = 0
+        if variant_override is not None:
+            variant = variant_override
+        elif monster is not None and match == "head":
+            variant = _variant_count(monster) - 1
+        elif monster is not None:
+            variant = self._alias_variant(monster, name)
+
+        entry = EncounterEntry(
+            cell=cell,
+            name=name,
+            monster_id=monster.get("id") if monster else None,
+            variant=variant,
+            starred=starred,
+            npc_party=npc_party,
+            match=match,
+            number=_number_samplers(monster, variant),
+            sub_die=sub_die,
+            sub_lookup=sub_lookup,
+        )
+        self.entries.append(entry)
+        self._entry_ids[cache_key] = len(self.entries) - 1
+        return len(self.entries) - 1
+
+    @staticmethod
+    def _alias_variant(monster: dict[str, Any], text: str) -> int:
+        """Variant index from the record name: "Wolf (and Wolf, Dire)" + "Wolf, Dire" -> 1."""
+        name = monster.get("name", "")
+        inner = re.findall(r"\(([^)]*)\)", name)
+        count = _variant_count(monster)
+        if not inner or count < 2:
+            return 0
+        target = canonical_name(text)
+        alternates = re.sub(r"^\s*(?:and|or|including)\s+", "", inner[0], flags=re.IGNORECASE).strip()
+        if canonical_name(alternates) == target:
+            return 1
+        base = re.sub(r"\([^)]*\)", "", name)
+        head = base.split(",", 1)[0].strip() if "," in base else ""
+        parts = [p.strip() for p in re.split(r",|\band\b|\bor\b", alternates, flags=re.IGNORECASE) if p.strip()]
+        for i, part in enumerate(parts, start=1):
+            if target in {canonical_name(part), canonical_name(f"{head}, {part}")}:
+                return min(i, count - 1)
+        return 0
+
+    def _compile_table(self, group: str, table: dict[str, Any]) -> None:
+        headers = table.get("headers", [])
+        segments: list[tuple[list[str], list[list[Any]]]] = [(headers, [])]
+        for row in table.get("rows", []):
+            # Some tables repeat a header row midway to start a second block of columns.
+            if row and _DIE_RE.search(str(row[0])) and not str(row[0]).strip().isdigit():
+                segments.append((list(row), []))
+            else:
+                segments[-1][1].append(row)
+
+        for seg_headers, rows in segments:
+            die_text = _DIE_RE.search(str(seg_headers[0]))
+            if die_text is None or not rows:
+                continue
+            die = compile_dice(die_text.group(0).lower())
+            size = _die_max(die) + 1
+            for col, header in enumerate(seg_headers[1:], start=1):
+                lookup = np.full(size, -1, dtype=np.int64)
+                for row in rows:
+                    if col < len(row) and str(row[0]).strip().isdigit() and str(row[col]).strip():
+                        lookup[int(row[0])] = self._entry(str(row[col]))
+                for key in column_key(str(header)):
+                    self.tables.setdefault(
+                        key, EncounterTable(key, group, table.get("table_name", ""), str(header), die, lookup)
+                    )
+
+    # Generation ----------------------------------------------------------
+
+    def table(self, name: str | int) -> EncounterTable:
+        key = table_key(name)
+        if key not in self.tables:
+            raise KeyError(f"Unknown encounter table: {name}")
+        return self.tables[key]
+
+    def generate_arrays(
+        self,
+        name: str | int,
+        n: int,
+        setting: str | None = None,
+        seed: int | None = None,
+        rng: np.random.Generator | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Roll *n* encounters; returns ``roll``, ``entry`` (index into ``entries``) and ``number``.
+
+        *setting* picks the ``no_appearing`` value ("dungeon", "wild" or
+        "lair"); it defaults to "dungeon" for dungeon tables and "wild"
+        otherwise, falling back to whichever value the record has.
+        ``number`` is 1 for NPC parties and for records without dice.
+        """
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        table = self.table(name)
+        setting = setting or ("dungeon" if table.group == "dungeon" else "wild")
+        if setting not in SETTINGS:
+            raise ValueError(f"Unknown setting: {setting}")
+
+        rolls = table.die.sample(n, rng)
+        entry_ids = table.lookup[rolls]
+        number = np.ones(n, dtype=np.int64)
+        for entry_id in np.unique(entry_ids):
+            if entry_id < 0:
+                continue
+            idx = np.flatnonzero(entry_ids == entry_id)
+            entry = self.entries[entry_id]
+            if entry.sub_lookup is not None:
+                entry_ids[idx] = entry.sub_lookup[entry.sub_die.sample(len(idx), rng)]
+                for child_id in np.unique(entry_ids[idx]):
+                    child_idx = idx[entry_ids[idx] == child_id]
+                    number[child_idx] = self._numbers(self.entries[child_id], setting, len(child_idx), rng)
+            else:
+                number[idx] = self._numbers(entry, setting, len(idx), rng)
+        return {"roll": rolls, "entry": entry_ids, "number": number}
+
+    @staticmethod
+    def _numbers(entry: EncounterEntry, setting: str, size: int, rng: np.random.Generator) -> np.ndarray:
+        for candidate in (setting, "dungeon", "wild", "lair"):
+            dice = entry.number.get(candidate)
+            if dice is not None:
+                return dice.sample(size, rng)
+        return np.ones(size, dtype=np.int64)
+
+    def describe(self, entry_id: int) -> dict[str, Any]:
+        entry = self.entries[entry_id]
+        return {
+            "name": entry.name,
+            "monster_id": entry.monster_id,
+            "variant": entry.variant,
+            "starred": entry.starred,
+            "npc_party": entry.npc_party,
+            "match": entry.match,
+        }
+
+    def iter_encounters(
+        self,
+        name: str | int,
+        n: int | None = None,
+        setting: str | None = None,
+        seed: int | None = None,
+        batch_size: int = 4096,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream encounters (forever when *n* is None), generated in batches."""
+        rng = np.random.default_rng(seed)
+        described = [self.describe(i) for i in range(len(self.entries))]
+        remaining = n
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            batch = self.generate_arrays(name, size, setting, rng=rng)
+            for roll, entry_id, number in zip(batch["roll"].tolist(), batch["entry"].tolist(), batch["number"].tolist()):
+                yield {"roll": roll, "number": number, **(described[entry_id] if entry_id >= 0 else {"name": None})}
+            if remaining is not None:
+                remaining -= size
+
+    def unresolved(self) -> list[str]:
+        return sorted({e.cell for e in self.entries if e.match == "unresolved"})
+
+    def benchmark(self, name: str | int = 1, n: int = 1_000_000, seed: int | None = 0) -> dict[str, Any]:
+        start = time.perf_counter()
+        self.generate_arrays(name, n, seed=seed)
+        elapsed = time.perf_counter() - start
+        return {"encounters": n, "seconds": elapsed, "encounters_per_second": n / elapsed if elapsed else float("inf")}
+
+
+if __name__ == "__main__":
+    generator = EncounterGenerator()
+    for name in (1, 6, "grassland", "mountains"):
+        summary = generator.benchmark(name)
+        print(f"{generator.table(name).key}: {summary['encounters_per_second']:,.0f} encounters/s")
+    print(f"unresolved cells: {', '.join(generator.unresolved()) or 'none'}")
+    for encounter in generator.iter_encounters("mountains", 5, seed=1):
+        print(f"  {encounter['roll']:>2} {encounter['name']} x{encounter['number']}")
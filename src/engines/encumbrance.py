@@ -0,0 +1,185 @@
+"""Vectorized encumbrance and movement over the normalized equipment data.
+
+Weapons, armor and equipment rows carry ``price_cp`` and ``weight_lb``
+after the cleanup stage; :func:`load_item_catalog` packs them into one
+catalog with dense price and weight arrays.
+
+Inventories for many characters are given either as a dense
+(character x item) count matrix or as parallel ``owner`` / ``item`` /
+``quantity`` arrays.  :func:`encumbrance` totals each load, compares it
+with the light and heavy load limits for the character's Strength (and
+size), and returns movement in feet per turn for the kind of armor
+worn.
+
+    PYTHONPATH=src python -m engines.encumbrance
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, canonical_name, load_dataset
+
+LIGHT = 0
+HEAVY = 1
+OVERLOADED = 2
+
+UNARMORED = 0
+LEATHER = 1
+METAL = 2
+
+ARMOR_KINDS = {"no armor": UNARMORED, "leather armor": LEATHER, "chain mail": METAL, "plate mail": METAL}
+
+# Load limits in pounds by Strength score 0..18, as (light, heavy), for
+# humans, elves and dwarves and for halflings.
+_STRENGTH_BANDS = np.array([3] * 4 + [4] * 2 + [6] * 3 + [9] * 4 + [13] * 3 + [16] * 2 + [18])
+_LOAD_LIMITS = {3: (25, 60), 4: (35, 90), 6: (50, 120), 9: (60, 150), 13: (65, 165), 16: (70, 180), 18: (80, 195)}
+_SMALL_LOAD_LIMITS = {3: (20, 40), 4: (30, 60), 6: (40, 80), 9: (50, 100), 13: (55, 110), 16: (60, 120), 18: (65, 130)}
+LOAD_LIMITS = np.array([_LOAD_LIMITS[b] for b in _STRENGTH_BANDS], dtype=np.float64)
+SMALL_LOAD_LIMITS = np.array([_SMALL_LOAD_LIMITS[b] for b in _STRENGTH_BANDS], dtype=np.float64)
+
+# Feet per turn by (armor kind, load).
+MOVEMENT = np.array([[40, 30, 0], [30, 20, 0], [20, 10, 0]], dtype=np.int16)
+
+_ITEM_DATASETS = (("weapons", "weapon"), ("armor", "armor_type"), ("equipment", "item"))
+
+
+class ItemCatalog(NamedTuple):
+    names: tuple[str, ...]
+    sources: tuple[str, ...]  # dataset each item came from
+    price_cp: np.ndarray  # (item,), -1 when the item has no price
+    weight_lb: np.ndarray  # (item,), 0 when the item has no weight
+    index: dict[str, int]  # canonical name -> item code
+
+
+def load_item_catalog(data_dir: str = DATA_DIR) -> ItemCatalog:
+    names: list[str] = []
+    sources: list[str] = []
+    prices: list[int] = []
+    weights: list[float] = []
+    for dataset, column in _ITEM_DATASETS:
+        for row in load_dataset(dataset, data_dir) or []:
+            name = str(row.get(column, "")).strip()
+            if not name:
+                continue
+            names.append(name)
+            sources.append(dataset)
+            prices.append(-1 if row.get("price_cp") is None else int(row["price_cp"]))
+            weights.append(0.0 if row.get("weight_lb") is None else float(row["weight_lb"]))
+    index: dict[str, int] = {}
+    for code, name in enumerate(names):
+        index.setdefault(canonical_name(name), code)
+        # "Longsword/Scimitar" is found under either name.
+        for part in name.split("/"):
+            index.setdefault(canonical_name(part), code)
+    return ItemCatalog(
+        names=tuple(names),
+        sources=tuple(sources),
+        price_cp=np.array(prices, dtype=np.int64),
+        weight_lb=np.array(weights, dtype=np.float64),
+        index=index,
+    )
+
+
+def item_code(catalog: ItemCatalog, name: Any) -> Any:
+    """Catalog code for an item name; arrays of names map elementwise."""
+    if isinstance(name, str):
+        code = catalog.index.get(canonical_name(name))
+        if code is None:
+            raise ValueError(f"Unknown item: {name}")
+        return code
+    values = np.asarray(name)
+    if values.dtype.kind in "iu":
+        return values
+    keys, inverse = np.unique(values, return_inverse=True)
+    return np.array([item_code(catalog, str(k)) for k in keys], dtype=np.intp)[inverse].reshape(values.shape)
+
+
+def armor_kind(name: Any) -> Any:
+    """:data:`UNARMORED`, :data:`LEATHER` or :data:`METAL` for armor names (scalar or array)."""
+    if isinstance(name, str):
+        return ARMOR_KINDS.get(canonical_name(name), METAL)
+    values = np.asarray(name)
+    keys, inverse = np.unique(values, return_inverse=True)
+    return np.array([armor_kind(str(k)) for k in keys], dtype=np.int8)[inverse].reshape(values.shape)
+
+
+def inventory_load(
+    catalog: ItemCatalog,
+    counts: np.ndarray | None = None,
+    owners: Any = None,
+    items: Any = None,
+    quantities: Any = 1,
+    n: int | None = None,
+) -> np.ndarray:
+    """Pounds carried per character.
+
+    Pass either *counts*, a (character x item) matrix, or parallel
+    *owners* / *items* / *quantities* arrays for *n* characters.
+    """
+    if counts is not None:
+        return np.asarray(counts, dtype=np.float64) @ catalog.weight_lb
+    owners = np.asarray(owners, dtype=np.intp)
+    codes = item_code(catalog, items)
+    weights = catalog.weight_lb[codes] * np.broadcast_to(np.asarray(quantities, dtype=np.float64), owners.shape)
+    size = n if n is not None else (int(owners.max()) + 1 if owners.size else 0)
+    return np.bincount(owners, weights=weights, minlength=size)
+
+
+def inventory_cost(catalog: ItemCatalog, counts: np.ndarray) -> np.ndarray:
+    """Copper pieces per character for a (character x item) count matrix; unpriced items count 0."""
+    return np.asarray(counts, dtype=np.int64) @ np.maximum(catalog.price_cp, 0)
+
+
+def load_limits(strength: Any, small: Any = False) -> tuple[np.ndarray, np.ndarray]:
+    """(light, heavy) load limits in pounds for Strength scores; *small* marks halflings."""
+    score = np.clip(np.asarray(strength), 3, 18)
+    limits = np.where(np.asarray(small)[..., None], SMALL_LOAD_LIMITS[score], LOAD_LIMITS[score])
+    return limits[..., 0], limits[..., 1]
+
+
+def encumbrance(load_lb: Any, strength: Any, armor: Any = UNARMORED, small: Any = False) -> dict[str, np.ndarray]:
+    """Load status and movement for each character.
+
+    *armor* holds :data:`UNARMORED` / :data:`LEATHER` / :data:`METAL`
+    codes or armor names.  Returns arrays: ``load_lb``, ``light_limit``,
+    ``heavy_limit``, ``status`` (:data:`LIGHT`, :data:`HEAVY` or
+    :data:`OVERLOADED`) and ``movement`` (feet per turn; 0 when
+    overloaded).
+    """
+    load = np.atleast_1d(np.asarray(load_lb, dtype=np.float64))
+    kinds = np.asarray(armor if np.asarray(armor).dtype.kind in "iu" else armor_kind(armor))
+    load, strength, kinds, small = np.broadcast_arrays(load, np.asarray(strength), kinds, np.asarray(small, dtype=bool))
+    light, heavy = load_limits(strength, small)
+    status = np.where(load <= light, LIGHT, np.where(load <= heavy, HEAVY, OVERLOADED)).astype(np.int8)
+    return {
+        "load_lb": load,
+        "light_limit": light,
+        "heavy_limit": heavy,
+        "status": status,
+        "movement": MOVEMENT[kinds, status],
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    catalog = load_item_catalog()
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    per_character = 12
+    owners = np.repeat(np.arange(n), per_character)
+    items = rng.integers(0, len(catalog.names), size=n * per_character)
+    strength = rng.integers(3, 19, size=n)
+    armor = rng.integers(0, 3, size=n)
+
+    start = time.perf_counter()
+    load = inventory_load(catalog, owners=owners, items=items, n=n)
+    result = encumbrance(load, strength, armor)
+    elapsed = time.perf_counter() - start
+    rates = np.bincount(result["status"], minlength=3) / n
+    print(f"{len(catalog.names)} items; mean load {load.mean():.1f} lb")
+    print(f"light {rates[LIGHT]:.1%}, heavy {rates[HEAVY]:.1%}, overloaded {rates[OVERLOADED]:.1%}")
+    print(f"{n / elapsed:,.0f} characters/s")
@@ -0,0 +1,175 @@
+"""Dense lookup arrays for attack bonus and saving throws.
+
+``attack_bonus.json`` stores one record per bonus step, with level ranges
+per class column; ``saving_throws.json`` stores per-class rows keyed by
+level or level range.  Both are compiled once into NumPy arrays:
+
+- ``attack_bonus[class, level]``: int, level 0 is the Normal Man row
+- ``monster_attack_bonus[hit_dice]``: int, HD 0 is "less than 1" and the
+  last slot is "32 or more"
+- ``saving_throws[class, level, save]``: int, save order is
+  :data:`SAVE_KEYS`
+
+Lookups index straight into the arrays, and every lookup function takes
+either scalars or NumPy arrays of levels (and classes), clamping levels
+into the table range.
+
+    PYTHONPATH=src python -m engines.lookup_tables
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, load_dataset
+
+CLASS_KEYS = ("cleric", "fighter", "magic_user", "thief")
+SAVE_KEYS = ("death_ray_or_poison", "magic_wands", "paralysis_or_petrify", "dragon_breath", "spells")
+ATTACK_BONUS_COLUMNS = {
+    "cleric": "cleric_or_thief_level",
+    "fighter": "fighter_level",
+    "magic_user": "magic_user_level",
+    "thief": "cleric_or_thief_level",
+}
+MAX_LEVEL = 20
+MAX_MONSTER_HD = 32
+
+_CLASS_INDEX = {key: i for i, key in enumerate(CLASS_KEYS)}
+_SAVE_INDEX = {key: i for i, key in enumerate(SAVE_KEYS)}
+
+
+class RulesArrays(NamedTuple):
+    attack_bonus: np.ndarray  # (class, level)
+    monster_attack_bonus: np.ndarray  # (hit dice,)
+    saving_throws: np.ndarray  # (class, level, save)
+
+
+def _levels(cell: Any) -> list[int]:
+    """Levels named by a table cell: [2, 3], "7", "NM" (0), "less than 1" (0), "32 or more"."""
+    if isinstance(cell, list):
+        return [int(v) for v in cell]
+    text = str(cell).strip().lower()
+    if text.isdigit():
+        return [int(text)]
+    if text == "nm" or text.startswith("less than"):
+        return [0]
+    if text.endswith("or more") and text.split()[0].isdigit():
+        return [int(text.split()[0])]
+    return []
+
+
+def _fill_gaps(values: np.ndarray, missing: int) -> np.ndarray:
+    """Forward-fill unset slots along the last level axis, then back-fill leading ones."""
+    filled = values.copy()
+    for i in range(1, filled.shape[-1]):
+        gap = filled[..., i] == missing
+        filled[..., i][gap] = filled[..., i - 1][gap]
+    for i in range(filled.shape[-1] - 2, -1, -1):
+        gap = filled[..., i] == missing
+        filled[..., i][gap] = filled[..., i + 1][gap]
+    return filled
+
+
+def compile_attack_bonus(records: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Compile ``attack_bonus.json`` into (class x level) and (monster HD) arrays."""
+    missing = np.iinfo(np.int16).min
+    by_class = np.full((len(CLASS_KEYS), MAX_LEVEL + 1), missing, dtype=np.int16)
+    by_hd = np.full(MAX_MONSTER_HD + 1, missing, dtype=np.int16)
+    for record in records:
+        bonus = int(str(record.get("attack_bonus", "0")).replace("+", "").strip() or 0)
+        for key, column in ATTACK_BONUS_COLUMNS.items():
+            for level in _levels(record.get(column, "")):
+                if level <= MAX_LEVEL:
+                    by_class[_CLASS_INDEX[key], level] = bonus
+        for hd in _levels(record.get("monster_hit_dice", "")):
+            by_hd[min(hd, MAX_MONSTER_HD)] = bonus
+    # Only the fighter column lists a Normal Man row; it applies to every class.
+    by_class[:, 0] = by_class[_CLASS_INDEX["fighter"], 0]
+    return _fill_gaps(by_class, missing), _fill_gaps(by_hd, missing)
+
+
+def compile_saving_throws(tables: dict[str, list[dict[str, Any]]]) -> np.ndarray:
+    """Compile ``saving_throws.json`` into a (class x level x save) array."""
+    missing = np.iinfo(np.int16).min
+    saves = np.full((len(CLASS_KEYS), len(SAVE_KEYS), MAX_LEVEL + 1), missing, dtype=np.int16)
+    for key, rows in tables.items():
+        if key not in _CLASS_INDEX:
+            continue
+        for row in rows:
+            values = [int(str(row.get(save, "")).strip() or missing) for save in SAVE_KEYS]
+            for level in _levels(row.get("level", "")):
+                if level <= MAX_LEVEL:
+                    saves[_CLASS_INDEX[key], :, level] = values
+    normal_man = saves[_CLASS_INDEX["fighter"], :, 0]
+    if (normal_man != missing).all():
+        saves[:, :, 0] = normal_man
+    return _fill_gaps(saves, missing).transpose(0, 2, 1).copy()
+
+
+def load_rules_arrays(data_dir: str = DATA_DIR) -> RulesArrays:
+    attack_bonus, monster_attack_bonus = compile_attack_bonus(load_dataset("attack_bonus", data_dir) or [])
+    return RulesArrays(
+        attack_bonus=attack_bonus,
+        monster_attack_bonus=monster_attack_bonus,
+        saving_throws=compile_saving_throws(load_dataset("saving_throws", data_dir) or {}),
+    )
+
+
+def class_index(class_key: Any) -> Any:
+    """Index of a class key; arrays of keys map elementwise, integer codes pass through."""
+    if isinstance(class_key, str):
+        if class_key not in _CLASS_INDEX:
+            raise ValueError(f"Unknown class: {class_key}")
+        return _CLASS_INDEX[class_key]
+    codes = np.asarray(class_key)
+    if codes.dtype.kind in "iu":
+        return codes
+    keys, inverse = np.unique(codes, return_inverse=True)
+    return np.array([class_index(str(k)) for k in keys], dtype=np.intp)[inverse].reshape(codes.shape)
+
+
+def save_index(save: str) -> int:
+    if save not in _SAVE_INDEX:
+        raise ValueError(f"Unknown saving throw: {save}")
+    return _SAVE_INDEX[save]
+
+
+def _scalar(value: np.ndarray) -> Any:
+    return int(value) if np.ndim(value) == 0 else value.astype(np.int64)
+
+
+def class_attack_bonus(rules: RulesArrays, class_key: Any, level: Any) -> Any:
+    """Attack bonus for a class (or array of classes) at a level (or array of levels)."""
+    levels = np.clip(level, 0, MAX_LEVEL)
+    return _scalar(rules.attack_bonus[class_index(class_key), levels])
+
+
+def monster_attack_bonus(rules: RulesArrays, hit_dice: Any) -> Any:
+    """Attack bonus for monster hit dice; below 1 HD is 0, 32 or more share the top row."""
+    return _scalar(rules.monster_attack_bonus[np.clip(hit_dice, 0, MAX_MONSTER_HD)])
+
+
+def saving_throw(rules: RulesArrays, class_key: Any, level: Any, save: str | None = None) -> Any:
+    """Saving throw target for one save, or all five in :data:`SAVE_KEYS` order when *save* is None."""
+    row = rules.saving_throws[class_index(class_key), np.clip(level, 0, MAX_LEVEL)]
+    return _scalar(row if save is None else row[..., save_index(save)])
+
+
+if __name__ == "__main__":
+    import time
+
+    rules = load_rules_arrays()
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    classes = rng.integers(0, len(CLASS_KEYS), size=n)
+    levels = rng.integers(1, MAX_LEVEL + 1, size=n)
+
+    start = time.perf_counter()
+    bonuses = class_attack_bonus(rules, classes, levels)
+    saves = saving_throw(rules, classes, levels, "dragon_breath")
+    elapsed = time.perf_counter() - start
+    print(f"fighter 7 attack bonus: +{class_attack_bonus(rules, 'fighter', 7)}")
+    print(f"thief 9 vs dragon breath: {saving_throw(rules, 'thief', 9, 'dragon_breath')}")
+    print(f"{2 * n / elapsed:,.0f} vectorized lookups/s (mean bonus {bonuses.mean():.2f}, mean save {saves.mean():.2f})")
@@ -0,0 +1,384 @@
+"""Random magic item generation over the chained ``magic_item_tables.json``.
+
+Every d%/dN subtable is compiled once into an alias-method sampler
+(Vose), so each draw costs one integer and one uniform regardless of the
+number of rows.  Generation follows the chain the manual describes:
+
+    Magic Item Generation (Any / Weapon or Armor / Any Exc. Weapons)
+      -> Weapon: weapon type, melee/missile bonus, special enemy, special ability
+      -> Armor: armor type and bonus
+      -> Potion, Wand/Staff/Rod, Rare Item (-> Device of Summoning Elementals)
+      -> Scroll (-> spell levels for spell scrolls)
+      -> Miscellaneous Item: effect subtable, effect, then form by letter
+
+Batches are sampled stage by stage with NumPy, so a call for N items
+makes a fixed number of vectorized draws per stage.  Each generated item
+is linked by name to its ``magic_items.json`` description when one exists.
+
+    PYTHONPATH=src python -m engines.magic_items
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+from data_store import DATA_DIR, canonical_name, load_dataset
+
+CATEGORY_COLUMNS = {
+    "any": "Any",
+    "weapon_or_armor": "Weapon or Armor",
+    "any_except_weapons": "Any Exc. Weapons",
+}
+# Treasure categories that name an item type directly (see engines.treasure).
+DIRECT_TYPES = {"potion": "Potion", "scroll": "Scroll"}
+
+# No leading \b: "Shortbow" and "Longbow" are missile weapons too.
+MISSILE_WEAPON_RE = re.compile(r"(?:bow|arrow|quarrel|bullet|sling)", re.IGNORECASE)
+
+_SPELL_COUNT_RE = re.compile(r"\((\d+) Spells?\)")
+_BONUS_SUFFIX_RE = re.compile(r"\s*[+-]\d+$")
+
+
+class AliasTable(NamedTuple):
+    outcomes: tuple[Any, ...]
+    prob: np.ndarray
+    alias: np.ndarray
+
+
+def build_alias_table(outcomes: Sequence[Any], weights: Sequence[float]) -> AliasTable:
+    """Build a Vose alias table for *outcomes* drawn with the given weights."""
+    n = len(outcomes)
+    if n == 0 or len(weights) != n:
+        raise ValueError("Alias table needs one positive weight per outcome")
+    total = float(sum(weights))
+    if total <= 0:
+        raise ValueError("Alias table weights must sum to a positive value")
+    scaled = [w * n / total for w in weights]
+    prob = np.ones(n, dtype=np.float64)
+    alias = np.arange(n, dtype=np.int64)
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] = scaled[g] + scaled[s] - 1.0
+        (small if scaled[g] < 1.0 else large).append(g)
+    # Leftovers are 1.0 up to rounding error.
+    return AliasTable(tuple(outcomes), prob, alias)
+
+
+def alias_sample(table: AliasTable, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw *size* outcome indices from *table*."""
+    column = rng.integers(0, len(table.outcomes), size=size)
+    return np.where(rng.random(size) < table.prob[column], column, table.alias[column])
+
+
+def roll_values(cell: Any) -> list[int]:
+    """Die results covered by a roll cell: [1, 2, 3] / "09" / "00" (100) / ""."""
+    if isinstance(cell, list):
+        return [int(v) for v in cell]
+    text = str(cell).strip()
+    if not text.isdigit():
+        return []
+    return [100 if text == "00" else int(text)]
+
+
+def compile_subtable(
+    rows: Sequence[Sequence[Any]],
+    roll_col: int,
+    value_cols: int | Sequence[int],
+    exclude: Sequence[Any] = (),
+) -> AliasTable:
+    """Compile one roll column of a (possibly side-by-side) table.
+
+    Each outcome is the value cell (or a tuple of cells when *value_cols*
+    is a sequence), weighted by how many die results select it.
+    """
+    outcomes: list[Any] = []
+    weights: list[int] = []
+    for row in rows:
+        if roll_col >= len(row):
+            continue
+        values = roll_values(row[roll_col])
+        if not values:
+            continue
+        outcome = row[value_cols] if isinstance(value_cols, int) else tuple(row[c] for c in value_cols)
+        if outcome in exclude:
+            continue
+        outcomes.append(outcome)
+        weights.append(len(values))
+    return build_alias_table(outcomes, weights)
+
+
+def _side_by_side(rows: Sequence[Sequence[Any]], roll_cols: Sequence[int]) -> list[list[Any]]:
+    """Stack side-by-side (roll, value) column pairs that share one die into one list."""
+    return [[row[c], row[c + 1]] for c in roll_cols for row in rows if c + 1 < len(row)]
+
+
+def _clean(text: str) -> str:
+    return " ".join(str(text).replace("*", "").replace("(see below)", "").split()).strip(" ,")
+
+
+def _with_bonus(base: str, bonus: str) -> str:
+    bonus = _clean(bonus)
+    if bonus.lower().startswith("cursed"):
+        rest = bonus[len("cursed"):].strip(" ,")
+        return f"{base} {rest} (Cursed)" if rest.startswith(("-", "+")) else f"{base} ({bonus})"
+    return f"{base} {bonus}"
+
+
+class MagicItemGenerator:
+    """Alias-method samplers compiled from ``magic_item_tables.json``."""
+
+    def __init__(self, data_dir: str = DATA_DIR) -> None:
+        self.data_dir = data_dir
+        tables = load_dataset("magic_item_tables", data_dir) or []
+        by_section: dict[str, list[dict[str, Any]]] = {}
+        for table in tables:
+            by_section.setdefault(table.get("section", ""), []).append(table)
+
+        def rows(section: str, index: int = 0) -> list[list[Any]]:
+            return by_section[section][index]["rows"]
+
+        generation = by_section["Magic Item Generation"][0]
+        type_col = len(generation["headers"]) - 1
+        self.by_category = {
+            key: compile_subtable(generation["rows"], generation["headers"].index(header), type_col)
+            for key, header in CATEGORY_COLUMNS.items()
+        }
+
+        self.weapon_types = compile_subtable(rows("Magic Weapons", 0), 0, 1)
+        bonus_rows = rows("Magic Weapons", 1)
+        self.melee_bonus = compile_subtable(bonus_rows, 0, 2)
+        self.missile_bonus = compile_subtable(bonus_rows, 1, 2)
+        reroll = [o for o in self.melee_bonus.outcomes if "roll again" in str(o).lower()]
+        self.melee_reroll = compile_subtable(bonus_rows, 0, 2, exclude=reroll)
+        enemies = rows("Magic Weapons", 2)
+        self.special_enemy = compile_subtable(_side_by_side(enemies, (0, 3)), 0, 1)
+        self.special_ability = compile_subtable(rows("Magic Weapons", 3), 0, 1)
+
+        armor = rows("Magic Armor")
+        self.armor_types = compile_subtable(armor, 0, 1)
+        self.armor_bonus = compile_subtable(armor, 3, 4)
+
+        self.potions = compile_subtable(_side_by_side(rows("Potions"), (0, 3, 6)), 0, 1)
+
+        self.scrolls = compile_subtable(rows("Scrolls", 0), 0, 1)
+        self.scroll_spell_level = compile_subtable(rows("Scrolls", 1), 0, 1)
+        self.wands = compile_subtable(rows("Wands, Staves and Rods"), 0, 1)
+
+        self.misc_subtable = compile_subtable(rows("Miscellaneous Items", 0), 0, 1)
+        self.misc_effects = {
+            "Effect Subtable 1": compile_subtable(rows("Miscellaneous Items", 1), 0, (1, 2)),
+            "Effect Subtable 2": compile_subtable(rows("Miscellaneous Items", 2), 0, (1, 2)),
+        }
+        form_table = by_section["Miscellaneous Items"][3]
+        self.misc_forms = {
+            letter: compile_subtable(form_table["rows"], col, 0)
+            for col, letter in enumerate(form_table["headers"])
+            if letter
+        }
+
+        self.rare_items = compile_subtable(rows("Rare Items"), 0, 1)
+        self.summoning_devices = compile_subtable(rows("Devices of Summoning Elementals"), 0, 1)
+
+        self._items: dict[tuple[str, str], str] = {}
+        self._items_any: dict[str, str] = {}
+        for item in load_dataset("magic_items", data_dir) or []:
+            key = canonical_name(item.get("name", ""))
+            self._items.setdefault((item.get("category", ""), key), item["name"])
+            self._items_any.setdefault(key, item["name"])
+
+    def link(self, category: str, name: str) -> str | None:
+        """Return the ``magic_items.json`` name describing *name*, if any."""
+        for candidate in (name, _BONUS_SUFFIX_RE.sub("", name)):
+            key = canonical_name(_clean(candidate))
+            found = self._items.get((category, key)) or self._items_any.get(key)
+            if found:
+                return found
+        return None
+
+    def _draw(self, table: AliasTable, size: int, rng: np.random.Generator) -> list[Any]:
+        outcomes = table.outcomes
+        return [outcomes[i] for i in alias_sample(table, size, rng)]
+
+    # Per-type stages: each takes a batch size and returns that many items.
+
+    def _weapons(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        bases = self._draw(self.weapon_types, n, rng)
+        missile = np.array([bool(MISSILE_WEAPON_RE.search(b)) for b in bases], dtype=bool)
+        bonuses = np.empty(n, dtype=object)
+        bonuses[missile] = self._draw(self.missile_bonus, int(missile.sum()), rng)
+        bonuses[~missile] = self._draw(self.melee_bonus, int((~missile).sum()), rng)
+
+        needs_ability = np.array(["roll again" in b.lower() for b in bonuses], dtype=bool)
+        bonuses[needs_ability] = self._draw(self.melee_reroll, int(needs_ability.sum()), rng)
+        abilities = self._draw(self.special_ability, int(needs_ability.sum()), rng)
+        needs_enemy = np.array(["special enemy" in b.lower() for b in bonuses], dtype=bool)
+        enemies = self._draw(self.special_enemy, int(needs_enemy.sum()), rng)
+
+        items = []
+        ability_iter, enemy_iter = iter(abilities), iter(enemies)
+        for base, bonus, has_ability, has_enemy in zip(bases, bonuses, needs_ability, needs_enemy):
+            details: dict[str, Any] = {"weapon": base, "bonus": _clean(bonus)}
+            name = _with_bonus(base, bonus)
+            magic_item = None
+            if has_enemy:
+                details["special_enemy"] = next(enemy_iter)
+                name = name.replace("Special Enemy", details["special_enemy"])
+            if has_ability:
+                details["special_ability"] = next(ability_iter)
+                name = f"{name} ({details['special_ability']})"
+                magic_item = self.link("Magic Weapons", details["special_ability"])
+            items.append({"type": "Weapon", "name": name, "details": details, "magic_item": magic_item})
+        return items
+
+    def _armor(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        return [
+            {
+                "type": "Armor",
+                "name": _with_bonus(base, bonus),
+                "details": {"armor": base, "bonus": _clean(bonus)},
+                "magic_item": self.link("Magic Armor", bonus) if "cursed" in bonus.lower() else None,
+            }
+            for base, bonus in zip(self._draw(self.armor_types, n, rng), self._draw(self.armor_bonus, n, rng))
+        ]
+
+    def _potions(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        return [
+            {"type": "Potion", "name": f"Potion of {p}", "details": {}, "magic_item": self.link("Potions", p)}
+            for p in self._draw(self.potions, n, rng)
+        ]
+
+    def _scrolls(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        kinds = self._draw(self.scrolls, n, rng)
+        counts = [int(m.group(1)) if (m := _SPELL_COUNT_RE.search(k)) else 0 for k in kinds]
+        levels = iter(self._draw(self.scroll_spell_level, sum(counts), rng))
+        items = []
+        for kind, count in zip(kinds, counts):
+            details: dict[str, Any] = {}
+            magic_item = self.link("Scrolls", kind)
+            if count:
+                details["spell_levels"] = [next(levels) for _ in range(count)]
+                magic_item = self.link("Scrolls", "Spell Scrolls")
+            items.append({"type": "Scroll", "name": kind, "details": details, "magic_item": magic_item})
+        return items
+
+    def _wands(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        return [
+            {"type": "Wand, Staff, or Rod", "name": w, "details": {}, "magic_item": self.link("Wands, Staves and Rods", w)}
+            for w in self._draw(self.wands, n, rng)
+        ]
+
+    def _misc(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        subtables = np.array(self._draw(self.misc_subtable, n, rng), dtype=object)
+        effects = np.empty(n, dtype=object)
+        for name, table in self.misc_effects.items():
+            mask = subtables == name
+            # Outcomes are (effect, form letter) tuples; assign one by one so
+            # NumPy does not broadcast them into a 2-D array.
+            for i, effect in zip(np.flatnonzero(mask), self._draw(table, int(mask.sum()), rng)):
+                effects[i] = effect
+        letters = np.array([e[1] for e in effects], dtype=object)
+        forms = np.empty(n, dtype=object)
+        for letter, table in self.misc_forms.items():
+            mask = letters == letter
+            forms[mask] = self._draw(table, int(mask.sum()), rng)
+        return [
+            {
+                "type": "Miscellaneous Items",
+                "name": f"{form} of {effect}",
+                "details": {"effect": effect, "form": form, "form_letter": letter},
+                "magic_item": self.link("Miscellaneous Item Effects", effect),
+            }
+            for (effect, letter), form in zip(effects, forms)
+        ]
+
+    def _rare(self, n: int, rng: np.random.Generator) -> list[dict[str, Any]]:
+        names = self._draw(self.rare_items, n, rng)
+        is_device = [name.startswith("Device of Summoning") for name in names]
+        devices = iter(self._draw(self.summoning_devices, sum(is_device), rng))
+        items = []
+        for name, device in zip(names, is_device):
+            if device:
+                name = next(devices)
+                items.append({"type": "Rare Items", "name": name, "details": {}, "magic_item": self.link("Devices of Summoning Elementals", name)})
+            else:
+                items.append({"type": "Rare Items", "name": name, "details": {}, "magic_item": self.link("Rare Items", name)})
+        return items
+
+    _STAGES = {
+        "Weapon": "_weapons",
+        "Armor": "_armor",
+        "Potion": "_potions",
+        "Scroll": "_scrolls",
+        "Wand, Staff, or Rod": "_wands",
+        "Miscellaneous Items": "_misc",
+        "Rare Items": "_rare",
+    }
+
+    def generate_types(self, types: Sequence[str], rng: np.random.Generator) -> list[dict[str, Any]]:
+        """Resolve a batch of item types, preserving order."""
+        types_arr = np.array(types, dtype=object)
+        out: list[dict[str, Any] | None] = [None] * len(types_arr)
+        for type_name, stage in self._STAGES.items():
+            idx = np.flatnonzero(types_arr == type_name)
+            if len(idx):
+                for i, item in zip(idx, getattr(self, stage)(len(idx), rng)):
+                    out[i] = item
+        return out  # type: ignore[return-value]
+
+    def generate(
+        self,
+        n: int,
+        category: str = "any",
+        seed: int | None = None,
+        rng: np.random.Generator | None = None,
+    ) -> list[dict[str, Any]]:
+        """Generate *n* items for a treasure category.
+
+        *category* is ``any``, ``weapon_or_armor``, ``any_except_weapons``,
+        ``potion`` or ``scroll``.  Pass *seed* for a reproducible batch.
+        """
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        if category in DIRECT_TYPES:
+            return self.generate_types([DIRECT_TYPES[category]] * n, rng)
+        if category not in self.by_category:
+            raise ValueError(f"Unknown magic item category: {category}")
+        return self.generate_types(self._draw(self.by_category[category], n, rng), rng)
+
+    def generate_counts(self, counts: Mapping[str, int], seed: int | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Generate items for per-category totals, e.g. summed ``magic_*`` hoard columns."""
+        rng = np.random.default_rng(seed)
+        return {
+            category.removeprefix("magic_"): self.generate(int(n), category.removeprefix("magic_"), rng=rng)
+            for category, n in counts.items()
+        }
+
+    def benchmark(self, n: int = 100_000, category: str = "any", seed: int | None = 0) -> dict[str, Any]:
+        start = time.perf_counter()
+        items = self.generate(n, category, seed=seed)
+        elapsed = time.perf_counter() - start
+        return {
+            "items": len(items),
+            "seconds": elapsed,
+            "items_per_second": len(items) / elapsed if elapsed else float("inf"),
+            "linked": sum(1 for item in items if item["magic_item"]),
+        }
+
+
+if __name__ == "__main__":
+    import sys
+
+    generator = MagicItemGenerator()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for category in ("any", "weapon_or_armor", "any_except_weapons"):
+        summary = generator.benchmark(n, category)
+        print(f"{category}: {summary['items_per_second']:,.0f} items/s ({summary['linked']:,} linked)")
+    for item in generator.generate(5, seed=1):
+        print(f"  {item['name']}")
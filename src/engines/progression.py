@@ -0,0 +1,150 @@
+"""XP-to-level index and batch level-up over ``class_tables.json``.
+
+Each class's rows are compiled once into a sorted array of XP thresholds
+(one per level, starting at 0) and a (level x spell level) slot array.
+Resolving a level is a bisect of the thresholds: :func:`level_for_xp`
+uses :func:`bisect.bisect_right` for one total and
+:func:`numpy.searchsorted` for arrays.
+
+:func:`apply_xp` is the session-end batch call: it adds awards (with an
+optional per-character percentage bonus) to N characters of any mix of
+classes and returns new XP, levels, levels gained and spell slots.
+
+    PYTHONPATH=src python -m engines.progression
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, load_dataset
+from engines.lookup_tables import CLASS_KEYS, class_index
+
+SPELL_LEVELS = ("1", "2", "3", "4", "5", "6")
+
+
+class ProgressionTable(NamedTuple):
+    class_key: str
+    thresholds: np.ndarray  # (level,) XP needed for levels 1..N, ascending
+    points: tuple[int, ...]  # the same thresholds, for scalar bisects
+    hit_dice: tuple[str, ...]  # per level, 1..N
+    spell_slots: np.ndarray  # (level + 1, spell level); row 0 is all zeros
+
+    @property
+    def max_level(self) -> int:
+        return len(self.thresholds)
+
+
+def _int_cell(value: Any) -> int:
+    text = str(value).replace(",", "").strip()
+    return int(text) if text.isdigit() else 0
+
+
+def compile_progression(class_key: str, rows: list[dict[str, Any]]) -> ProgressionTable:
+    rows = sorted(rows, key=lambda r: _int_cell(r.get("level")))
+    thresholds = np.array([_int_cell(r.get("points")) for r in rows], dtype=np.int64)
+    if np.any(np.diff(thresholds) <= 0):
+        raise ValueError(f"XP thresholds for {class_key} are not increasing")
+    slots = np.zeros((len(rows) + 1, len(SPELL_LEVELS)), dtype=np.int8)
+    for level, row in enumerate(rows, start=1):
+        slots[level] = [_int_cell(row.get(col, "")) for col in SPELL_LEVELS]
+    return ProgressionTable(
+        class_key=class_key,
+        thresholds=thresholds,
+        points=tuple(thresholds.tolist()),
+        hit_dice=tuple(str(r.get("hit_dice", "")) for r in rows),
+        spell_slots=slots,
+    )
+
+
+def load_progression(data_dir: str = DATA_DIR) -> dict[str, ProgressionTable]:
+    """Compiled progression per class key (classes without a table are absent)."""
+    return {
+        key: compile_progression(key, rows)
+        for key, rows in (load_dataset("class_tables", data_dir) or {}).items()
+        if rows
+    }
+
+
+def level_for_xp(table: ProgressionTable, xp: Any) -> Any:
+    """Level reached with *xp* (scalar or array); never below 1 or above the table."""
+    if np.ndim(xp) == 0:
+        return max(bisect.bisect_right(table.points, int(xp)), 1)
+    return np.maximum(np.searchsorted(table.thresholds, np.asarray(xp), side="right"), 1)
+
+
+def xp_for_level(table: ProgressionTable, level: Any) -> Any:
+    """XP threshold of *level* (scalar or array), clamped to the table."""
+    thresholds = table.thresholds[np.clip(np.asarray(level), 1, table.max_level) - 1]
+    return int(thresholds) if np.ndim(thresholds) == 0 else thresholds
+
+
+def apply_xp(
+    tables: dict[str, ProgressionTable],
+    classes: Any,
+    xp: Any,
+    awards: Any,
+    bonus_percent: Any = 0,
+    max_levels_gained: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Add XP *awards* to characters of the given *classes* and resolve new levels.
+
+    *classes* holds class keys or :data:`~engines.lookup_tables.CLASS_KEYS`
+    codes; *xp*, *awards* and *bonus_percent* (e.g. 10 for humans)
+    broadcast against it.  With *max_levels_gained*, XP beyond that many
+    levels is dropped to one point short of the next level.
+
+    Returns arrays: ``xp``, ``level``, ``previous_level``,
+    ``levels_gained`` and ``spell_slots`` (n x 6, spell levels 1-6).
+    """
+    codes = np.atleast_1d(class_index(classes))
+    xp = np.broadcast_to(np.asarray(xp, dtype=np.int64), codes.shape)
+    awards = np.broadcast_to(np.asarray(awards, dtype=np.int64), codes.shape)
+    bonus = np.broadcast_to(np.asarray(bonus_percent, dtype=np.int64), codes.shape)
+
+    new_xp = xp + awards * (100 + bonus) // 100
+    previous = np.zeros(codes.shape, dtype=np.int64)
+    level = np.zeros(codes.shape, dtype=np.int64)
+    slots = np.zeros(codes.shape + (len(SPELL_LEVELS),), dtype=np.int8)
+    for code in np.unique(codes):
+        class_key = CLASS_KEYS[code]
+        if class_key not in tables:
+            raise ValueError(f"No progression table for class: {class_key}")
+        table = tables[class_key]
+        idx = codes == code
+        previous[idx] = level_for_xp(table, xp[idx])
+        if max_levels_gained is not None:
+            cap_level = previous[idx] + max_levels_gained + 1
+            capped = cap_level <= table.max_level
+            limit = np.where(capped, xp_for_level(table, cap_level) - 1, np.iinfo(np.int64).max)
+            new_xp[idx] = np.minimum(new_xp[idx], limit)
+        level[idx] = level_for_xp(table, new_xp[idx])
+        slots[idx] = table.spell_slots[level[idx]]
+    return {
+        "xp": new_xp,
+        "level": level,
+        "previous_level": previous,
+        "levels_gained": level - previous,
+        "spell_slots": slots,
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    tables = load_progression()
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    keys = [k for k in CLASS_KEYS if k in tables]
+    classes = rng.choice([CLASS_KEYS.index(k) for k in keys], size=n)
+    xp = rng.integers(0, 300_000, size=n)
+    awards = rng.integers(0, 5_000, size=n)
+
+    start = time.perf_counter()
+    results = apply_xp(tables, classes, xp, awards, bonus_percent=10)
+    elapsed = time.perf_counter() - start
+    print(f"magic_user with 20,000 XP: level {level_for_xp(tables['magic_user'], 20_000)}")
+    print(f"{n / elapsed:,.0f} characters/s, {results['levels_gained'].sum():,} levels gained")
@@ -0,0 +1,234 @@
+"""Vectorized treasure hoard generation from ``treasure_types.json``.
+
+Each treasure type row (Lair A-O, Individual P-V, Unguarded levels 1-8)
+is compiled once into dice samplers.  :func:`generate_hoards` then rolls
+N hoards of one type in a handful of NumPy calls and returns arrays:
+
+- ``cp``, ``sp``, ``ep``, ``gp``, ``pp``: coins in pieces ("100's of"
+  columns are already multiplied out)
+- ``gems``, ``jewelry``: item counts
+- ``magic_any``, ``magic_weapon_or_armor``, ``magic_any_except_weapons``,
+  ``magic_potion``, ``magic_scroll``: magic item draws by category
+- ``coin_value_gp``: total coin value in gold pieces
+
+Type H cells carry "*" instead of a percentage; they are treated as
+always present unless ``star_percent`` says otherwise.
+
+    PYTHONPATH=src python -m engines.treasure
+"""
+
+from __future__ import annotations
+
+import re
+from fractions import Fraction
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+
+from data_store import DATA_DIR, load_dataset
+from engines.dice import CompiledDice, compile_dice
+
+COIN_KEYS = ("cp", "sp", "ep", "gp", "pp")
+COIN_VALUE_GP = {"cp": 0.01, "sp": 0.1, "ep": 0.5, "gp": 1.0, "pp": 5.0}
+MAGIC_CATEGORIES = ("any", "weapon_or_armor", "any_except_weapons", "potion", "scroll")
+OUTPUT_KEYS = (
+    COIN_KEYS
+    + ("gems", "jewelry")
+    + tuple(f"magic_{c}" for c in MAGIC_CATEGORIES)
+    + ("coin_value_gp",)
+)
+
+UNGUARDED_TABLE = "Unguarded Treasures"
+
+_ENTRY_RE = re.compile(r"(\d+(?:\.\d+)?%|\*)\s*(\S+)", re.IGNORECASE)
+_CHANCE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?%|\*)\s*(.*)$")
+_MAGIC_PART_RES = (
+    (re.compile(r"^any\s+(\S+)\s+except\s+weapons$", re.IGNORECASE), "any_except_weapons"),
+    (re.compile(r"^any\s+(\S+)$", re.IGNORECASE), "any"),
+    (re.compile(r"^(\S+)\s+weapons?\s+or\s+armou?r$", re.IGNORECASE), "weapon_or_armor"),
+    (re.compile(r"^(\S+)\s+potions?$", re.IGNORECASE), "potion"),
+    (re.compile(r"^(\S+)\s+scrolls?$", re.IGNORECASE), "scroll"),
+)
+
+
+class MagicDraw(NamedTuple):
+    category: str
+    count: CompiledDice
+
+
+class CompiledTreasure(NamedTuple):
+    key: str
+    table_name: str
+    coins: dict[str, tuple[CompiledDice, int]]
+    gems: CompiledDice | None
+    jewelry: CompiledDice | None
+    magic_percent: Fraction
+    magic: tuple[MagicDraw, ...]
+
+
+def _is_none(text: str) -> bool:
+    return not text.strip() or text.strip().lower() == "none"
+
+
+def _chance(token: str, star_percent: int) -> str:
+    return f"{star_percent}%" if token == "*" else token
+
+
+def parse_amount_cell(text: str, star_percent: int = 100) -> str | None:
+    """Turn "50% 5d6" / "* 8d10" / "3d8" / "None" into a dice expression (or None)."""
+    if _is_none(text):
+        return None
+    m = _CHANCE_RE.match(text)
+    if m and m.group(2):
+        return f"{_chance(m.group(1), star_percent)} {m.group(2).strip()}"
+    return text.strip()
+
+
+def parse_gems_cell(text: str, star_percent: int = 100) -> tuple[str | None, str | None]:
+    """Split "50% 6d6 50% 6d6" / "50% 1d4 None" into (gems, jewelry) expressions."""
+    parts: list[str | None] = []
+    rest = text.strip()
+    while rest:
+        if rest.lower().startswith("none"):
+            parts.append(None)
+            rest = rest[4:].strip()
+            continue
+        m = _ENTRY_RE.match(rest)
+        if m is None:
+            parts.append(rest)
+            break
+        parts.append(f"{_chance(m.group(1), star_percent)} {m.group(2)}")
+        rest = rest[m.end():].strip()
+    while len(parts) < 2:
+        parts.append(None)
+    if len(parts) > 2:
+        raise ValueError(f"Unrecognized gems and jewelry cell: {text!r}")
+    return parts[0], parts[1]
+
+
+def parse_magic_cell(text: str, star_percent: int = 100) -> tuple[Fraction, list[tuple[str, str]]]:
+    """Parse "20% any 1d2 + 1 potion" into (percent, [(category, count expr), ...])."""
+    if _is_none(text):
+        return Fraction(0), []
+    m = _CHANCE_RE.match(text)
+    if m is None:
+        raise ValueError(f"Unrecognized magic items cell: {text!r}")
+    percent = Fraction(_chance(m.group(1), star_percent)[:-1])
+    draws: list[tuple[str, str]] = []
+    for part in m.group(2).split("+"):
+        part = " ".join(part.split())
+        for pattern, category in _MAGIC_PART_RES:
+            pm = pattern.match(part)
+            if pm:
+                draws.append((category, pm.group(1)))
+                break
+        else:
+            raise ValueError(f"Unrecognized magic items cell: {text!r}")
+    return percent, draws
+
+
+def _row_keys(table_name: str, first_cell: Any) -> list[str]:
+    if table_name == UNGUARDED_TABLE:
+        levels = first_cell if isinstance(first_cell, list) else [str(first_cell).rstrip("+")]
+        return [f"unguarded {level}" for level in levels]
+    return [str(first_cell).rstrip("*").strip().upper()]
+
+
+def treasure_key(name: str | int) -> str:
+    """Normalize "a" / "H*" / dungeon level 9 to a compiled-table key."""
+    if isinstance(name, int) or str(name).isdigit():
+        return f"unguarded {min(max(int(name), 1), 8)}"
+    return str(name).rstrip("*").strip().upper()
+
+
+def compile_treasure_tables(treasure_types: dict[str, Any], star_percent: int = 100) -> dict[str, CompiledTreasure]:
+    """Compile every treasure type row once, keyed by :func:`treasure_key`."""
+    compiled: dict[str, CompiledTreasure] = {}
+    for table_name, table in treasure_types.items():
+        headers = table.get("headers", [])
+        multiplier = 100 if any("100's" in str(h) for h in headers) else 1
+        for row in table.get("rows", []):
+            cells = dict(zip(headers, row))
+            coins: dict[str, tuple[CompiledDice, int]] = {}
+            for coin, header in zip(COIN_KEYS, headers[1:6]):
+                expr = parse_amount_cell(str(cells.get(header, "None")), star_percent)
+                if expr is not None:
+                    coins[coin] = (compile_dice(expr), multiplier)
+            gems, jewelry = parse_gems_cell(str(cells.get("Gems and Jewelry", "None")), star_percent)
+            percent, draws = parse_magic_cell(str(cells.get("Magic Items", "None")), star_percent)
+            for key in _row_keys(table_name, row[0]):
+                compiled[key] = CompiledTreasure(
+                    key=key,
+                    table_name=table_name,
+                    coins=coins,
+                    gems=compile_dice(gems) if gems else None,
+                    jewelry=compile_dice(jewelry) if jewelry else None,
+                    magic_percent=percent,
+                    magic=tuple(MagicDraw(category, compile_dice(count)) for category, count in draws),
+                )
+    return compiled
+
+
+def load_treasure_tables(data_dir: str = DATA_DIR, star_percent: int = 100) -> dict[str, CompiledTreasure]:
+    return compile_treasure_tables(load_dataset("treasure_types", data_dir) or {}, star_percent)
+
+
+def _empty(n: int) -> dict[str, np.ndarray]:
+    out = {key: np.zeros(n, dtype=np.int64) for key in OUTPUT_KEYS if key != "coin_value_gp"}
+    out["coin_value_gp"] = np.zeros(n, dtype=np.float64)
+    return out
+
+
+def generate_hoards(treasure: CompiledTreasure, n: int, rng: np.random.Generator | None = None) -> dict[str, np.ndarray]:
+    """Roll *n* hoards of one compiled treasure type; returns arrays of length *n*."""
+    rng = rng if rng is not None else np.random.default_rng()
+    out = _empty(n)
+    for coin, (dice, multiplier) in treasure.coins.items():
+        out[coin] = dice.sample(n, rng) * multiplier
+        out["coin_value_gp"] += out[coin] * COIN_VALUE_GP[coin]
+    if treasure.gems is not None:
+        out["gems"] = treasure.gems.sample(n, rng)
+    if treasure.jewelry is not None:
+        out["jewelry"] = treasure.jewelry.sample(n, rng)
+    if treasure.magic:
+        present = rng.random(n) < float(treasure.magic_percent / 100)
+        for draw in treasure.magic:
+            out[f"magic_{draw.category}"] += np.where(present, draw.count.sample(n, rng), 0)
+    return out
+
+
+def generate_mixed_hoards(
+    tables: dict[str, CompiledTreasure],
+    keys: Sequence[str],
+    rng: np.random.Generator | None = None,
+) -> dict[str, np.ndarray]:
+    """Roll one hoard per entry of *keys* (any mix of types), grouped by type internally."""
+    rng = rng if rng is not None else np.random.default_rng()
+    codes = np.array([treasure_key(k) for k in keys])
+    out = _empty(len(codes))
+    for key in np.unique(codes):
+        if key not in tables:
+            raise KeyError(f"Unknown treasure type: {key}")
+        idx = np.flatnonzero(codes == key)
+        for name, values in generate_hoards(tables[key], len(idx), rng).items():
+            out[name][idx] = values
+    return out
+
+
+def summarize_hoards(hoards: dict[str, np.ndarray]) -> dict[str, float]:
+    """Mean of each output column."""
+    return {key: float(values.mean()) if len(values) else 0.0 for key, values in hoards.items()}
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    tables = load_treasure_tables()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    for key in ("A", "H", "U", "unguarded 3"):
+        start = time.perf_counter()
+        hoards = generate_hoards(tables[key], n, rng)
+        elapsed = time.perf_counter() - start
+        print(f"{key}: {n / elapsed:,.0f} hoards/s, mean coin value {hoards['coin_value_gp'].mean():,.1f} gp")
@@ -0,0 +1,152 @@
+"""Vectorized turning undead resolution from ``turning_undead.json``.
+
+The table is compiled once into two (cleric level x undead column)
+arrays: the minimum 1d20 roll that succeeds (1 for "T" and "D", 21 for
+"No") and whether success destroys rather than turns.  Level 0 is a
+row that can never turn.
+
+:func:`resolve_turning` takes arrays of cleric levels and undead columns
+and rolls every attempt at once: the d20, then 2d6 hit dice of undead
+affected on success, with at least one creature affected.
+
+    PYTHONPATH=src python -m engines.turning
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from data_store import DATA_DIR, canonical_name, load_dataset
+from engines.dice import compile_dice
+
+FAILED = 0
+TURNED = 1
+DESTROYED = 2
+
+NEVER = 21  # roll needed when the table says "No"
+AFFECTED_HIT_DICE = "2d6"
+
+_INT_RE = re.compile(r"\d+")
+
+
+class TurningTable(NamedTuple):
+    undead: tuple[str, ...]  # column names, e.g. "Skeleton"
+    column_hit_dice: np.ndarray  # (column,), "9+" counts as 9
+    needed: np.ndarray  # (level, column) minimum d20 roll
+    destroys: np.ndarray  # (level, column) bool
+
+
+def parse_turning_cell(text: Any) -> tuple[int, bool]:
+    """Turn "13" / "T" / "D" / "No" into (minimum d20 roll, destroys)."""
+    value = str(text).strip().upper()
+    if value == "T":
+        return 1, False
+    if value == "D":
+        return 1, True
+    if value.isdigit():
+        return int(value), False
+    return NEVER, False
+
+
+def compile_turning_table(data: dict[str, Any]) -> TurningTable:
+    columns = data.get("undead_columns", [])
+    names = tuple(str(c.get("name", "")) for c in columns)
+    slugs = [canonical_name(name).replace(" ", "_") for name in names]
+    hit_dice = np.array([int(m.group(0)) if (m := _INT_RE.search(str(c.get("hit_dice", "")))) else 0 for c in columns])
+
+    rows = data.get("rows", [])
+    levels = [int(r["cleric_level"]) for r in rows if str(r.get("cleric_level", "")).strip().isdigit()]
+    max_level = max(levels, default=0)
+    needed = np.full((max_level + 1, len(names)), NEVER, dtype=np.int8)
+    destroys = np.zeros((max_level + 1, len(names)), dtype=bool)
+    for row in rows:
+        level = str(row.get("cleric_level", "")).strip()
+        if not level.isdigit():
+            continue
+        for col, slug in enumerate(slugs):
+            needed[int(level), col], destroys[int(level), col] = parse_turning_cell(row.get(slug, "No"))
+    return TurningTable(undead=names, column_hit_dice=hit_dice, needed=needed, destroys=destroys)
+
+
+def load_turning_table(data_dir: str = DATA_DIR) -> TurningTable:
+    return compile_turning_table(load_dataset("turning_undead", data_dir) or {})
+
+
+def undead_column(table: TurningTable, undead: Any) -> Any:
+    """Column for an undead name ("Wight"); arrays of names map elementwise, integer codes pass through."""
+    if isinstance(undead, str):
+        wanted = canonical_name(undead)
+        for col, name in enumerate(table.undead):
+            if canonical_name(name) == wanted:
+                return col
+        raise ValueError(f"Unknown undead column: {undead}")
+    values = np.asarray(undead)
+    if values.dtype.kind in "iu":
+        return values
+    keys, inverse = np.unique(values, return_inverse=True)
+    return np.array([undead_column(table, str(k)) for k in keys], dtype=np.intp)[inverse].reshape(values.shape)
+
+
+def column_for_hit_dice(table: TurningTable, hit_dice: Any) -> Any:
+    """Column turned by undead of *hit_dice* (scalar or array); 9 or more use the last column."""
+    columns = np.searchsorted(table.column_hit_dice, np.clip(hit_dice, 1, table.column_hit_dice[-1]))
+    return int(columns) if np.ndim(columns) == 0 else columns
+
+
+def _cells(table: TurningTable, levels: Any, columns: Any) -> tuple[np.ndarray, np.ndarray]:
+    levels = np.clip(np.asarray(levels), 0, table.needed.shape[0] - 1)
+    columns = np.asarray(columns)
+    return table.needed[levels, columns], table.destroys[levels, columns]
+
+
+def turn_chance(table: TurningTable, levels: Any, columns: Any) -> Any:
+    """Exact success probability per attempt (d20 roll at or above the cell)."""
+    needed, _ = _cells(table, levels, columns)
+    chance = np.clip(21 - needed.astype(np.int64), 0, 20) / 20
+    return float(chance) if np.ndim(chance) == 0 else chance
+
+
+def resolve_turning(
+    table: TurningTable,
+    levels: Any,
+    undead: Any,
+    rng: np.random.Generator | None = None,
+) -> dict[str, np.ndarray]:
+    """Roll one turning attempt per (level, undead) pair; *undead* holds names or column codes.
+
+    Returns arrays: ``roll`` (d20), ``outcome`` (:data:`FAILED`,
+    :data:`TURNED` or :data:`DESTROYED`), ``hit_dice`` (HD of undead
+    affected) and ``creatures`` (undead of that column affected).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    levels, columns = np.broadcast_arrays(np.atleast_1d(levels), np.atleast_1d(undead_column(table, undead)))
+    needed, destroys = _cells(table, levels, columns)
+    n = needed.size
+    roll = rng.integers(1, 21, size=n).reshape(needed.shape)
+    success = (needed < NEVER) & (roll >= needed)
+    outcome = np.where(success, np.where(destroys, DESTROYED, TURNED), FAILED).astype(np.int8)
+    hit_dice = np.where(success, compile_dice(AFFECTED_HIT_DICE).sample(n, rng).reshape(needed.shape), 0)
+    per_creature = np.maximum(table.column_hit_dice[columns], 1)
+    creatures = np.where(success, np.maximum(hit_dice // per_creature, 1), 0)
+    return {"roll": roll, "outcome": outcome, "hit_dice": hit_dice, "creatures": creatures}
+
+
+if __name__ == "__main__":
+    import time
+
+    table = load_turning_table()
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    levels = rng.integers(1, 21, size=n)
+    columns = rng.integers(0, len(table.undead), size=n)
+
+    start = time.perf_counter()
+    results = resolve_turning(table, levels, columns, rng)
+    elapsed = time.perf_counter() - start
+    print(f"cleric 3 vs Ghoul: {turn_chance(table, 3, undead_column(table, 'Ghoul')):.0%} chance")
+    rates = np.bincount(results["outcome"], minlength=3) / n
+    print(f"failed {rates[FAILED]:.1%}, turned {rates[TURNED]:.1%}, destroyed {rates[DESTROYED]:.1%}")
+    print(f"{n / elapsed:,.0f} attempts/s")
@@ -8,45 +8,228 @@ needed).
 The HTML wraps multi-column page sections inside <div> elements with
 ``column-count: 2``.  :func:`iter_elements` flattens these so that
 all ``<p>`` and ``<table>`` elements appear in document order.
+
+The parsers never hold a tree.  :func:`load_elements` turns the element
+stream into :class:`Element` records that hold only what the parsers
+read: tag name, text, header text, first bold run and table rows.  It
+never builds a BeautifulSoup tree of the whole manual, which is about
+25 times the size of the HTML.  Instead:
+
+- the export is parsed with lxml, a compact C tree;
+- each run of :data:`ELEMENT_BATCH` stream elements is re-serialized
+  and converted through its own small soup;
+- each small soup is decomposed at once.  BeautifulSoup trees are
+  parent/child reference cycles, so without ``decompose()`` a soup
+  lingers until the cyclic GC runs.
+
+If a batch does not round-trip to the same elements, the whole file is
+converted through one soup instead (and that soup is decomposed too).
+The text helpers below accept either a :class:`Tag` or an
+:class:`Element`.
+
+Inside a :func:`shared_documents` block, :func:`load_html` and
+:func:`load_elements` parse each file once and hand every caller the
+same result, so a session that runs several phases (or test scripts)
+pays for one parse.
 """
 
 from __future__ import annotations
 
+import os
 import re
+from contextlib import contextmanager
+from typing import Any, Iterator, NamedTuple
 
+import lxml.html
 from bs4 import BeautifulSoup, Tag
+from lxml import etree
 
 HTML_PATH = "manual/Basic-Fantasy-RPG-Rules-r142.html"
 
+# Stream elements converted per BeautifulSoup fragment in load_elements.
+ELEMENT_BATCH = 50
+
+# Parsed documents by (kind, absolute path), kind "soup" or "elements",
+# while a shared_documents() block is active.
+_shared: dict[tuple[str, str], Any] | None = None
+
+Rows = tuple[tuple[str, ...], ...]
+
+
+class Element(NamedTuple):
+    """A stream element reduced to what the parsers read."""
+
+    name: str
+    text: str  # tag.get_text()
+    header: str | None  # section header text; None unless a SoutaneBlack paragraph
+    bold: str | None  # text of the first <b>, words joined by single spaces
+    tables: tuple[Rows, ...]  # rows of every table in the element, itself first
+
+    def get_text(self) -> str:
+        return self.text
+
+
+def shared_key(path: str, kind: str) -> tuple[str, str]:
+    return kind, os.path.abspath(path)
+
 
 def load_html(path: str = HTML_PATH) -> BeautifulSoup:
     """Parse the manual HTML and return a BeautifulSoup tree."""
+    if _shared is not None:
+        key = shared_key(path, "soup")
+        if key not in _shared:
+            with open(path, encoding="utf-8") as f:
+                _shared[key] = BeautifulSoup(f, "lxml")
+        return _shared[key]
     with open(path, encoding="utf-8") as f:
         return BeautifulSoup(f, "lxml")
 
 
+def to_element(tag: Tag) -> Element:
+    header = None
+    if tag.name == "p":
+        font = tag.find("font", attrs={"face": "SoutaneBlack"})
+        if font is not None:
+            header = _normalize(font.get_text())
+    found = tag.find_all(["b", "table"])  # one walk for both
+    bold = next((t for t in found if t.name == "b"), None)
+    tables = ([tag] if tag.name == "table" else []) + [t for t in found if t.name == "table"]
+    return Element(
+        tag.name,
+        tag.get_text(),
+        header,
+        bold.get_text(" ", strip=True) if bold is not None else None,
+        tuple(tuple(tuple(row) for row in table_to_rows(t)) for t in tables),
+    )
+
+
+def to_elements(soup: BeautifulSoup) -> list[Element]:
+    return [to_element(tag) for tag in iter_elements(soup)]
+
+
+def iter_lxml_elements(root: Any):
+    """:func:`iter_elements` over an lxml document tree."""
+    body = root.find("body")
+    if body is None:
+        return
+    for child in body:
+        if not isinstance(child.tag, str):
+            continue
+        if child.tag == "div":
+            for subchild in child:
+                if isinstance(subchild.tag, str):
+                    yield subchild
+        else:
+            yield child
+
+
+def lxml_markup(node: Any) -> str:
+    return etree.tostring(node, encoding="unicode", method="html", with_tail=False)
+
+
+def parse_fragment(markup: str) -> list[Element]:
+    """Convert the markup of consecutive stream elements into :class:`Element` records."""
+    soup = BeautifulSoup(markup, "lxml")
+    tags = [t for t in soup.body.children if isinstance(t, Tag)] if soup.body is not None else []
+    elements = [to_element(tag) for tag in tags]
+    soup.decompose()
+    return elements
+
+
+def elements_from_html(html: str) -> list[Element]:
+    """:class:`Element` records for every stream element of *html*, converted in batches."""
+    root = lxml.html.document_fromstring(html)
+    elements: list[Element] = []
+    batch: list[Any] = []
+    for node in iter_lxml_elements(root):
+        batch.append(node)
+        if len(batch) < ELEMENT_BATCH:
+            continue
+        if not _convert_batch(batch, elements):
+            return _elements_from_soup(html)
+    if batch and not _convert_batch(batch, elements):
+        return _elements_from_soup(html)
+    return elements
+
+
+def _convert_batch(batch: list[Any], out: list[Element]) -> bool:
+    converted = parse_fragment("".join(lxml_markup(node) for node in batch))
+    if [el.name for el in converted] != [node.tag for node in batch]:
+        return False
+    out.extend(converted)
+    for node in batch:
+        node.clear()  # drop the lxml subtree too
+    batch.clear()
+    return True
+
+
+def _elements_from_soup(html: str) -> list[Element]:
+    soup = BeautifulSoup(html, "lxml")
+    elements = to_elements(soup)
+    soup.decompose()
+    return elements
+
+
+def load_elements(path: str = HTML_PATH) -> list[Element]:
+    """Parse the manual into :class:`Element` records without keeping a tree."""
+    key = shared_key(path, "elements")
+    if _shared is not None and key in _shared:
+        return _shared[key]
+    soup_key = shared_key(path, "soup")
+    if _shared is not None and soup_key in _shared:
+        elements = to_elements(_shared[soup_key])  # someone else holds this tree
+    else:
+        with open(path, encoding="utf-8") as f:
+            elements = elements_from_html(f.read())
+    if _shared is not None:
+        _shared[key] = elements
+    return elements
+
+
+@contextmanager
+def shared_documents() -> Iterator[dict[tuple[str, str], Any]]:
+    """Share one parse per path across :func:`load_html` and :func:`load_elements` calls in the block.
+
+    Nested blocks reuse the outer cache.  Yields the cache, keyed by
+    :func:`shared_key`, e.g. to preload a document before forking workers.
+    """
+    global _shared
+    if _shared is not None:
+        yield _shared
+        return
+    _shared = {}
+    try:
+        yield _shared
+    finally:
+        _shared = None
+
+
 def _normalize(text: str) -> str:
     """Collapse all whitespace (including newlines) into single spaces."""
     return re.sub(r"\s+", " ", text).strip()
 
 
-def is_section_header(tag: Tag) -> bool:
+def is_section_header(tag: Tag | Element) -> bool:
     """Return True if a tag is a section header (SoutaneBlack font)."""
+    if isinstance(tag, Element):
+        return tag.header is not None
     if tag.name != "p":
         return False
     font = tag.find("font", attrs={"face": "SoutaneBlack"})
     return font is not None
 
 
-def get_section_header_text(tag: Tag) -> str | None:
+def get_section_header_text(tag: Tag | Element) -> str | None:
     """Extract normalized header text from a SoutaneBlack-font paragraph."""
+    if isinstance(tag, Element):
+        return tag.header
     font = tag.find("font", attrs={"face": "SoutaneBlack"})
     if font:
         return _normalize(font.get_text())
     return None
 
 
-def is_part_header(tag: Tag) -> bool:
+def is_part_header(tag: Tag | Element) -> bool:
     """Return True if a tag is a PART-level header (14pt font)."""
     if tag.name != "p":
         return False
@@ -54,22 +237,24 @@ def is_part_header(tag: Tag) -> bool:
     return text.upper().startswith("PART")
 
 
-def get_text(tag: Tag) -> str:
+def get_text(tag: Tag | Element) -> str:
     """Get cleaned, whitespace-normalized text content from a tag."""
     return _normalize(tag.get_text())
 
 
-def get_text_preserve_whitespace(tag: Tag) -> str:
+def get_text_preserve_whitespace(tag: Tag | Element) -> str:
     """Get text content preserving internal whitespace (tabs, etc.)."""
     return tag.get_text().strip()
 
 
-def table_to_rows(table: Tag) -> list[list[str]]:
+def table_to_rows(table: Tag | Element) -> list[list[str]]:
     """Convert an HTML <table> into a list of rows, each a list of cell texts.
 
     Nested tables are ignored — only direct ``<tr>`` children of the
     outermost ``<table>`` (or its ``<thead>``/``<tbody>``) are included.
     """
+    if isinstance(table, Element):
+        return [list(row) for row in table.tables[0]] if table.name == "table" else []
     rows = []
     for tr in table.find_all("tr", recursive=True):
         # Skip rows that belong to a nested table
@@ -83,6 +268,28 @@ def table_to_rows(table: Tag) -> list[list[str]]:
     return rows
 
 
+def element_tables(tag: Tag | Element) -> list[list[list[str]]]:
+    """Rows of every table in *tag*, nested ones included, in document order."""
+    if isinstance(tag, Element):
+        return [[list(row) for row in rows] for rows in tag.tables]
+    tables = ([tag] if tag.name == "table" else []) + tag.find_all("table")
+    return [table_to_rows(t) for t in tables]
+
+
+def iter_tables(elements: list[Tag | Element]) -> Iterator[list[list[str]]]:
+    """Rows of every table in *elements*, like ``soup.find_all("table")`` over the stream."""
+    for el in elements:
+        yield from element_tables(el)
+
+
+def get_bold_text(tag: Tag | Element) -> str | None:
+    """Text of the first ``<b>`` in *tag*, words joined by single spaces; None without one."""
+    if isinstance(tag, Element):
+        return tag.bold
+    b = tag.find("b")
+    return b.get_text(" ", strip=True) if b is not None else None
+
+
 def find_all_tables(soup: BeautifulSoup) -> list[Tag]:
     """Return all <table> elements in the document."""
     return soup.find_all("table")
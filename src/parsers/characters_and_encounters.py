@@ -6,15 +6,14 @@ import json
 import re
 from pathlib import Path
 
-from bs4 import Tag
-
 from section_navigation import elements_between_parts
 from extract_text import (
+    HTML_PATH,
+    Element,
     get_section_header_text,
     get_text,
     is_section_header,
-    iter_elements,
-    load_html,
+    load_elements,
     table_to_rows,
 )
 
@@ -34,11 +33,11 @@ def _slug(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
 
 
-def _collect_blocks(elements: list[Tag], start_part: int, end_part: int) -> list[tuple[str, list[Tag]]]:
+def _collect_blocks(elements: list[Element], start_part: int, end_part: int) -> list[tuple[str, list[Element]]]:
     seg = elements_between_parts(elements, start_part, end_part)
-    blocks: list[tuple[str, list[Tag]]] = []
+    blocks: list[tuple[str, list[Element]]] = []
     current_header: str | None = None
-    current_body: list[Tag] = []
+    current_body: list[Element] = []
 
     for el in seg:
         if is_section_header(el):
@@ -54,7 +53,7 @@ def _collect_blocks(elements: list[Tag], start_part: int, end_part: int) -> list
     return blocks
 
 
-def _extract_paragraphs(body: list[Tag]) -> list[str]:
+def _extract_paragraphs(body: list[Element]) -> list[str]:
     return [_norm(get_text(el)) for el in body if el.name == "p" and _norm(get_text(el))]
 
 
@@ -69,7 +68,7 @@ def _extract_labeled_fields(paragraphs: list[str]) -> dict[str, str]:
     return fields
 
 
-def parse_races(part2_blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, object]]:
+def parse_races(part2_blocks: list[tuple[str, list[Element]]]) -> list[dict[str, object]]:
     race_names = ["Dwarves", "Elves", "Halflings", "Humans"]
     out = []
     for name, body in part2_blocks:
@@ -87,7 +86,7 @@ def parse_races(part2_blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, obj
     return out
 
 
-def parse_classes(part2_blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, object]]:
+def parse_classes(part2_blocks: list[tuple[str, list[Element]]]) -> list[dict[str, object]]:
     class_names = ["Cleric", "Fighter", "Magic-User", "Thief"]
     out = []
     for name, body in part2_blocks:
@@ -105,7 +104,7 @@ def parse_classes(part2_blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, o
     return out
 
 
-def parse_encounters(part8_blocks: list[tuple[str, list[Tag]]]) -> dict[str, list[dict[str, object]]]:
+def parse_encounters(part8_blocks: list[tuple[str, list[Element]]]) -> dict[str, list[dict[str, object]]]:
     out = {"dungeon": [], "wilderness": []}
 
     for name, body in part8_blocks:
@@ -138,7 +137,11 @@ def _load_json_if_exists(path: Path):
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def parse_combat_tables(part2_blocks: list[tuple[str, list[Tag]]], part5_blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, object]]:
+def parse_combat_tables(
+    part2_blocks: list[tuple[str, list[Element]]],
+    part5_blocks: list[tuple[str, list[Element]]],
+    data_dir: str = "data",
+) -> list[dict[str, object]]:
     out: list[dict[str, object]] = []
 
     wanted_part2 = {"Missile Weapon Ranges", "Siege Engines"}
@@ -181,8 +184,8 @@ def parse_combat_tables(part2_blocks: list[tuple[str, list[Tag]]], part5_blocks:
                 }
             )
 
-    # Reuse phase-2 derived combat references when available.
-    attack_bonus = _load_json_if_exists(Path("data/attack_bonus.json"))
+    # Reuse phase-2 derived combat references from data_dir when available.
+    attack_bonus = _load_json_if_exists(Path(data_dir) / "attack_bonus.json")
     if isinstance(attack_bonus, list) and attack_bonus:
         headers = list(attack_bonus[0].keys())
         rows = [[rec.get(h, "") for h in headers] for rec in attack_bonus]
@@ -196,7 +199,7 @@ def parse_combat_tables(part2_blocks: list[tuple[str, list[Tag]]], part5_blocks:
             }
         )
 
-    saving_throws = _load_json_if_exists(Path("data/saving_throws.json"))
+    saving_throws = _load_json_if_exists(Path(data_dir) / "saving_throws.json")
     if isinstance(saving_throws, dict) and saving_throws:
         for cls, records in saving_throws.items():
             if not records:
@@ -216,9 +219,8 @@ def parse_combat_tables(part2_blocks: list[tuple[str, list[Tag]]], part5_blocks:
     return out
 
 
-def parse_phase6_data() -> dict[str, object]:
-    soup = load_html()
-    elements = list(iter_elements(soup))
+def parse_phase6_data(html_path: str = HTML_PATH, data_dir: str = "data") -> dict[str, object]:
+    elements = load_elements(html_path)
 
     part2_blocks = _collect_blocks(elements, 2, 3)
     part5_blocks = _collect_blocks(elements, 5, 6)
@@ -228,15 +230,15 @@ def parse_phase6_data() -> dict[str, object]:
         "races": parse_races(part2_blocks),
         "classes": parse_classes(part2_blocks),
         "encounter_tables": parse_encounters(part8_blocks),
-        "combat_tables": parse_combat_tables(part2_blocks, part5_blocks),
+        "combat_tables": parse_combat_tables(part2_blocks, part5_blocks, data_dir),
     }
 
 
-def write_phase6_outputs(output_dir: str = "data") -> dict[str, int]:
+def write_phase6_outputs(output_dir: str = "data", html_path: str = HTML_PATH) -> dict[str, int]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    parsed = parse_phase6_data()
+    parsed = parse_phase6_data(html_path, output_dir)
     counts: dict[str, int] = {}
 
     for key, filename in OUTPUT_FILES.items():
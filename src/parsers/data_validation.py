@@ -7,11 +7,17 @@ import re
 from pathlib import Path
 from typing import Any
 
+from data_store import MANIFEST_FILE, write_manifest
+from parsers.monster_index import OUTPUT_FILE as MONSTER_INDEX, write_monster_index
 from parsers.output_cleanup import cleanup_payload
+from parsers.spell_index import OUTPUT_FILE as SPELL_INDEX, write_spell_index
 
 VALIDATION_REPORT = "validation_report.json"
 DATA_README = "README.md"
 
+# Outputs derived from other data files; regenerated rather than normalized.
+DERIVED_OUTPUT_FILES = {VALIDATION_REPORT, SPELL_INDEX, MONSTER_INDEX, MANIFEST_FILE}
+
 
 def _norm(s: str) -> str:
     s = s.replace("\t", " ")
@@ -36,7 +42,7 @@ def _clean_obj(value: Any) -> Any:
 def normalize_data_files(data_dir: str = "data") -> list[str]:
     out = []
     for path in sorted(Path(data_dir).glob("*.json")):
-        if path.name == VALIDATION_REPORT:
+        if path.name in DERIVED_OUTPUT_FILES:
             continue
         payload = json.loads(path.read_text(encoding="utf-8"))
         cleaned = _clean_obj(payload)
@@ -199,9 +205,12 @@ Generated structured JSON outputs from the Basic Fantasy RPG manual.
 - `equipment.json`: General equipment tables.
 - `magic_items.json`: Magic item entries parsed from prose sections.
 - `magic_item_tables.json`: Random generation and magic-item roll tables.
-- `monsters.json`: Monster records with stat blocks, descriptions, and warnings.
+- `manifest.json`: SHA-256 digest and size of every JSON output, plus a combined build digest.
+- `monster_index.json`: Alias -> canonical monster ID map and resolved cross-references.
+- `monsters.json`: Monster records with stable `id`s, stat blocks, descriptions, and warnings.
 - `races.json`: Race prose descriptions and labeled fields.
 - `saving_throws.json`: Saving throw progression by class.
+- `spell_index.json`: Derived spell index with parsed range/duration terms and (class, level) lookups.
 - `spell_list.json`: Spell indexes by class/level and flattened spell-level rows.
 - `spells.json`: Individual spell records with metadata and descriptions.
 - `thief_abilities.json`: Thief ability progression table.
@@ -216,8 +225,11 @@ Generated structured JSON outputs from the Basic Fantasy RPG manual.
 - String normalization collapses OCR/layout whitespace artifacts.
 - Numeric cleanup converts comma-formatted numbers (e.g. `1,000`) to integers.
 - Numeric ranges (e.g. `1-3`) are normalized to integer lists.
+- `weapons.json`, `armor.json`, `equipment.json` and `vehicles.json` rows carry `price_cp` (integer copper pieces) and `weight_lb` (pounds; `*` items count 0.1, `**` items 0) next to the source strings; vehicles also carry `cargo_lb`. Unparseable values are null.
 - Some files include `warnings` arrays to preserve partial/edge parses.
 - Encounter-to-monster references are validated heuristically.
+- Cross-reference-only monsters carry `cross_reference_id` (null when the target could not be resolved).
+- `spell_index.json` ranges are in feet and durations in seconds (1 round = 10 seconds, 1 turn = 10 minutes), each split into a fixed part and a per-level term.
 """,
         encoding="utf-8",
     )
@@ -225,18 +237,25 @@ Generated structured JSON outputs from the Basic Fantasy RPG manual.
 
 def run_phase7(data_dir: str = "data") -> dict[str, Any]:
     cleaned = normalize_data_files(data_dir)
+    spell_index = write_spell_index(data_dir)
+    monster_index = write_monster_index(data_dir)
     report = run_validation(data_dir)
 
     out_path = Path(data_dir) / VALIDATION_REPORT
     out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
     write_data_readme(data_dir)
+    manifest = write_manifest(data_dir)
 
     return {
         "cleaned_files": cleaned,
+        "spell_index_spells": spell_index["spells"],
+        "monster_aliases": monster_index["aliases"],
+        "unresolved_cross_references": monster_index["unresolved"],
         "critical_count": report["summary"]["critical_count"],
         "warning_count": report["summary"]["warning_count"],
         "status": report["summary"]["status"],
+        "manifest_digest": manifest["digest"],
     }
 
 
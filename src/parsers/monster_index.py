@@ -0,0 +1,203 @@
+"""Phase 7 derived output: monster IDs, resolved cross-references and aliases.
+
+Every monster record gets a stable ``id`` (slug of its name).  Records
+flagged ``cross_reference_only`` ("Aurochs" -> "Cattle (including Aurochs
+and Bison) on page 101") get a ``cross_reference_id`` pointing at the
+record holding the stat block.  ``monster_index.json`` maps every alias
+(full name, name without parentheticals, parenthetical alternates and
+inverted "Head, Modifier" forms) straight to the canonical record ID.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+OUTPUT_FILE = "monster_index.json"
+MONSTERS_FILE = "monsters.json"
+
+# Alias priorities: lower wins when two records claim the same alias.
+_PRIORITY_NAME = 0
+_PRIORITY_BASE = 1
+_PRIORITY_PARENTHETICAL = 2
+_PRIORITY_INVERTED = 3
+
+_PAGE_SUFFIX_RE = re.compile(r"\s+on\s+page\s+\d+\s*$", re.IGNORECASE)
+_PAREN_RE = re.compile(r"\(([^)]*)\)")
+_MAX_REDIRECTS = 5
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _canon(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", s.lower()).strip()
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def monster_id(name: str) -> str:
+    return _slug(name)
+
+
+def strip_page_reference(text: str) -> str:
+    """Drop a trailing "on page N" from a cross-reference target."""
+    return _norm(_PAGE_SUFFIX_RE.sub("", text))
+
+
+def monster_aliases(name: str) -> list[tuple[str, int]]:
+    """Return ``(alias, priority)`` pairs for a monster name.
+
+    "Bear, Grizzly (or Brown)" yields "bear grizzly or brown", "bear
+    grizzly", "bear brown" and "grizzly bear"; single-word alternates of a
+    "Head, Modifier" name inherit the head ("Ant, Giant (and Huge, Large)"
+    -> "ant huge", "ant large").
+    """
+    out: list[tuple[str, int]] = [(_canon(name), _PRIORITY_NAME)]
+    base = _norm(_PAREN_RE.sub("", name))
+    out.append((_canon(base), _PRIORITY_BASE))
+
+    head = base.split(",", 1)[0].strip() if "," in base else ""
+    for inner in _PAREN_RE.findall(name):
+        inner = _norm(re.sub(r"^\s*(?:and|or|including)\s+", "", inner, flags=re.IGNORECASE))
+        if "," in inner:
+            # A full "Head, Modifier" alternate such as "Bat, Giant".
+            out.append((_canon(inner), _PRIORITY_PARENTHETICAL))
+            if not head:
+                continue
+        for part in re.split(r",|\band\b|\bor\b", inner, flags=re.IGNORECASE):
+            part = _norm(part)
+            if not part:
+                continue
+            if head and len(part.split()) == 1:
+                out.append((_canon(f"{head}, {part}"), _PRIORITY_PARENTHETICAL))
+            else:
+                out.append((_canon(part), _PRIORITY_PARENTHETICAL))
+
+    if base.count(",") == 1:
+        first, second = (p.strip() for p in base.split(","))
+        out.append((_canon(f"{second} {first}"), _PRIORITY_INVERTED))
+
+    return [(alias, prio) for alias, prio in out if alias]
+
+
+def build_monster_index(monsters: list[dict[str, Any]]) -> dict[str, Any]:
+    """Assign IDs, resolve cross-references and build the alias map.
+
+    Mutates *monsters* in place (adds ``id`` and ``cross_reference_id``)
+    and returns the index payload.
+    """
+    claims: dict[str, tuple[int, str]] = {}
+    for monster in monsters:
+        mid = monster_id(monster.get("name", ""))
+        monster["id"] = mid
+        for alias, prio in monster_aliases(monster.get("name", "")):
+            current = claims.get(alias)
+            if current is None or prio < current[0]:
+                claims[alias] = (prio, mid)
+
+    # Cross-reference targets must be records other than the referrer.
+    def _target_for(text: str, referrer: str) -> str | None:
+        target = strip_page_reference(text)
+        for candidate in (_canon(target), _canon(_PAREN_RE.sub("", target))):
+            claim = claims.get(candidate)
+            if claim and claim[1] != referrer:
+                return claim[1]
+        return None
+
+    cross_references: dict[str, str | None] = {}
+    for monster in monsters:
+        if "cross_reference" not in monster:
+            continue
+        target = _target_for(str(monster["cross_reference"]), monster["id"])
+        monster["cross_reference_id"] = target
+        cross_references[monster["id"]] = target
+
+    def _canonical(mid: str) -> str:
+        seen = {mid}
+        for _ in range(_MAX_REDIRECTS):
+            nxt = cross_references.get(mid)
+            if nxt is None or nxt in seen:
+                break
+            seen.add(nxt)
+            mid = nxt
+        return mid
+
+    aliases = {alias: _canonical(mid) for alias, (_, mid) in sorted(claims.items())}
+
+    return {
+        "ids": [m["id"] for m in monsters],
+        "aliases": aliases,
+        "cross_references": cross_references,
+        "unresolved": sorted(mid for mid, target in cross_references.items() if target is None),
+    }
+
+
+def _reorder(monster: dict[str, Any]) -> dict[str, Any]:
+    """Put ``id`` first and ``cross_reference_id`` next to ``cross_reference``."""
+    out: dict[str, Any] = {"id": monster["id"]}
+    for key, value in monster.items():
+        if key in {"id", "cross_reference_id"}:
+            continue
+        out[key] = value
+        if key == "cross_reference" and "cross_reference_id" in monster:
+            out["cross_reference_id"] = monster["cross_reference_id"]
+    return out
+
+
+def write_monster_index(data_dir: str = "data") -> dict[str, int]:
+    root = Path(data_dir)
+    monsters_path = root / MONSTERS_FILE
+    if not monsters_path.exists():
+        return {"monsters": 0, "aliases": 0, "cross_references": 0, "unresolved": 0}
+
+    monsters = json.loads(monsters_path.read_text(encoding="utf-8"))
+    index = build_monster_index(monsters)
+    monsters = [_reorder(m) for m in monsters]
+
+    monsters_path.write_text(json.dumps(monsters, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    (root / OUTPUT_FILE).write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    return {
+        "monsters": len(monsters),
+        "aliases": len(index["aliases"]),
+        "cross_references": len(index["cross_references"]),
+        "unresolved": len(index["unresolved"]),
+    }
+
+
+def load_monster_lookup(data_dir: str = "data") -> dict[str, dict[str, Any]]:
+    """Return a canonical-alias -> monster record map (one probe per lookup).
+
+    Falls back to building the index in memory when ``monster_index.json``
+    has not been generated.
+    """
+    root = Path(data_dir)
+    monsters_path = root / MONSTERS_FILE
+    if not monsters_path.exists():
+        return {}
+    monsters = json.loads(monsters_path.read_text(encoding="utf-8"))
+
+    index_path = root / OUTPUT_FILE
+    if index_path.exists() and all("id" in m for m in monsters):
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    else:
+        index = build_monster_index(monsters)
+
+    by_id = {m["id"]: m for m in monsters}
+    return {alias: by_id[mid] for alias, mid in index["aliases"].items() if mid in by_id}
+
+
+def lookup_monster(lookup: dict[str, dict[str, Any]], name: str) -> dict[str, Any] | None:
+    return lookup.get(_canon(name))
+
+
+if __name__ == "__main__":
+    summary = write_monster_index()
+    for k, v in summary.items():
+        print(f"{k}: {v}")
@@ -6,15 +6,14 @@ import json
 import re
 from pathlib import Path
 
-from bs4 import Tag
-
 from section_navigation import elements_between_parts
 from extract_text import (
+    HTML_PATH,
+    Element,
     get_section_header_text,
     get_text,
     is_section_header,
-    iter_elements,
-    load_html,
+    load_elements,
     table_to_rows,
 )
 
@@ -74,11 +73,11 @@ def _parse_grid_table(rows: list[list[str]]) -> dict[str, object]:
     return {"headers": headers, "rows": data_rows}
 
 
-def _collect_part6_blocks(elements: list[Tag]) -> list[tuple[str, list[Tag]]]:
+def _collect_part6_blocks(elements: list[Element]) -> list[tuple[str, list[Element]]]:
     part6 = elements_between_parts(elements, 6, 7)
-    blocks: list[tuple[str, list[Tag]]] = []
+    blocks: list[tuple[str, list[Element]]] = []
     current_header: str | None = None
-    current_body: list[Tag] = []
+    current_body: list[Element] = []
 
     for el in part6:
         if is_section_header(el):
@@ -95,7 +94,7 @@ def _collect_part6_blocks(elements: list[Tag]) -> list[tuple[str, list[Tag]]]:
     return blocks
 
 
-def parse_monsters(elements: list[Tag]) -> list[dict[str, object]]:
+def parse_monsters(elements: list[Element]) -> list[dict[str, object]]:
     blocks = _collect_part6_blocks(elements)
     monsters: list[dict[str, object]] = []
 
@@ -169,17 +168,16 @@ def parse_monsters(elements: list[Tag]) -> list[dict[str, object]]:
     return monsters
 
 
-def parse_phase4_data() -> list[dict[str, object]]:
-    soup = load_html()
-    elements = list(iter_elements(soup))
+def parse_phase4_data(html_path: str = HTML_PATH) -> list[dict[str, object]]:
+    elements = load_elements(html_path)
     return parse_monsters(elements)
 
 
-def write_phase4_output(output_dir: str = "data") -> dict[str, int]:
+def write_phase4_output(output_dir: str = "data", html_path: str = HTML_PATH) -> dict[str, int]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    monsters = parse_phase4_data()
+    monsters = parse_phase4_data(html_path)
     path = out_dir / OUTPUT_FILE
     with path.open("w", encoding="utf-8") as f:
         json.dump(monsters, f, indent=2, ensure_ascii=False)
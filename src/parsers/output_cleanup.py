@@ -8,6 +8,23 @@ from typing import Any
 
 _COMMA_INT_RE = re.compile(r"^[0-9]{1,3}(?:,[0-9]{3})+$")
 _INT_RANGE_RE = re.compile(r"^([0-9]+)-([0-9]+)$")
+_PRICE_RE = re.compile(r"^([0-9]+(?:\.[0-9]+)?)\s*(cp|sp|ep|gp|pp)$", re.IGNORECASE)
+_AMOUNT_RE = re.compile(r"^([0-9,]+(?:\.[0-9]+)?|½)\s*(lbs?|tons?)?$", re.IGNORECASE)
+
+CP_PER_COIN = {"cp": 1, "sp": 10, "ep": 50, "gp": 100, "pp": 500}
+POUNDS_PER_TON = 2000
+
+# Equipment weight markers: "*" items weigh a tenth of a pound each (ten
+# to the pound); "**" items have no appreciable weight.
+WEIGHT_MARKERS = {"*": 0.1, "**": 0.0}
+
+# Price column and the unit of bare numbers in it, per equipment dataset.
+PRICED_DATASETS = {
+    "weapons": ("price", None),
+    "armor": ("price", None),
+    "equipment": ("price", None),
+    "vehicles": ("cost_gp", "gp"),
+}
 
 
 def _parse_int_with_commas(value: str) -> int | None:
@@ -98,8 +115,60 @@ def normalize_weapon_categories(weapons: list[dict[str, Any]]) -> list[dict[str,
     return out
 
 
+def parse_price_cp(value: Any, unit: str | None = None) -> int | None:
+    """Convert "4 gp" / "15 sp" (or a bare number in *unit*) to copper pieces.
+
+    Returns None for blanks, "n/a" and anything else that is not a price.
+    """
+    text = str(value).strip()
+    if unit is not None and re.fullmatch(r"[0-9]+(?:\.[0-9]+)?", text.replace(",", "")):
+        text = f"{text.replace(',', '')} {unit}"
+    m = _PRICE_RE.fullmatch(text)
+    if not m:
+        return None
+    return round(float(m.group(1)) * CP_PER_COIN[m.group(2).lower()])
+
+
+def parse_weight_lb(value: Any) -> float | None:
+    """Convert "5" / "½" / "750 lbs" / "½ ton" / "*" markers to pounds.
+
+    Returns None for blanks and anything else that is not a weight.
+    """
+    text = str(value).strip()
+    if text in WEIGHT_MARKERS:
+        return WEIGHT_MARKERS[text]
+    m = _AMOUNT_RE.fullmatch(text)
+    if not m:
+        return None
+    amount = 0.5 if m.group(1) == "½" else float(m.group(1).replace(",", ""))
+    if m.group(2) and m.group(2).lower().startswith("ton"):
+        amount *= POUNDS_PER_TON
+    return amount
+
+
+def normalize_prices_and_weights(name: str, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Add integer ``price_cp`` and numeric ``weight_lb`` next to the source strings.
+
+    Vehicles also get ``cargo_lb``.  Values that cannot be parsed (e.g. the
+    merged water-vessel cost cells) are null.
+    """
+
+    price_column, unit = PRICED_DATASETS[name]
+    out: list[dict[str, Any]] = []
+    for row in rows:
+        normalized = dict(row)
+        normalized["price_cp"] = parse_price_cp(row.get(price_column, ""), unit)
+        normalized["weight_lb"] = parse_weight_lb(row.get("weight", ""))
+        if name == "vehicles":
+            normalized["cargo_lb"] = parse_weight_lb(row.get("cargo", ""))
+        out.append(normalized)
+    return out
+
+
 def cleanup_payload(name: str, payload: Any) -> Any:
     cleaned = _normalize_ranges_and_numbers(payload)
     if name == "weapons" and isinstance(cleaned, list):
         cleaned = normalize_weapon_categories(cleaned)
+    if name in PRICED_DATASETS and isinstance(cleaned, list):
+        cleaned = normalize_prices_and_weights(name, cleaned)
     return cleaned
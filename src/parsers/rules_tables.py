@@ -15,14 +15,14 @@ import json
 import re
 from pathlib import Path
 
-from bs4 import Tag
-
 from section_navigation import elements_between, find_section
 from extract_text import (
+    HTML_PATH,
+    Element,
     get_text,
     get_text_preserve_whitespace,
-    iter_elements,
-    load_html,
+    iter_tables,
+    load_elements,
     table_to_rows,
 )
 
@@ -60,14 +60,14 @@ def _rows_to_records(rows: list[list[str]]) -> list[dict[str, str]]:
     return out
 
 
-def _find_first_table_in_section(elements: list[Tag], header: str) -> list[list[str]]:
+def _find_first_table_in_section(elements: list[Element], header: str) -> list[list[str]]:
     for el in elements_between(elements, header):
         if el.name == "table":
             return table_to_rows(el)
     return []
 
 
-def _find_tables_in_section(elements: list[Tag], header: str) -> list[list[list[str]]]:
+def _find_tables_in_section(elements: list[Element], header: str) -> list[list[list[str]]]:
     tables: list[list[list[str]]] = []
     for el in elements_between(elements, header):
         if el.name == "table":
@@ -75,17 +75,17 @@ def _find_tables_in_section(elements: list[Tag], header: str) -> list[list[list[
     return tables
 
 
-def parse_weapons(elements: list[Tag]) -> list[dict[str, str]]:
+def parse_weapons(elements: list[Element]) -> list[dict[str, str]]:
     rows = _find_first_table_in_section(elements, "Weapons")
     return _rows_to_records(rows)
 
 
-def parse_armor(elements: list[Tag]) -> list[dict[str, str]]:
+def parse_armor(elements: list[Element]) -> list[dict[str, str]]:
     rows = _find_first_table_in_section(elements, "Armor and Shields")
     return _rows_to_records(rows)
 
 
-def parse_equipment(elements: list[Tag]) -> list[dict[str, str]]:
+def parse_equipment(elements: list[Element]) -> list[dict[str, str]]:
     tables = _find_tables_in_section(elements, "Equipment")
     out: list[dict[str, str]] = []
     for rows in tables:
@@ -93,7 +93,7 @@ def parse_equipment(elements: list[Tag]) -> list[dict[str, str]]:
     return out
 
 
-def parse_vehicles(elements: list[Tag]) -> list[dict[str, str]]:
+def parse_vehicles(elements: list[Element]) -> list[dict[str, str]]:
     out: list[dict[str, str]] = []
     section_map = {
         "Land Transportation": "land",
@@ -107,7 +107,7 @@ def parse_vehicles(elements: list[Tag]) -> list[dict[str, str]]:
     return out
 
 
-def parse_class_tables(elements: list[Tag]) -> dict[str, list[dict[str, str]]]:
+def parse_class_tables(elements: list[Element]) -> dict[str, list[dict[str, str]]]:
     out: dict[str, list[dict[str, str]]] = {}
     for class_name in ["Cleric", "Fighter", "Magic-User"]:
         rows = _find_first_table_in_section(elements, class_name)
@@ -145,7 +145,7 @@ def parse_class_tables(elements: list[Tag]) -> dict[str, list[dict[str, str]]]:
     return out
 
 
-def parse_saving_throws(elements: list[Tag]) -> dict[str, list[dict[str, str]]]:
+def parse_saving_throws(elements: list[Element]) -> dict[str, list[dict[str, str]]]:
     section = elements_between(elements, "Saving Throw Tables by Class")
     out: dict[str, list[dict[str, str]]] = {}
 
@@ -162,12 +162,12 @@ def parse_saving_throws(elements: list[Tag]) -> dict[str, list[dict[str, str]]]:
     return out
 
 
-def parse_thief_abilities(elements: list[Tag]) -> list[dict[str, str]]:
+def parse_thief_abilities(elements: list[Element]) -> list[dict[str, str]]:
     rows = _find_first_table_in_section(elements, "Thief Abilities")
     return _rows_to_records(rows)
 
 
-def parse_attack_bonus(elements: list[Tag]) -> list[dict[str, str]]:
+def parse_attack_bonus(elements: list[Element]) -> list[dict[str, str]]:
     idx = find_section(elements, "Attack Bonus Table")
     if idx is None:
         return []
@@ -243,9 +243,8 @@ def parse_attack_bonus(elements: list[Tag]) -> list[dict[str, str]]:
     return out
 
 
-def parse_turning_undead(soup) -> dict[str, object]:
-    for table in soup.find_all("table"):
-        rows = table_to_rows(table)
+def parse_turning_undead(elements: list[Element]) -> dict[str, object]:
+    for rows in iter_tables(elements):
         if not rows:
             continue
         header = rows[0]
@@ -273,9 +272,8 @@ def parse_turning_undead(soup) -> dict[str, object]:
     return {"undead_columns": [], "rows": []}
 
 
-def parse_phase2_data() -> dict[str, object]:
-    soup = load_html()
-    elements = list(iter_elements(soup))
+def parse_phase2_data(html_path: str = HTML_PATH) -> dict[str, object]:
+    elements = load_elements(html_path)
 
     return {
         "weapons": parse_weapons(elements),
@@ -286,15 +284,15 @@ def parse_phase2_data() -> dict[str, object]:
         "saving_throws": parse_saving_throws(elements),
         "thief_abilities": parse_thief_abilities(elements),
         "attack_bonus": parse_attack_bonus(elements),
-        "turning_undead": parse_turning_undead(soup),
+        "turning_undead": parse_turning_undead(elements),
     }
 
 
-def write_phase2_outputs(output_dir: str = "data") -> dict[str, int]:
+def write_phase2_outputs(output_dir: str = "data", html_path: str = HTML_PATH) -> dict[str, int]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    parsed = parse_phase2_data()
+    parsed = parse_phase2_data(html_path)
     counts: dict[str, int] = {}
 
     for key, filename in OUTPUT_FILES.items():
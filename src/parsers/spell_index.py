@@ -0,0 +1,302 @@
+"""Phase 7 derived output: structured spell index.
+
+Parses the free-text ``range`` and ``duration`` fields of ``spells.json``
+into numeric base values plus per-level scaling terms, and joins
+``spell_list.json`` so that (class, level) spellbook lookups and by-name
+lookups are single dict probes.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+OUTPUT_FILE = "spell_index.json"
+
+# Game-time units normalized to seconds (1 round = 10 seconds, 1 turn = 10 minutes).
+SECONDS_PER_UNIT = {
+    "round": 10,
+    "minute": 60,
+    "turn": 600,
+    "hour": 3600,
+    "day": 86400,
+    "year": 31536000,
+}
+
+_UNIT = r"(round|minute|turn|hour|day|year)s?"
+_PER_LEVEL_FEET_RE = re.compile(r"\+?\s*(\d+)'\s*(?:/|per)\s*level", re.IGNORECASE)
+_FEET_RE = re.compile(r"(\d+)'")
+_DURATION_PATTERNS = [
+    # "level+1d4 rounds"
+    ("level_plus_dice", re.compile(rf"^level\s*\+\s*(\d+d\d+)\s+{_UNIT}$")),
+    # "1 round/level", "1 turn/4 levels"
+    ("per_level", re.compile(rf"^(\d+)\s+{_UNIT}\s*/\s*(\d+)?\s*levels?$")),
+    # "2 rounds+1/level", "6 turns + 1/level"
+    ("base_plus_per_level", re.compile(rf"^(\d+)\s+{_UNIT}\s*\+\s*(\d+)\s*/\s*levels?$")),
+    # "2d8 turns"
+    ("dice", re.compile(rf"^(\d+d\d+)\s+{_UNIT}$")),
+    # "3 turns"
+    ("fixed", re.compile(rf"^(\d+)\s+{_UNIT}$")),
+]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _canon(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", s.lower()).strip()
+
+
+def parse_spell_range(text: str) -> dict[str, Any]:
+    """Parse a spell range such as ``"100'+10'/level"`` into numeric terms.
+
+    Returns ``kind`` (touch/self/special/distance), ``feet`` (fixed part),
+    ``per_level_feet`` and ``radius``.  ``feet`` is None when no distance
+    could be read.
+    """
+    raw = text.strip()
+    s = raw.lower()
+
+    if s.startswith("touch"):
+        kind = "touch"
+    elif s.startswith("self"):
+        kind = "self"
+    elif s.startswith("special"):
+        kind = "special"
+    else:
+        kind = "distance"
+
+    per_level = 0
+    m = _PER_LEVEL_FEET_RE.search(s)
+    if m:
+        per_level = int(m.group(1))
+        s = s[: m.start()] + s[m.end() :]
+
+    feet: int | None
+    m = _FEET_RE.search(s)
+    if m:
+        feet = int(m.group(1))
+    elif re.fullmatch(r"\d+", s.strip()):
+        feet = int(s.strip())
+    elif per_level or kind in {"touch", "self"}:
+        feet = 0
+    else:
+        feet = None
+
+    return {
+        "raw": raw,
+        "kind": kind,
+        "feet": feet,
+        "per_level_feet": per_level,
+        "radius": "radius" in s,
+    }
+
+
+def parse_spell_duration(text: str) -> dict[str, Any]:
+    """Parse a spell duration such as ``"5 turns +1/level"`` into scaling terms.
+
+    Timed durations carry ``unit``, ``base``, ``per_level`` (added every
+    ``levels_per_step`` caster levels), an optional ``dice`` term and the
+    equivalent ``base_seconds``/``per_level_seconds``.  Anything else is
+    reported by ``kind`` alone (instantaneous, permanent, special,
+    concentration, other).
+    """
+    raw = text.strip()
+    s = re.sub(r"\s+", " ", raw.lower())
+
+    out: dict[str, Any] = {
+        "raw": raw,
+        "kind": "other",
+        "unit": None,
+        "base": 0,
+        "per_level": 0,
+        "levels_per_step": 1,
+        "dice": None,
+        "base_seconds": None,
+        "per_level_seconds": None,
+    }
+    for keyword in ("instantaneous", "permanent", "special", "concentration"):
+        if s.startswith(keyword):
+            out["kind"] = keyword
+            return out
+
+    for form, pattern in _DURATION_PATTERNS:
+        m = pattern.fullmatch(s)
+        if not m:
+            continue
+        if form == "level_plus_dice":
+            out.update(dice=m.group(1), unit=m.group(2), per_level=1)
+        elif form == "per_level":
+            out.update(unit=m.group(2), per_level=int(m.group(1)), levels_per_step=int(m.group(3) or 1))
+        elif form == "base_plus_per_level":
+            out.update(unit=m.group(2), base=int(m.group(1)), per_level=int(m.group(3)))
+        elif form == "dice":
+            out.update(dice=m.group(1), unit=m.group(2))
+        else:
+            out.update(unit=m.group(2), base=int(m.group(1)))
+        out["kind"] = "timed"
+        unit_seconds = SECONDS_PER_UNIT[out["unit"]]
+        out["base_seconds"] = out["base"] * unit_seconds
+        out["per_level_seconds"] = out["per_level"] * unit_seconds
+        break
+
+    return out
+
+
+def range_feet_at(spell_range: dict[str, Any], caster_level: int) -> int | None:
+    """Return the effective range in feet for a caster of *caster_level*."""
+    if spell_range.get("feet") is None:
+        return None
+    return spell_range["feet"] + spell_range.get("per_level_feet", 0) * caster_level
+
+
+def duration_seconds_at(duration: dict[str, Any], caster_level: int) -> int | None:
+    """Return the fixed (non-dice) duration in seconds at *caster_level*."""
+    if duration.get("kind") != "timed":
+        return None
+    steps = caster_level // duration.get("levels_per_step", 1)
+    return duration["base_seconds"] + duration["per_level_seconds"] * steps
+
+
+def build_spell_index(spells: list[dict[str, Any]], spell_list: dict[str, Any]) -> dict[str, Any]:
+    """Build the spell index payload from cleaned spell outputs."""
+    records: dict[str, dict[str, Any]] = {}
+    by_name: dict[str, str] = {}
+
+    for spell in spells:
+        name_clean = spell.get("name_clean") or spell.get("name", "")
+        spell_id = _slug(name_clean)
+        if not spell_id or spell_id in records:
+            continue
+        records[spell_id] = {
+            "id": spell_id,
+            "name": spell.get("name", ""),
+            "name_clean": name_clean,
+            "reversible": bool(spell.get("reversible")),
+            "class_levels": dict(spell.get("class_levels", {})),
+            "range": parse_spell_range(str(spell.get("range", ""))),
+            "duration": parse_spell_duration(str(spell.get("duration", ""))),
+        }
+        by_name.setdefault(_canon(name_clean), spell_id)
+        by_name.setdefault(_canon(spell.get("name", "")), spell_id)
+
+    by_class_level: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    seen: set[tuple[str, int, str]] = set()
+    unresolved: list[str] = []
+
+    def _add(class_key: str, level: int, name: str, spell_id: str | None) -> None:
+        key = (class_key, level, spell_id or _canon(name))
+        if key in seen:
+            return
+        seen.add(key)
+        by_class_level.setdefault(class_key, {}).setdefault(str(level), []).append(
+            {"name": name, "spell_id": spell_id}
+        )
+
+    for row in spell_list.get("spell_levels", []):
+        name_clean = row.get("name_clean", "")
+        spell_id = by_name.get(_canon(name_clean))
+        if spell_id is None:
+            unresolved.append(name_clean)
+        _add(row["class"], int(row["level"]), name_clean, spell_id)
+
+    # Spells whose metadata lists a class/level missing from the spell lists.
+    for spell_id, rec in records.items():
+        for class_key, level in rec["class_levels"].items():
+            _add(class_key, int(level), rec["name_clean"], spell_id)
+
+    for levels in by_class_level.values():
+        for entries in levels.values():
+            entries.sort(key=lambda e: _canon(e["name"]))
+
+    return {
+        "spells": records,
+        "by_name": by_name,
+        "by_class_level": {
+            cls: dict(sorted(levels.items(), key=lambda kv: int(kv[0])))
+            for cls, levels in sorted(by_class_level.items())
+        },
+        "unresolved": sorted(set(unresolved)),
+    }
+
+
+def _load_json(path: Path):
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_spell_index(data_dir: str = "data") -> dict[str, int]:
+    root = Path(data_dir)
+    spells = _load_json(root / "spells.json") or []
+    spell_list = _load_json(root / "spell_list.json") or {}
+
+    index = build_spell_index(spells, spell_list)
+    path = root / OUTPUT_FILE
+    path.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    return {
+        "spells": len(index["spells"]),
+        "class_levels": sum(len(levels) for levels in index["by_class_level"].values()),
+        "unresolved": len(index["unresolved"]),
+    }
+
+
+def load_spell_index(data_dir: str = "data") -> dict[str, Any]:
+    """Load ``spell_index.json``, building it in memory if it is missing."""
+    root = Path(data_dir)
+    index = _load_json(root / OUTPUT_FILE)
+    if index is None:
+        index = build_spell_index(
+            _load_json(root / "spells.json") or [],
+            _load_json(root / "spell_list.json") or {},
+        )
+    return index
+
+
+def get_spell(index: dict[str, Any], name: str) -> dict[str, Any] | None:
+    """Look up a spell record by any spelling of its name."""
+    spell_id = index["by_name"].get(_canon(name))
+    return index["spells"].get(spell_id) if spell_id else None
+
+
+def find_spells(
+    index: dict[str, Any],
+    class_key: str,
+    level: int,
+    *,
+    min_range_feet: int | None = None,
+    scales_per_level: bool | None = None,
+    caster_level: int | None = None,
+) -> list[dict[str, Any]]:
+    """Return resolved spell records for (*class_key*, *level*) matching the filters.
+
+    ``min_range_feet`` compares against the range at *caster_level* (the
+    spell's own level when omitted).  ``scales_per_level`` selects spells
+    whose duration does (True) or does not (False) grow with caster level.
+    """
+    entries = index["by_class_level"].get(class_key, {}).get(str(level), [])
+    at_level = caster_level if caster_level is not None else level
+    out = []
+    for entry in entries:
+        rec = index["spells"].get(entry["spell_id"]) if entry["spell_id"] else None
+        if rec is None:
+            continue
+        if min_range_feet is not None:
+            feet = range_feet_at(rec["range"], at_level)
+            if feet is None or feet < min_range_feet:
+                continue
+        if scales_per_level is not None:
+            if bool(rec["duration"]["per_level"]) != scales_per_level:
+                continue
+        out.append(rec)
+    return out
+
+
+if __name__ == "__main__":
+    summary = write_spell_index()
+    for k, v in summary.items():
+        print(f"{k}: {v}")
@@ -6,10 +6,16 @@ import json
 import re
 from pathlib import Path
 
-from bs4 import Tag
-
 from section_navigation import elements_between
-from extract_text import get_text, get_text_preserve_whitespace, iter_elements, load_html, table_to_rows
+from extract_text import (
+    HTML_PATH,
+    Element,
+    get_bold_text,
+    get_text,
+    get_text_preserve_whitespace,
+    load_elements,
+    table_to_rows,
+)
 
 OUTPUT_FILES = {
     "spells": "spells.json",
@@ -46,7 +52,7 @@ def _parse_level_word(text: str) -> int | None:
     return int(m.group(1)) if m else None
 
 
-def _parse_spell_list_section(elements: list[Tag], header: str, class_key: str) -> dict[int, list[str]]:
+def _parse_spell_list_section(elements: list[Element], header: str, class_key: str) -> dict[int, list[str]]:
     section = elements_between(elements, header)
     out: dict[int, list[str]] = {}
     current_level: int | None = None
@@ -72,7 +78,7 @@ def _parse_spell_list_section(elements: list[Tag], header: str, class_key: str)
     return out
 
 
-def parse_spell_list(elements: list[Tag]) -> dict[str, object]:
+def parse_spell_list(elements: list[Element]) -> dict[str, object]:
     cleric = _parse_spell_list_section(elements, "Cleric Spells", "cleric")
     magic_user = _parse_spell_list_section(elements, "Magic-User Spells", "magic_user")
 
@@ -121,7 +127,7 @@ def _extract_meta(meta_text: str) -> tuple[dict[str, int], str]:
     return class_levels, duration
 
 
-def parse_spells(elements: list[Tag]) -> list[dict[str, object]]:
+def parse_spells(elements: list[Element]) -> list[dict[str, object]]:
     section = elements_between(elements, "All Spells, in Alphabetical Order")
 
     starts: list[int] = []
@@ -129,7 +135,7 @@ def parse_spells(elements: list[Tag]) -> list[dict[str, object]]:
         if el.name != "p":
             continue
         text = get_text_preserve_whitespace(el)
-        if "Range:" in text and el.find("b") is not None:
+        if "Range:" in text and get_bold_text(el) is not None:
             starts.append(i)
 
     out: list[dict[str, object]] = []
@@ -138,11 +144,11 @@ def parse_spells(elements: list[Tag]) -> list[dict[str, object]]:
 
         head = section[start]
         head_text = _norm(get_text_preserve_whitespace(head))
-        b = head.find("b")
-        if b is None:
+        bold = get_bold_text(head)
+        if bold is None:
             continue
 
-        name = _norm(b.get_text(" ", strip=True))
+        name = _norm(bold)
         name_clean = name.rstrip("*")
         reversible = name.endswith("*")
 
@@ -209,9 +215,8 @@ def parse_spells(elements: list[Tag]) -> list[dict[str, object]]:
     return out
 
 
-def parse_phase3_data() -> dict[str, object]:
-    soup = load_html()
-    elements = list(iter_elements(soup))
+def parse_phase3_data(html_path: str = HTML_PATH) -> dict[str, object]:
+    elements = load_elements(html_path)
 
     return {
         "spells": parse_spells(elements),
@@ -219,7 +224,7 @@ def parse_phase3_data() -> dict[str, object]:
     }
 
 
-def write_phase3_outputs(output_dir: str = "data") -> dict[str, int]:
+def write_phase3_outputs(output_dir: str = "data", html_path: str = HTML_PATH) -> dict[str, int]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -228,7 +233,7 @@ def write_phase3_outputs(output_dir: str = "data") -> dict[str, int]:
         if legacy_path.exists():
             legacy_path.unlink()
 
-    parsed = parse_phase3_data()
+    parsed = parse_phase3_data(html_path)
     counts: dict[str, int] = {}
 
     for key, filename in OUTPUT_FILES.items():
@@ -6,15 +6,14 @@ import json
 import re
 from pathlib import Path
 
-from bs4 import Tag
-
 from section_navigation import elements_between_parts
 from extract_text import (
+    HTML_PATH,
+    Element,
     get_section_header_text,
     get_text,
     is_section_header,
-    iter_elements,
-    load_html,
+    load_elements,
     table_to_rows,
 )
 
@@ -29,11 +28,11 @@ def _norm(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def _collect_part7_blocks(elements: list[Tag]) -> list[tuple[str, list[Tag]]]:
+def _collect_part7_blocks(elements: list[Element]) -> list[tuple[str, list[Element]]]:
     part7 = elements_between_parts(elements, 7, 8)
-    blocks: list[tuple[str, list[Tag]]] = []
+    blocks: list[tuple[str, list[Element]]] = []
     current_header: str | None = None
-    current_body: list[Tag] = []
+    current_body: list[Element] = []
 
     for el in part7:
         if is_section_header(el):
@@ -49,7 +48,7 @@ def _collect_part7_blocks(elements: list[Tag]) -> list[tuple[str, list[Tag]]]:
     return blocks
 
 
-def _table_from_block(block: list[Tag]) -> list[list[str]]:
+def _table_from_block(block: list[Element]) -> list[list[str]]:
     for el in block:
         if el.name == "table":
             return table_to_rows(el)
@@ -64,7 +63,7 @@ def _table_to_payload(rows: list[list[str]]) -> dict[str, object]:
     return {"headers": headers, "rows": data_rows}
 
 
-def parse_treasure_types(blocks: list[tuple[str, list[Tag]]]) -> dict[str, object]:
+def parse_treasure_types(blocks: list[tuple[str, list[Element]]]) -> dict[str, object]:
     target_names = ["Lair Treasures", "Individual Treasures", "Unguarded Treasures"]
     out: dict[str, object] = {}
     seen: set[str] = set()
@@ -79,7 +78,7 @@ def parse_treasure_types(blocks: list[tuple[str, list[Tag]]]) -> dict[str, objec
     return out
 
 
-def parse_magic_item_tables(blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, object]]:
+def parse_magic_item_tables(blocks: list[tuple[str, list[Element]]]) -> list[dict[str, object]]:
     table_sections = {
         "Magic Item Generation",
         "Magic Weapons",
@@ -115,7 +114,7 @@ def parse_magic_item_tables(blocks: list[tuple[str, list[Tag]]]) -> list[dict[st
     return out
 
 
-def parse_magic_items(blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, object]]:
+def parse_magic_items(blocks: list[tuple[str, list[Element]]]) -> list[dict[str, object]]:
     categories = {
         "Magic Weapons",
         "Magic Armor",
@@ -169,9 +168,8 @@ def parse_magic_items(blocks: list[tuple[str, list[Tag]]]) -> list[dict[str, obj
     return entries
 
 
-def parse_phase5_data() -> dict[str, object]:
-    soup = load_html()
-    elements = list(iter_elements(soup))
+def parse_phase5_data(html_path: str = HTML_PATH) -> dict[str, object]:
+    elements = load_elements(html_path)
     blocks = _collect_part7_blocks(elements)
 
     return {
@@ -181,11 +179,11 @@ def parse_phase5_data() -> dict[str, object]:
     }
 
 
-def write_phase5_outputs(output_dir: str = "data") -> dict[str, int]:
+def write_phase5_outputs(output_dir: str = "data", html_path: str = HTML_PATH) -> dict[str, int]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    parsed = parse_phase5_data()
+    parsed = parse_phase5_data(html_path)
     counts: dict[str, int] = {}
 
     for key, filename in OUTPUT_FILES.items():
@@ -0,0 +1,252 @@
+"""Performance regression gate against committed baselines.
+
+The gate runs the full build (:func:`build.run_build`, phases 2-7) in a
+fresh child process against the real manual or a synthetic one
+(:mod:`synthetic_manual`). It records these metrics:
+
+- ``build_seconds``, ``load_seconds`` (parsing the manual into element
+  records, shared by all phases as in ``make build``) and
+  ``phase<N>_seconds``: wall time, best of ``--repeat`` runs
+- ``peak_rss_mb``: the child's peak resident set size
+- ``output_bytes``: total size of the files the build writes
+
+``check`` compares them with ``benchmarks/baseline.json`` and fails when
+build time, peak RSS or output size grows past its tolerance (default:
+time 25%, memory 15%, output size 5%), printing a table of baseline,
+current and limit.  Load and per-phase times are too short to gate on
+reliably; they are reported (flagged "over" past the time tolerance) to
+show where a regression sits.
+
+``update`` records the current numbers as the new baseline.  Baselines
+are keyed by manual ("synthetic-x1", "manual"), and timings only mean
+something on comparable machines; the stored machine metadata is shown
+when it differs.
+
+    python src/perf_gate.py check
+    python src/perf_gate.py update --scale 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmark import machine_metadata
+from data_store import DATA_DIR
+from extract_text import HTML_PATH, load_elements, shared_documents
+from profiling import peak_rss_mb
+
+BASELINE_PATH = "benchmarks/baseline.json"
+
+TOLERANCES = {"time": 0.25, "memory": 0.15, "size": 0.05}
+
+# Metrics that fail the gate; the rest are informational.
+GATED_METRICS = ("build_seconds", "peak_rss_mb", "output_bytes")
+
+
+def metric_kind(name: str) -> str:
+    if name.endswith("_seconds"):
+        return "time"
+    if name.endswith("_mb"):
+        return "memory"
+    return "size"
+
+
+def measure_in_process(html_path: str, out_dir: str, phases: list[int] | None = None) -> dict[str, float]:
+    """Build into *out_dir* (which should hold a copy of ``data/``) and return the metrics."""
+    from build import phase_functions, run_build
+
+    functions = phase_functions()
+    metrics: dict[str, float] = {}
+    start = time.perf_counter()
+    phases = sorted(phases or functions)
+    # One parse shared by all phases, as in `cli.py build-all` (make build).
+    with shared_documents():
+        if any(phase < 7 for phase in phases):
+            load_elements(html_path)
+            metrics["load_seconds"] = time.perf_counter() - start
+        for phase in phases:
+            phase_start = time.perf_counter()
+            run_build(out_dir, html_path, [phase])
+            metrics[f"phase{phase}_seconds"] = time.perf_counter() - phase_start
+    metrics["build_seconds"] = time.perf_counter() - start
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    metrics["output_bytes"] = sum(p.stat().st_size for p in Path(out_dir).iterdir() if p.is_file())
+    return metrics
+
+
+def measure(
+    html_path: str,
+    data_dir: str = DATA_DIR,
+    phases: list[int] | None = None,
+    repeat: int = 3,
+) -> dict[str, float]:
+    """Best-of-*repeat* metrics, each run in a new interpreter on a scratch copy of *data_dir*."""
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as scratch:
+            out_dir = str(Path(scratch) / "data")
+            shutil.copytree(data_dir, out_dir)
+            cmd = [sys.executable, str(Path(__file__).resolve()), "measure", "--html", html_path, "--out-dir", out_dir]
+            for phase in phases or []:
+                cmd += ["--phase", str(phase)]
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"Build failed:\n{proc.stderr.strip()}")
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def compare_metrics(
+    baseline: dict[str, float],
+    current: dict[str, float],
+    tolerances: dict[str, float] | None = None,
+) -> list[dict[str, Any]]:
+    """One row per metric in both runs, gated metrics first.
+
+    ``over`` marks a metric that grew past its tolerance; ``regressed``
+    marks the gated ones among them.
+    """
+    tolerances = {**TOLERANCES, **(tolerances or {})}
+    rows = []
+    names = [n for n in GATED_METRICS if n in baseline] + sorted(n for n in baseline if n not in GATED_METRICS)
+    for name in names:
+        before = baseline[name]
+        if name not in current:
+            continue
+        after = current[name]
+        tolerance = tolerances[metric_kind(name)]
+        change = (after - before) / before if before else 0.0
+        over = after > before * (1 + tolerance)
+        rows.append(
+            {
+                "metric": name,
+                "baseline": before,
+                "current": after,
+                "change": change,
+                "tolerance": tolerance,
+                "over": over,
+                "regressed": over and name in GATED_METRICS,
+            }
+        )
+    return rows
+
+
+def _format_value(name: str, value: float) -> str:
+    kind = metric_kind(name)
+    if kind == "time":
+        return f"{value:.3f} s"
+    if kind == "memory":
+        return f"{value:.1f} MiB"
+    return f"{value:,.0f} B"
+
+
+def format_report(rows: list[dict[str, Any]]) -> str:
+    lines = [f"{'metric':<20}{'baseline':>14}{'current':>14}{'change':>9}{'limit':>8}  status"]
+    for row in rows:
+        lines.append(
+            f"{row['metric']:<20}{_format_value(row['metric'], row['baseline']):>14}"
+            f"{_format_value(row['metric'], row['current']):>14}{row['change']:>+9.1%}"
+            f"{row['tolerance']:>+8.0%}  {'REGRESSED' if row['regressed'] else 'over' if row['over'] else 'ok'}"
+        )
+    return "\n".join(lines)
+
+
+def load_baselines(path: str = BASELINE_PATH) -> dict[str, Any]:
+    p = Path(path)
+    if not p.exists():
+        return {}
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def save_baseline(key: str, metrics: dict[str, float], path: str = BASELINE_PATH) -> dict[str, Any]:
+    baselines = load_baselines(path)
+    baselines[key] = {"machine": machine_metadata(), "metrics": metrics}
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return baselines[key]
+
+
+def _machine_differences(stored: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    keys = ("platform", "cpu_count", "python", "implementation")
+    return [f"{k}: {stored.get(k)} -> {current.get(k)}" for k in keys if stored.get(k) != current.get(k)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check build time, memory and output size against baselines.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("check", "compare against the baseline"), ("update", "record a new baseline")):
+        cmd = sub.add_parser(name, help=help_text)
+        source = cmd.add_mutually_exclusive_group()
+        source.add_argument("--html", help="real manual export to build from")
+        source.add_argument("--scale", type=int, default=1, help="synthetic manual scale (default 1)")
+        cmd.add_argument("--data-dir", default=DATA_DIR)
+        cmd.add_argument("--baseline", default=BASELINE_PATH)
+        cmd.add_argument("--repeat", type=int, default=3)
+        cmd.add_argument("--phase", type=int, action="append", dest="phases")
+        cmd.add_argument("--time-tolerance", type=float, default=TOLERANCES["time"])
+        cmd.add_argument("--memory-tolerance", type=float, default=TOLERANCES["memory"])
+        cmd.add_argument("--size-tolerance", type=float, default=TOLERANCES["size"])
+    child = sub.add_parser("measure", help=argparse.SUPPRESS)
+    child.add_argument("--html", default=HTML_PATH)
+    child.add_argument("--out-dir", required=True)
+    child.add_argument("--phase", type=int, action="append", dest="phases")
+    args = parser.parse_args(argv)
+
+    if args.command == "measure":
+        print(json.dumps(measure_in_process(args.html, args.out_dir, args.phases)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.html:
+            key, html_path = "manual", args.html
+        else:
+            from synthetic_manual import write_manual
+
+            key = f"synthetic-x{args.scale}"
+            html_path = str(Path(scratch) / f"{key}.html")
+            write_manual(html_path, args.scale, args.data_dir)
+        if args.phases:
+            key += "-phases-" + "".join(str(p) for p in sorted(args.phases))
+        try:
+            current = measure(html_path, args.data_dir, args.phases, args.repeat)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    if args.command == "update":
+        save_baseline(key, current, args.baseline)
+        print(f"baseline {key} written to {args.baseline}")
+        for name, value in current.items():
+            print(f"  {name:<20}{_format_value(name, value):>14}")
+        return 0
+
+    stored = load_baselines(args.baseline).get(key)
+    if stored is None:
+        print(f"No baseline for {key} in {args.baseline}; run `perf_gate.py update` first.", file=sys.stderr)
+        return 1
+    tolerances = {"time": args.time_tolerance, "memory": args.memory_tolerance, "size": args.size_tolerance}
+    rows = compare_metrics(stored["metrics"], current, tolerances)
+    print(f"perf gate: {key}")
+    differences = _machine_differences(stored.get("machine", {}), machine_metadata())
+    if differences:
+        print("note: baseline was recorded on a different machine (" + "; ".join(differences) + ")")
+    print(format_report(rows))
+    regressed = [row["metric"] for row in rows if row["regressed"]]
+    if regressed:
+        print(f"FAILED: {', '.join(regressed)} above tolerance")
+        return 1
+    print("passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
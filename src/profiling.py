@@ -0,0 +1,217 @@
+"""Span profiler for build runs.
+
+A :class:`Profiler` records spans: wall time, CPU time and the
+tracemalloc peak reached inside the span (bytes above the allocation
+level at entry).  Spans come from :meth:`Profiler.span` blocks or from
+functions wrapped by :meth:`Profiler.instrument`, which temporarily
+rebinds the function in every ``src`` module that imported it, so the
+parsers need no profiling hooks of their own.
+
+Results are written as a Chrome trace-event file (open it in
+``chrome://tracing`` or Perfetto) and a text summary aggregated by span
+name.  A *label* function can split a helper's spans by argument, e.g.
+``elements_between[Weapons]``, to show which section a cost belongs to.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple
+
+SRC_DIR = Path(__file__).resolve().parent
+
+TRACE_FILE = "trace.json"
+SUMMARY_FILE = "summary.txt"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@contextmanager
+def rebind(wrappers: dict[int, Callable[..., Any]]) -> Iterator[None]:
+    """Replace functions, keyed by ``id()``, in every loaded ``src`` module for the block."""
+    patched: list[tuple[Any, str, Any]] = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path or SRC_DIR not in Path(path).resolve().parents:
+            continue
+        for attr, value in list(vars(module).items()):
+            wrapper = wrappers.get(id(value))
+            if wrapper is not None:
+                patched.append((module, attr, value))
+                setattr(module, attr, wrapper)
+    try:
+        yield
+    finally:
+        for module, attr, value in patched:
+            setattr(module, attr, value)
+
+
+class Span(NamedTuple):
+    name: str
+    category: str
+    start_ns: int  # perf_counter_ns at entry
+    wall_ns: int
+    cpu_ns: int
+    peak_bytes: int  # tracemalloc peak above the level at entry; 0 without memory tracing
+    depth: int
+    args: dict[str, Any]
+
+
+class _Frame:
+    __slots__ = ("start_memory", "peak")
+
+    def __init__(self, start_memory: int) -> None:
+        self.start_memory = start_memory
+        self.peak = start_memory
+
+
+class Profiler:
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        self.spans: list[Span] = []
+        self._stack: list[_Frame] = []
+        self._started_tracemalloc = False
+        self._origin_ns = time.perf_counter_ns()
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def span(self, name: str, category: str = "span", **args: Any) -> Iterator[None]:
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = _Frame(current)
+        self._stack.append(frame)
+        depth = len(self._stack) - 1
+        start_cpu = time.thread_time_ns()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - start
+            cpu = time.thread_time_ns() - start_cpu
+            if self.memory and tracemalloc.is_tracing():
+                frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+            self.spans.append(
+                Span(name, category, start, wall, cpu, frame.peak - frame.start_memory, depth, args)
+            )
+
+    def wrap(
+        self,
+        fn: Callable[..., Any],
+        name: str | None = None,
+        category: str = "function",
+        label: Callable[..., Any] | None = None,
+    ) -> Callable[..., Any]:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            full_name = span_name
+            if label is not None:
+                try:
+                    full_name = f"{span_name}[{label(*args, **kwargs)}]"
+                except Exception:
+                    pass
+            with self.span(full_name, category):
+                return fn(*args, **kwargs)
+
+        wrapper.__wrapped_by_profiler__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    @contextmanager
+    def instrument(
+        self,
+        functions: dict[str, Callable[..., Any]],
+        labels: dict[str, Callable[..., Any]] | None = None,
+        category: str = "function",
+    ) -> Iterator[None]:
+        """Rebind each function in every loaded ``src`` module for the duration of the block."""
+        labels = labels or {}
+        wrappers = {
+            id(fn): self.wrap(fn, name, category, labels.get(name)) for name, fn in functions.items()
+        }
+        with rebind(wrappers):
+            yield
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Per span name: calls, total wall and CPU seconds and the largest peak, slowest first."""
+        rows: dict[str, dict[str, Any]] = {}
+        for s in self.spans:
+            row = rows.setdefault(
+                s.name,
+                {"name": s.name, "category": s.category, "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_bytes": 0},
+            )
+            row["calls"] += 1
+            row["wall_s"] += s.wall_ns / 1e9
+            row["cpu_s"] += s.cpu_ns / 1e9
+            row["peak_bytes"] = max(row["peak_bytes"], s.peak_bytes)
+        return sorted(rows.values(), key=lambda r: r["wall_s"], reverse=True)
+
+    def format_summary(self, limit: int | None = None) -> str:
+        lines = [f"{'span':<48}{'calls':>8}{'wall s':>10}{'cpu s':>10}{'peak MiB':>10}"]
+        for row in self.summary()[:limit]:
+            lines.append(
+                f"{row['name'][:47]:<48}{row['calls']:>8}{row['wall_s']:>10.3f}{row['cpu_s']:>10.3f}"
+                f"{row['peak_bytes'] / 2**20:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = [
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start_ns - self._origin_ns) / 1e3,
+                "dur": s.wall_ns / 1e3,
+                "pid": pid,
+                "tid": tid,
+                "args": {"cpu_ms": s.cpu_ns / 1e6, "peak_bytes": s.peak_bytes, **s.args},
+            }
+            for s in sorted(self.spans, key=lambda s: s.start_ns)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, out_dir: str) -> tuple[Path, Path]:
+        """Write ``trace.json`` and ``summary.txt`` under *out_dir*."""
+        out = Path(out_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        trace_path = out / TRACE_FILE
+        trace_path.write_text(json.dumps(self.chrome_trace()) + "\n", encoding="utf-8")
+        summary_path = out / SUMMARY_FILE
+        summary_path.write_text(self.format_summary() + "\n", encoding="utf-8")
+        return trace_path, summary_path
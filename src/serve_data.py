@@ -0,0 +1,14 @@
+"""Serve the generated data/ outputs over a local read-only HTTP API."""
+
+import argparse
+
+from api.http_server import serve
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.data_dir, args.host, args.port)
@@ -0,0 +1,426 @@
+"""Synthetic LibreOffice-style manual HTML for offline and scaling runs.
+
+The real manual has to be exported from the ``.odt`` by hand and only
+comes in one size.  :func:`render_manual` rebuilds a manual from the
+generated ``data/`` JSON using the markup the parsers expect: PART and
+section headers in SoutaneBlack, section bodies in ``column-count: 2``
+divs, monster stat tables starting with "Armor Class:", spell headers
+with "Range:" followed by a "Duration:" line, the attack bonus text
+block, and the equipment, treasure and encounter tables.
+
+At ``scale=1`` parsing the output gives back the same records as
+``data/``.  At ``scale=N`` every open-ended list (equipment rows,
+spells and spell lists, monsters, magic items and their tables,
+treasure rows and encounter tables) is repeated N times, with copies
+after the first named "<name> 2", "<name> 3" and so on.  Fixed rules
+tables (class progression, saving throws, attack bonus, thief
+abilities, turning undead) keep their size, but their parsers still
+scan the larger element list.
+
+    python src/synthetic_manual.py --scale 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+from pathlib import Path
+from typing import Any
+
+from data_store import DATA_DIR, load_dataset
+
+LEVEL_WORDS = ("First", "Second", "Third", "Fourth", "Fifth", "Sixth")
+
+PARTS = (
+    "INTRODUCTION",
+    "PLAYER CHARACTERS",
+    "SPELLS",
+    "THE ADVENTURE",
+    "THE ENCOUNTER",
+    "MONSTERS",
+    "TREASURE",
+    "GAME MASTER INFORMATION",
+    "APPENDICES",
+)
+
+# Column labels whose slug is the record key; other keys are title-cased.
+LABELS = {
+    "dmg": "Dmg.",
+    "ac": "AC",
+    "hit_dice": "Hit Dice",
+    "xp": "XP",
+    "no_of_attacks": "No. of Attacks",
+    "no_appearing": "No. Appearing",
+    "cost_gp": "Cost (gp)",
+    "hardness_hp": "Hardness / HP",
+}
+
+# Columns added by the cleanup stage rather than read from the manual.
+DERIVED_COLUMNS = {"category", "price_cp", "weight_lb", "cargo_lb"}
+
+_STYLE = """\
+<style type="text/css">
+	@page { size: 8.5in 11in; margin: 0.5in }
+	p { margin-bottom: 0.1in; line-height: 115%; background: transparent }
+	td p { orphans: 0; widows: 0; background: transparent }
+</style>"""
+
+
+def _text(value: str) -> str:
+    return html.escape(value, quote=False)
+
+
+def _cell(value: Any) -> str:
+    """Render a cleaned JSON value the way the manual prints it."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, int):
+        # Integers in the cleaned data come from comma-grouped numbers.
+        return f"{value:,}"
+    if isinstance(value, float):
+        return f"{value:g}"
+    if isinstance(value, list) and value and all(isinstance(v, int) for v in value):
+        # Ranges were expanded to inclusive lists; "00" stands for 100.
+        last = "00" if value[-1] == 100 and len(value) > 1 else str(value[-1])
+        return f"{value[0]}-{last}"
+    return str(value)
+
+
+def _label(key: str) -> str:
+    return LABELS.get(key) or key.replace("_", " ").title()
+
+
+def _copy_name(name: str, copy: int) -> str:
+    if copy == 0:
+        return name
+    if name.endswith("*"):
+        return f"{name[:-1]} {copy + 1}*"
+    return f"{name} {copy + 1}"
+
+
+def _part(number: int) -> str:
+    return (
+        '<p class="western" align="center" style="page-break-before: always">'
+        '<font face="SoutaneBlack"><font size="5" style="font-size: 16pt">'
+        f"PART {number}: {PARTS[number - 1]}</font></font></p>"
+    )
+
+
+def _header(text: str) -> str:
+    return (
+        '<p class="western" style="margin-top: 0.08in"><font face="SoutaneBlack">'
+        f'<font size="3" style="font-size: 12pt">{_text(text)}</font></font></p>'
+    )
+
+
+def _para(text: str) -> str:
+    return (
+        '<p class="western" align="justify"><font face="Liberation Serif, serif">'
+        f'<font size="2" style="font-size: 10pt">{_text(text)}</font></font></p>'
+    )
+
+
+def _table(rows: list[list[Any]]) -> str:
+    width = max((len(r) for r in rows), default=0)
+    out = ['<table width="100%" cellpadding="2" cellspacing="0">']
+    out += [f'\t<col width="{256 // max(width, 1)}*"/>' for _ in range(width)]
+    for row in rows:
+        out.append('\t<tr valign="top">')
+        for value in row:
+            out.append(
+                '\t\t<td style="border: none; padding: 0in"><p class="western">'
+                f'<font size="2" style="font-size: 9pt">{_text(_cell(value))}</font></p></td>'
+            )
+        out.append("\t</tr>")
+    out.append("</table>")
+    return "\n".join(out)
+
+
+def _columns(blocks: list[str], section_id: int) -> str:
+    return (
+        f'<div id="Section{section_id}" dir="ltr" style="column-count: 2; column-gap: 0.2in">\n'
+        + "\n".join(blocks)
+        + "\n</div>"
+    )
+
+
+def _record_columns(records: list[dict[str, Any]]) -> list[str]:
+    keys: list[str] = []
+    for rec in records:
+        keys += [k for k in rec if k not in keys and k not in DERIVED_COLUMNS]
+    return keys
+
+
+def _record_table(records: list[dict[str, Any]], name_key: str, scale: int) -> str:
+    keys = _record_columns(records)
+    rows: list[list[Any]] = [[_label(k) for k in keys]]
+    for copy in range(scale):
+        for rec in records:
+            row = [rec.get(k, "") for k in keys]
+            row[keys.index(name_key)] = _copy_name(str(rec.get(name_key, "")), copy)
+            rows.append(row)
+    return _table(rows)
+
+
+def _weapons_table(weapons: list[dict[str, Any]], scale: int) -> str:
+    keys = _record_columns(weapons)
+    rows: list[list[Any]] = [[_label(k) for k in keys]]
+    for copy in range(scale):
+        category = None
+        for rec in weapons:
+            if rec.get("category") != category:
+                category = rec.get("category")
+                rows.append([category] + [""] * (len(keys) - 1))
+            row = [rec.get(k, "") for k in keys]
+            row[keys.index("weapon")] = _copy_name(str(rec["weapon"]), copy)
+            rows.append(row)
+    return _table(rows)
+
+
+def _grid(headers: list[Any], rows: list[list[Any]], scale: int = 1) -> str:
+    return _table([headers] + [row for _ in range(scale) for row in rows])
+
+
+def _part2(data: dict[str, Any], scale: int) -> list[str]:
+    blocks: list[str] = []
+    for race in data["races"]:
+        blocks.append(_header(race["name"]))
+        blocks += [_para(p) for p in race.get("description_paragraphs", [])]
+
+    turning = data["turning_undead"]
+    for cls in data["classes"]:
+        blocks.append(_header(cls["name"]))
+        blocks += [_para(p) for p in cls.get("description_paragraphs", [])]
+        key = cls["name"].lower().replace("-", "_")
+        records = data["class_tables"].get(key)
+        if records:
+            keys = _record_columns(records)
+            blocks.append(_table([[_label(k) for k in keys]] + [[r.get(k, "") for k in keys] for r in records]))
+        if key == "cleric" and turning.get("rows"):
+            columns = turning["undead_columns"]
+            slugs = [c["name"].lower() for c in columns]
+            blocks.append(
+                _table(
+                    [["Cleric Level"] + [c["name"] for c in columns], [c["hit_dice"] for c in columns]]
+                    + [[r["cleric_level"]] + [r.get(s, "") for s in slugs] for r in turning["rows"]]
+                )
+            )
+
+    blocks.append(_header("Thief Abilities"))
+    thief = data["thief_abilities"]
+    keys = _record_columns(thief)
+    blocks.append(_table([[_label(k) for k in keys]] + [[r.get(k, "") for k in keys] for r in thief]))
+
+    blocks += [_header("Weapons"), _weapons_table(data["weapons"], scale)]
+    blocks += [_header("Armor and Shields"), _record_table(data["armor"], "armor_type", scale)]
+    blocks += [_header("Equipment"), _record_table(data["equipment"], "item", scale)]
+    for header, category in (("Land Transportation", "land"), ("Water Transportation", "water")):
+        vehicles = [v for v in data["vehicles"] if v.get("category") == category]
+        blocks += [_header(header), _record_table(vehicles, "vehicle", scale)]
+
+    for table in data["combat_tables"]:
+        if table.get("source_part") == 2:
+            blocks += [_header(table["table_name"]), _grid(table["headers"], table["rows"])]
+    return blocks
+
+
+def _part3(data: dict[str, Any], scale: int) -> list[str]:
+    blocks: list[str] = []
+    progression = data["spell_list"].get("spell_progression", {})
+    for header, class_key, class_name in (
+        ("Cleric Spells", "cleric", "Cleric"),
+        ("Magic-User Spells", "magic_user", "Magic-User"),
+    ):
+        blocks.append(_header(header))
+        for level, names in progression.get(class_key, {}).items():
+            blocks.append(_para(f"{LEVEL_WORDS[int(level) - 1]} Level {class_name} Spells"))
+            listed = [_copy_name(name, copy) for copy in range(scale) for name in names]
+            blocks.append(_table([[str(i), name] for i, name in enumerate(listed, start=1)]))
+
+    blocks.append(_header("All Spells, in Alphabetical Order"))
+    class_names = {"cleric": "Cleric", "magic_user": "Magic-User"}
+    for copy in range(scale):
+        for spell in data["spells"]:
+            name = _copy_name(spell["name"], copy)
+            blocks.append(
+                '<p class="western"><font face="Liberation Serif, serif"><font size="2" style="font-size: 10pt">'
+                f'<b>{_text(name)}</b>\tRange: {_text(_cell(spell.get("range", "")))}</font></font></p>'
+            )
+            levels = ", ".join(f"{class_names[c]} {lvl}" for c, lvl in spell.get("class_levels", {}).items())
+            blocks.append(_para(f"{levels}\tDuration: {_cell(spell.get('duration', ''))}"))
+            blocks += [_para(p) for p in spell.get("description_paragraphs", [])]
+            blocks += [_grid(t["headers"], t["rows"]) for t in spell.get("embedded_tables", [])]
+    return blocks
+
+
+def _attack_bonus_text(records: list[dict[str, Any]]) -> str:
+    lines = ["Fighter", "Cleric, Thief", "Magic-User", "Monster Hit Dice", "Attack Bonus"]
+    for rec in records:
+        fields = ("fighter_level", "cleric_or_thief_level", "magic_user_level", "monster_hit_dice", "attack_bonus")
+        lines += [_cell(rec[f]) for f in fields if _cell(rec.get(f, ""))]
+    lines.append('To roll "to hit," roll 1d20 and add the attack bonus shown above.')
+    body = "<br/>\n".join(_text(line) for line in lines)
+    return (
+        '<p class="western"><font face="SoutaneBlack"><font size="3" style="font-size: 12pt">'
+        f"Attack Bonus Table</font></font><br/>\n{body}</p>"
+    )
+
+
+def _part5(data: dict[str, Any]) -> list[str]:
+    blocks: list[str] = []
+    for table in data["combat_tables"]:
+        if table.get("source_section") == "Monster Reactions":
+            blocks += [_header("Monster Reactions"), _grid(table["headers"], table["rows"])]
+    blocks += [_header("How to Attack"), _para("Each attack is resolved with a d20 roll.")]
+    blocks.append(_attack_bonus_text(data["attack_bonus"]))
+
+    blocks.append(_header("Saving Throw Tables by Class"))
+    for class_key, records in data["saving_throws"].items():
+        blocks.append(_para(class_key.replace("_", "-").title()))
+        keys = _record_columns(records)
+        blocks.append(_table([[_label(k) for k in keys]] + [[r.get(k, "") for k in keys] for r in records]))
+    return blocks
+
+
+def _stat_value(value: Any) -> list[Any]:
+    if isinstance(value, str) and "|" in value:
+        return [cell.strip() for cell in value.split("|")]
+    return [value]
+
+
+def _part6(data: dict[str, Any], scale: int) -> list[str]:
+    blocks = [_header("Monster Descriptions"), _para("Monsters are listed in alphabetical order.")]
+    for copy in range(scale):
+        for monster in data["monsters"]:
+            blocks.append(_header(_copy_name(monster["name"], copy)))
+            stat_block = monster.get("stat_block") or {}
+            if stat_block:
+                blocks.append(_table([[f"{_label(k)}:"] + _stat_value(v) for k, v in stat_block.items()]))
+            blocks += [_para(p) for p in monster.get("description_paragraphs", [])]
+            blocks += [_grid(t["headers"], t["rows"]) for t in monster.get("dragon_age_tables", [])]
+    return blocks
+
+
+def _part7(data: dict[str, Any], scale: int) -> list[str]:
+    blocks: list[str] = []
+    for name, table in data["treasure_types"].items():
+        blocks += [_header(name), _grid(table["headers"], table["rows"], scale)]
+
+    section = None
+    for table in data["magic_item_tables"]:
+        if table["section"] != section:
+            section = table["section"]
+            blocks.append(_header(section))
+        blocks.append(_grid(table["headers"], table["rows"], scale))
+
+    blocks += [_header("Using Magic Items"), _para("Magic items are described by category below.")]
+    categories: dict[str, list[dict[str, Any]]] = {}
+    for item in data["magic_items"]:
+        categories.setdefault(item["category"], []).append(item)
+    for name, items in categories.items():
+        blocks.append(_header(name))
+        for copy in range(scale):
+            for item in items:
+                paragraphs = item.get("description_paragraphs") or [""]
+                blocks.append(_para(f"{_copy_name(item['name'], copy)}: {paragraphs[0]}"))
+                blocks += [_para(p) for p in paragraphs[1:]]
+    return blocks
+
+
+def _part8(data: dict[str, Any], scale: int) -> list[str]:
+    blocks: list[str] = []
+    for section, tables in (
+        ("Dungeon Encounters", data["encounter_tables"].get("dungeon", [])),
+        ("Wilderness Encounters", data["encounter_tables"].get("wilderness", [])),
+    ):
+        blocks.append(_header(section))
+        for _ in range(scale):
+            blocks += [_grid(t["headers"], t["rows"]) for t in tables]
+    return blocks
+
+
+def load_manual_data(data_dir: str = DATA_DIR) -> dict[str, Any]:
+    names = (
+        "races",
+        "classes",
+        "class_tables",
+        "thief_abilities",
+        "turning_undead",
+        "weapons",
+        "armor",
+        "equipment",
+        "vehicles",
+        "combat_tables",
+        "spell_list",
+        "spells",
+        "attack_bonus",
+        "saving_throws",
+        "monsters",
+        "treasure_types",
+        "magic_item_tables",
+        "magic_items",
+        "encounter_tables",
+    )
+    data = {name: load_dataset(name, data_dir) for name in names}
+    missing = [name for name, value in data.items() if value is None]
+    if missing:
+        raise FileNotFoundError(f"Missing datasets in {data_dir}: {', '.join(missing)}")
+    return data
+
+
+def render_manual(data_dir: str = DATA_DIR, scale: int = 1) -> str:
+    """HTML for a manual holding *scale* copies of every open-ended record list."""
+    if scale < 1:
+        raise ValueError(f"scale must be at least 1, got {scale}")
+    data = load_manual_data(data_dir)
+    toc = [_para(f"PART {n}: {title} {n * 10}") for n, title in enumerate(PARTS, start=1)]
+    bodies = {
+        1: [_header("Introduction"), _para("This is a synthetic manual generated from extracted data.")],
+        2: _part2(data, scale),
+        3: _part3(data, scale),
+        4: [_header("Time and Movement"), _para("Game time is measured in rounds and turns.")],
+        5: _part5(data),
+        6: _part6(data, scale),
+        7: _part7(data, scale),
+        8: _part8(data, scale),
+        9: [_header("Appendices"), _para("End of the synthetic manual.")],
+    }
+
+    out = [
+        '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0 Transitional//EN">',
+        "<html>",
+        "<head>",
+        '\t<meta http-equiv="content-type" content="text/html; charset=utf-8"/>',
+        f"\t<title>Basic Fantasy Role-Playing Game (synthetic x{scale})</title>",
+        '\t<meta name="generator" content="LibreOffice 7.3.7.2 (Linux)"/>',
+        _STYLE,
+        "</head>",
+        '<body lang="en-US" dir="ltr">',
+        _columns(toc, 1),
+    ]
+    for number, blocks in bodies.items():
+        out += [_part(number), _columns(blocks, number + 1)]
+    out += ["</body>", "</html>", ""]
+    return "\n".join(out)
+
+
+def write_manual(path: str, scale: int = 1, data_dir: str = DATA_DIR) -> int:
+    """Write a synthetic manual to *path*; returns its size in bytes."""
+    text = render_manual(data_dir, scale)
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(text, encoding="utf-8")
+    return len(text.encode("utf-8"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic manual HTML export.")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--out", help="default: manual/synthetic-x<scale>.html")
+    args = parser.parse_args()
+    path = args.out or f"manual/synthetic-x{args.scale}.html"
+    size = write_manual(path, args.scale, args.data_dir)
+    print(f"{path}: {size:,} bytes (scale {args.scale})")
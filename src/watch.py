@@ -0,0 +1,277 @@
+"""Watch the manual export and rebuild only what an edit affects.
+
+:class:`Watcher` keeps the manual's element records in memory between
+builds.  The stream is split into sections at every SoutaneBlack
+header; text before the first header is its own section.
+
+On each save (polled by mtime and size, so no extra dependency):
+
+1. The export is scanned with lxml directly, which takes tens of
+   milliseconds where a BeautifulSoup parse takes seconds.  This gives
+   each section's title and a digest of its elements' markup.
+2. If the headers are unchanged, only the changed sections are
+   converted to :class:`extract_text.Element` records again
+   (:func:`extract_text.parse_fragment`).  The new records replace the
+   old ones in the held list.  If headers were added, removed or
+   renamed, the section boundaries moved, so the whole file is
+   re-parsed.
+3. Only the phases that read a changed section run, then the phases
+   that read their outputs (``DATA_DEPENDENCIES``), then phase 7.
+
+What a phase reads is recorded while it runs.  The section helpers
+(``find_section``, ``find_part``, ``elements_between``,
+``elements_between_parts``), ``table_to_rows`` and ``element_tables``
+are rebound the way the profiler instruments them.  Every element they
+return or receive marks its section as read; the parsers reach the
+manual only through these helpers.  A save that leaves the bytes unchanged runs nothing.
+
+    python src/cli.py watch
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import lxml.html
+
+import extract_text
+import section_navigation
+from build import PHASE_NAMES, phase_functions
+from extract_text import (
+    HTML_PATH,
+    Element,
+    elements_from_html,
+    is_section_header,
+    iter_lxml_elements,
+    lxml_markup,
+    parse_fragment,
+    shared_documents,
+    shared_key,
+)
+from profiling import rebind
+
+# Phases that read another phase's output files: phase 6 copies
+# attack_bonus.json and saving_throws.json (phase 2) into combat_tables.json.
+DATA_DEPENDENCIES = {6: {2}}
+
+VALIDATION_PHASE = 7
+
+
+class Section(NamedTuple):
+    title: str
+    start: int  # stream index of the first element (the header)
+    end: int  # stream index after the last element
+    digest: str
+
+
+class Update(NamedTuple):
+    changed_sections: list[str]
+    phases: list[int]
+    reparsed: str  # "full" or "sections"
+    parse_seconds: float
+    build_seconds: float
+    results: dict[int, Any]
+
+
+def scan_sections(html: str) -> tuple[list[Section], list[str]]:
+    """Split *html* into sections with lxml; returns the sections and each stream element's markup.
+
+    Mirrors :func:`extract_text.iter_elements` and
+    :func:`extract_text.is_section_header` on the lxml tree.
+    """
+    elements = list(iter_lxml_elements(lxml.html.document_fromstring(html)))
+    markup = [lxml_markup(el) for el in elements]
+    sections: list[Section] = []
+    title, start = "", 0
+    for i, el in enumerate(elements):
+        font = el.find(".//font[@face='SoutaneBlack']") if el.tag == "p" else None
+        if font is None:
+            continue
+        if i:
+            sections.append(Section(title, start, i, _digest(markup[start:i])))
+        title, start = re.sub(r"\s+", " ", font.text_content()).strip(), i
+    sections.append(Section(title, start, len(elements), _digest(markup[start:])))
+    return sections, markup
+
+
+def _digest(markup: list[str]) -> str:
+    h = hashlib.sha1()
+    for part in markup:
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
+def changed_sections(old: list[Section], new: list[Section]) -> set[int] | None:
+    """Indexes of sections whose content changed, or None when the headers changed."""
+    if [s.title for s in old] != [s.title for s in new]:
+        return None
+    return {i for i, (a, b) in enumerate(zip(old, new)) if a.digest != b.digest}
+
+
+def affected_phases(reads: dict[int, set[int]], changed: set[int] | None) -> list[int]:
+    """Phases to re-run for *changed* sections, given the sections each phase read."""
+    if changed is None:
+        return sorted(PHASE_NAMES)
+    phases = {phase for phase, sections in reads.items() if sections & changed}
+    for phase, upstream in DATA_DEPENDENCIES.items():
+        if upstream & phases:
+            phases.add(phase)
+    if phases:
+        phases.add(VALIDATION_PHASE)
+    return sorted(phases)
+
+
+class Watcher:
+    def __init__(self, html_path: str = HTML_PATH, data_dir: str = "data") -> None:
+        self.html_path = html_path
+        self.data_dir = data_dir
+        self.elements: list[Element] = []
+        self.sections: list[Section] = []
+        self.reads: dict[int, set[int]] = {}
+        self._section_of: list[int] = []
+        self._position: dict[int, int] = {}
+        self._digest: str | None = None
+        self._stat: tuple[int, int] | None = None
+        self._recording: set[int] | None = None
+        self.incremental = True
+
+    def _read(self) -> str:
+        self._stat = self._stat_key()
+        return Path(self.html_path).read_text(encoding="utf-8")
+
+    def _stat_key(self) -> tuple[int, int]:
+        st = os.stat(self.html_path)
+        return st.st_mtime_ns, st.st_size
+
+    def _index(self, sections: list[Section]) -> None:
+        self.sections = sections
+        self._section_of = [i for i, s in enumerate(sections) for _ in range(s.start, s.end)]
+        self._position = {id(el): i for i, el in enumerate(self.elements)} if sections else {}
+
+    def _parse_full(self, html: str, sections: list[Section]) -> None:
+        self.elements = elements_from_html(html)
+        headers = [i for i, el in enumerate(self.elements) if is_section_header(el)]
+        expected = [s.start for s in sections[1:]]
+        if self.elements and is_section_header(self.elements[0]):
+            expected.insert(0, 0)
+        # Unusual markup the two parsers read differently: rebuild everything on every save.
+        self.incremental = len(self.elements) == sections[-1].end and headers == expected
+        self._index(sections if self.incremental else [])
+
+    def _splice(self, changed: set[int], sections: list[Section], markup: list[str]) -> bool:
+        """Re-convert only the *changed* sections; False if that is not possible."""
+        replacements = []
+        for i in sorted(changed):
+            new = sections[i]
+            new_elements = parse_fragment("".join(markup[new.start : new.end]))
+            if len(new_elements) != new.end - new.start:
+                return False
+            replacements.append((self.sections[i], new_elements))
+        for old, new_elements in reversed(replacements):
+            self.elements[old.start : old.end] = new_elements
+        self._index(sections)
+        return True
+
+    def _mark(self, el: Any) -> None:
+        i = self._position.get(id(el))
+        if i is not None:
+            self._recording.add(self._section_of[i])
+
+    def _tracked(self, fn: Callable[..., Any], kind: str) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = fn(*args, **kwargs)
+            if self._recording is not None:
+                if kind == "index" and result is not None:
+                    self._mark(args[0][result])
+                elif kind == "elements":
+                    for el in result:
+                        self._mark(el)
+                elif kind == "argument":
+                    self._mark(args[0])
+            return result
+
+        return wrapper
+
+    def _wrappers(self) -> dict[int, Callable[..., Any]]:
+        tracked = {
+            section_navigation.find_section: "index",
+            section_navigation.find_part: "index",
+            section_navigation.elements_between: "elements",
+            section_navigation.elements_between_parts: "elements",
+            extract_text.table_to_rows: "argument",
+            extract_text.element_tables: "argument",
+        }
+        return {id(fn): self._tracked(fn, kind) for fn, kind in tracked.items()}
+
+    def run_phases(self, phases: list[int]) -> dict[int, Any]:
+        """Run *phases* against the in-memory document, recording what each one reads."""
+        functions = phase_functions()
+        results: dict[int, Any] = {}
+        with shared_documents() as cache, rebind(self._wrappers()):
+            cache[shared_key(self.html_path, "elements")] = self.elements
+            for phase in phases:
+                self._recording = set()
+                try:
+                    results[phase] = functions[phase](self.data_dir, self.html_path)
+                finally:
+                    self.reads[phase], self._recording = self._recording, None
+        return results
+
+    def build(self) -> Update:
+        """Parse the manual and run every phase."""
+        html = self._read()
+        start = time.perf_counter()
+        sections, _ = scan_sections(html)
+        self._parse_full(html, sections)
+        self._digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        parsed = time.perf_counter()
+        results = self.run_phases(sorted(PHASE_NAMES))
+        return Update([], sorted(PHASE_NAMES), "full", parsed - start, time.perf_counter() - parsed, results)
+
+    def update(self) -> Update | None:
+        """Rebuild what changed since the last build; None when the bytes are unchanged."""
+        if self._digest is None:
+            return self.build()
+        html = self._read()
+        digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        if digest == self._digest:
+            return None
+        start = time.perf_counter()
+        sections, markup = scan_sections(html)
+        changed = changed_sections(self.sections, sections)
+        self._digest = digest
+        if changed is not None and self.incremental and self._splice(changed, sections, markup):
+            titles = [sections[i].title or "<front matter>" for i in sorted(changed)]
+            phases, reparsed = affected_phases(self.reads, changed), "sections"
+        else:
+            self._parse_full(html, sections)
+            titles = ["<headers changed>"] if changed is None else [sections[i].title for i in sorted(changed)]
+            phases, reparsed = sorted(PHASE_NAMES), "full"
+        parsed = time.perf_counter()
+        results = self.run_phases(phases)
+        return Update(titles, phases, reparsed, parsed - start, time.perf_counter() - parsed, results)
+
+    def changed_on_disk(self) -> bool:
+        return self._stat != self._stat_key()
+
+    def watch(self, interval: float = 0.2, report: Callable[[Update], None] | None = None) -> None:
+        """Poll the file forever, rebuilding after each save once its size and mtime settle."""
+        while True:
+            time.sleep(interval)
+            try:
+                if not self.changed_on_disk():
+                    continue
+                seen = self._stat_key()
+                time.sleep(interval)
+                if self._stat_key() != seen:
+                    continue  # still being written
+                result = self.update()
+            except FileNotFoundError:
+                continue  # replaced by a rename; picked up on the next poll
+            if result is not None and report is not None:
+                report(result)
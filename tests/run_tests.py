@@ -0,0 +1,159 @@
+"""Run every test script in one session.
+
+Each ``tests/test_*.py`` script is imported and its ``main()`` called
+in-process, so the manual is parsed once per session: ``load_html`` runs
+under ``extract_text.shared_documents()`` and every phase script gets
+the same tree.
+
+The scripts that regenerate ``data/`` (BUILD_TESTS) run first, serially
+and in order, because later ones read what earlier ones write.  The
+remaining scripts only read ``data/``; with ``--workers N`` they run in a
+pool of forked worker processes, which inherit the already-parsed
+manual.  Output is captured per script and shown for failures (or
+always with ``-v``).  Scripts that need the manual are skipped when it
+is missing.
+
+Run with:
+    .venv/bin/python tests/run_tests.py --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, "src")
+
+from extract_text import HTML_PATH, shared_documents
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+# Scripts that write data/, in dependency order.
+BUILD_TESTS = (
+    "test_extraction_foundation",
+    "test_rules_tables",
+    "test_output_cleanup",
+    "test_spells",
+    "test_monsters",
+    "test_treasure",
+    "test_characters_and_encounters",
+    "test_data_validation",
+)
+
+# Scripts that read the manual HTML.
+MANUAL_TESTS = {
+    "test_extraction_foundation",
+    "test_rules_tables",
+    "test_spells",
+    "test_monsters",
+    "test_treasure",
+    "test_characters_and_encounters",
+}
+
+
+class ModuleResult(NamedTuple):
+    name: str
+    status: str  # "pass", "fail" or "skip"
+    seconds: float
+    output: str
+
+
+def discover(names: list[str] | None = None) -> list[str]:
+    found = sorted(p.stem for p in TESTS_DIR.glob("test_*.py"))
+    if names:
+        wanted = {n if n.startswith("test_") else f"test_{n}" for n in names}
+        unknown = wanted - set(found)
+        if unknown:
+            raise ValueError(f"Unknown test module: {sorted(unknown)[0]}")
+        found = [n for n in found if n in wanted]
+    return found
+
+
+def run_module(name: str) -> ModuleResult:
+    """Import ``tests/<name>.py`` and call its ``main()``, capturing output."""
+    if name in MANUAL_TESTS and not os.path.exists(HTML_PATH):
+        return ModuleResult(name, "skip", 0.0, f"missing {HTML_PATH}\n")
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            spec = importlib.util.spec_from_file_location(name, TESTS_DIR / f"{name}.py")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            code = module.main()
+        except SystemExit as e:
+            code = e.code
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    status = "pass" if not code else "fail"
+    return ModuleResult(name, status, time.perf_counter() - start, buffer.getvalue())
+
+
+def run_session(names: list[str], workers: int = 1, report=None) -> list[ModuleResult]:
+    """Run *names*: build scripts serially in this process, the rest across *workers*."""
+    build = [n for n in BUILD_TESTS if n in names]
+    rest = [n for n in names if n not in BUILD_TESTS]
+    results: list[ModuleResult] = []
+
+    def _done(result: ModuleResult) -> None:
+        results.append(result)
+        if report:
+            report(result)
+
+    with shared_documents():
+        for name in build:
+            _done(run_module(name))
+        if workers > 1 and len(rest) > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                for result in pool.map(run_module, rest):
+                    _done(result)
+        else:
+            for name in rest:
+                _done(run_module(name))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the test scripts in one session.")
+    parser.add_argument("names", nargs="*", help="test modules to run (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=1)
+    parser.add_argument("-v", "--verbose", action="store_true", help="show output of passing scripts")
+    args = parser.parse_args(argv)
+
+    try:
+        names = discover(args.names)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    def _report(result: ModuleResult) -> None:
+        print(f"[{result.status.upper()}] {result.name} ({result.seconds:.2f}s)")
+        if result.status == "fail" or args.verbose or result.status == "skip":
+            for line in result.output.rstrip().splitlines():
+                print(f"    {line}")
+
+    start = time.perf_counter()
+    results = run_session(names, args.workers, _report)
+    counts = {status: sum(r.status == status for r in results) for status in ("pass", "fail", "skip")}
+    print(
+        f"\n{counts['pass']} passed, {counts['fail']} failed, {counts['skip']} skipped"
+        f" in {time.perf_counter() - start:.2f}s"
+    )
+    return 1 if counts["fail"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""Asyncio batch query API tests."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+sys.path.insert(0, "src")
+
+from api.async_query import AsyncDataAPI, LatencyHistogram
+
+
+def test_coalesced_lookups() -> None:
+    async def run() -> None:
+        api = AsyncDataAPI("data")
+        results = await asyncio.gather(*(api.monster("Basilisk") for _ in range(50)))
+        assert all(r is results[0] for r in results)
+        assert results[0]["name"] == "Basilisk"
+        assert api.coalesced == 49
+        assert api.batches == 1
+
+    asyncio.run(run())
+
+
+def test_batch_queries() -> None:
+    async def run() -> None:
+        api = AsyncDataAPI("data")
+        monster, spell, level_three, table, rolled, missing = await api.batch(
+            [
+                ("monster", "bear, cave"),
+                ("spell", "Fireball"),
+                ("spells_for", "magic_user", 3),
+                ("table", "Dungeon Encounters #1"),
+                ("roll_table", "Dungeon Encounters #1", 4),
+                ("monster", "no such monster"),
+            ]
+        )
+        assert monster["name"] == "Bear, Cave"
+        assert spell["name_clean"] == "Fireball"
+        assert any(s["name_clean"] == "Fireball" for s in level_three)
+        assert table["headers"][0] == "Roll 1d12"
+        assert rolled["row"][1] == "Kobold"
+        assert missing is None
+
+        random_roll = await api.roll_table("Wilderness Encounters #1")
+        assert 2 <= random_roll["roll"] <= 16
+        assert random_roll["row"] is not None
+
+        stats = api.stats()
+        assert stats["latency"]["load"]["count"] == 1
+        assert stats["latency"]["monster"]["count"] == 2
+
+    asyncio.run(run())
+
+
+def test_histogram_quantiles() -> None:
+    hist = LatencyHistogram((0.001, 0.01, 0.1))
+    for _ in range(90):
+        hist.record(0.0005)
+    for _ in range(10):
+        hist.record(0.05)
+    snap = hist.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50_s"] == 0.001
+    assert snap["p99_s"] == 0.1
+
+
+def main() -> int:
+    tests = [
+        ("coalesced_lookups", test_coalesced_lookups),
+        ("batch_queries", test_batch_queries),
+        ("histogram_quantiles", test_histogram_quantiles),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
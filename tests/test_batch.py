@@ -0,0 +1,84 @@
+"""Multi-document batch build tests."""
+
+from __future__ import annotations
+
+import filecmp
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from batch import Document, aggregate_reports, check_documents, load_documents, parse_document_spec, run_batch
+from synthetic_manual import write_manual
+
+
+def test_documents() -> None:
+    assert parse_document_spec("manual/r139.html=builds/r139") == Document("r139", "manual/r139.html", "builds/r139")
+    for bad in ("manual/r139.html", "=builds/r139"):
+        try:
+            parse_document_spec(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad!r}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / "documents.json"
+        manifest.write_text(json.dumps([{"html": "a/r142.html", "data_dir": "out/a"}, {"name": "b", "html": "b.html", "data_dir": "out/b"}]))
+        assert [d.name for d in load_documents(str(manifest))] == ["r142", "b"]
+
+    try:
+        check_documents([Document("a", "a.html", "out"), Document("b", "b.html", "./out")])
+    except ValueError as e:
+        assert "both write to" in str(e)
+    else:
+        raise AssertionError("shared output directory accepted")
+
+
+def test_batch_build() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        html_path = str(Path(tmp) / "manual.html")
+        write_manual(html_path, 1)
+        documents = [
+            Document("first", html_path, str(Path(tmp) / "first")),
+            Document("missing", str(Path(tmp) / "missing.html"), str(Path(tmp) / "missing")),
+            Document("second", html_path, str(Path(tmp) / "second")),
+        ]
+        results = run_batch(documents, workers=2)
+        assert [r.name for r in results] == ["first", "missing", "second"]
+        assert [r.status for r in results] == ["pass", "error", "pass"]
+        assert "FileNotFoundError" in results[1].error
+
+        # Empty output directories: phase 6 reads the phase-2 tables of its own build.
+        for name in ("first", "second"):
+            comparison = filecmp.dircmp("data", str(Path(tmp) / name))
+            assert not comparison.diff_files and not comparison.left_only, (name, comparison.diff_files)
+
+        report = aggregate_reports(documents, results)
+        assert report["summary"]["documents"] == 3 and report["summary"]["passed"] == 2
+        assert report["summary"]["status"] == "fail" and report["documents"]["missing"]["error"]
+        assert report["documents"]["first"]["validation"]["status"] == "pass"
+
+
+def main() -> int:
+    tests = [
+        ("documents", test_documents),
+        ("batch_build", test_batch_build),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
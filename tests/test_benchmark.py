@@ -0,0 +1,74 @@
+"""Extraction benchmark harness tests."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from benchmark import BenchResult, append_history, compare_runs, find_run, load_history, run_benchmarks, time_call
+
+
+def test_time_call() -> None:
+    calls = []
+    times = time_call(lambda: calls.append(1), repeat=3, warmup=2)
+    assert len(calls) == 5 and len(times) == 3 and all(t >= 0 for t in times)
+
+    result = BenchResult("parse", "parse_weapons", (0.3, 0.1, 0.2))
+    assert result.min == 0.1 and result.median == 0.2 and abs(result.mean - 0.2) < 1e-12
+    assert result.as_dict()["stdev"] > 0
+
+
+def test_history_and_compare() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "history.json")
+        assert load_history(path) == []
+        append_history([BenchResult("load", "load_html", (2.0, 2.0)), BenchResult("load", "iter_elements", (1.0,))], path, "before")
+        run = append_history([BenchResult("load", "load_html", (1.0, 1.0))], path, "after", {"repeat": 2})
+        assert run["machine"]["python"] and run["settings"] == {"repeat": 2}
+
+        history = load_history(path)
+        assert len(history) == 2
+        assert find_run(history, "before") is history[0] and find_run(history, "-1") is history[1]
+        rows = compare_runs(find_run(history, "before"), find_run(history, "after"))
+        assert rows == [{"name": "load_html", "before": 2.0, "after": 1.0, "ratio": 0.5}]
+        try:
+            find_run(history, "missing")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown run accepted")
+
+
+def test_run_benchmarks() -> None:
+    results, skipped = run_benchmarks("manual/missing.html", "data", repeat=1, warmup=0)
+    assert [r.name for r in results] == ["run_phase7"] and len(results[0].times) == 1
+    assert any("missing.html" in s for s in skipped)
+
+    results, _ = run_benchmarks("manual/missing.html", "data", repeat=1, warmup=0, only="^parse_")
+    assert results == []
+
+
+def main() -> int:
+    tests = [
+        ("time_call", test_time_call),
+        ("history_and_compare", test_history_and_compare),
+        ("run_benchmarks", test_run_benchmarks),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+"""Bulk character generator tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.characters import ABILITIES, THIEF_SKILLS, CharacterGenerator
+from engines.lookup_tables import CLASS_KEYS, SAVE_KEYS
+
+
+def test_compiled_rules() -> None:
+    gen = CharacterGenerator("data")
+    races = {r.key: r for r in gen.races}
+    assert set(races) == {"dwarf", "elf", "halfling", "human"}
+    assert races["dwarf"].classes == ("cleric", "fighter", "thief")
+    assert races["human"].classes == CLASS_KEYS
+    assert races["dwarf"].minimums[ABILITIES.index("constitution")] == 9
+    assert races["dwarf"].maximums[ABILITIES.index("charisma")] == 17
+    assert races["halfling"].hit_die_cap == 6 and not races["halfling"].large_weapons
+    assert races["elf"].large_weapons
+    assert races["elf"].save_bonus.tolist() == [0, 2, 1, 0, 2]
+    assert races["dwarf"].save_bonus[SAVE_KEYS.index("dragon_breath")] == 3
+
+    assert gen.class_minimums[CLASS_KEYS.index("fighter"), ABILITIES.index("strength")] == 9
+    assert gen.class_minimums[CLASS_KEYS.index("magic_user"), ABILITIES.index("intelligence")] == 9
+
+
+def test_generate_arrays() -> None:
+    gen = CharacterGenerator("data")
+    n = 20_000
+    batch = gen.generate_arrays(n, seed=4)
+    assert all(len(v) == n for v in batch.values())
+    assert batch["abilities"].shape == (n, len(ABILITIES)) and batch["saves"].shape == (n, len(SAVE_KEYS))
+
+    abilities = batch["abilities"]
+    assert abilities.min() >= 3 and abilities.max() <= 18
+    for r, race in enumerate(gen.races):
+        rows = batch["race"] == r
+        assert set(np.unique(batch["class"][rows])) <= {CLASS_KEYS.index(c) for c in race.classes}
+        assert (abilities[rows] >= race.minimums).all() and (abilities[rows] <= race.maximums).all()
+    assert (abilities >= gen.class_minimums[batch["class"]]).all()
+
+    assert (batch["hit_points"] >= 1).all()
+    assert (batch["gold_cp"] >= 0).all() and (batch["gold_cp"] <= 180 * 100).all()
+    assert (batch["weapon"] >= 0).all()
+
+    magic_user = batch["class"] == CLASS_KEYS.index("magic_user")
+    assert (batch["armor"][magic_user] == 0).all() and not batch["shield"][magic_user].any()
+    thief = batch["class"] == CLASS_KEYS.index("thief")
+    assert (batch["thief_skills"][thief] > 0).all() and (batch["thief_skills"][~thief] == 0).all()
+    # Elves and halflings roll at most d6 per level at first level.
+    small_dice = np.isin(batch["race"], [r for r, race in enumerate(gen.races) if race.hit_die_cap])
+    assert (batch["hit_points"][small_dice] <= 6 + 3).all()
+
+    described = gen.describe(batch, int(np.flatnonzero(thief)[0]))
+    assert described["class"] == "thief" and set(described["thief_skills"]) == set(THIEF_SKILLS)
+
+
+def test_options_and_levels() -> None:
+    gen = CharacterGenerator("data")
+    dwarves = gen.generate_arrays(2000, race="dwarf", class_key="fighter", level=5, seed=1)
+    assert (dwarves["race"] == [r.key for r in gen.races].index("dwarf")).all()
+    assert (dwarves["class"] == CLASS_KEYS.index("fighter")).all()
+    assert (dwarves["level"] == 5).all() and (dwarves["attack_bonus"] == 4).all()
+
+    levels = np.arange(1, 21)
+    mixed = gen.generate_arrays(20, level=levels, seed=2)
+    assert mixed["level"].tolist() == levels.tolist()
+
+    try:
+        gen.generate_arrays(10, race="dwarf", class_key="magic_user")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("impossible race/class accepted")
+
+
+def test_streaming_and_chunking() -> None:
+    gen = CharacterGenerator("data")
+    serial = gen.generate(5000, seed=3, workers=1, chunk_size=1500)
+    pooled = gen.generate(5000, seed=3, workers=2, chunk_size=1500)
+    assert all(np.array_equal(serial[k], pooled[k]) for k in serial)
+
+    stream = list(gen.iter_characters(10, seed=0, batch_size=4))
+    assert len(stream) == 10 and all("hit_points" in c for c in stream)
+
+
+def main() -> int:
+    tests = [
+        ("compiled_rules", test_compiled_rules),
+        ("generate_arrays", test_generate_arrays),
+        ("options_and_levels", test_options_and_levels),
+        ("streaming_and_chunking", test_streaming_and_chunking),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
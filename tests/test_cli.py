@@ -0,0 +1,79 @@
+"""Unified CLI tests."""
+
+from __future__ import annotations
+
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+import cli
+from cli import resolve_phases
+from data_export import export_bundle, export_csv
+
+
+def test_resolve_phases() -> None:
+    assert resolve_phases(["spells", "2", "characters-and-encounters", "3"]) == [2, 3, 6]
+    try:
+        resolve_phases(["validation"])
+    except ValueError as e:
+        assert "data_validation" in str(e)
+    else:
+        raise AssertionError("unknown phase accepted")
+
+
+def test_validate_skips_html_stack() -> None:
+    proc = subprocess.run(
+        [sys.executable, "src/cli.py", "--timings", "validate"], capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "status: pass" in proc.stdout
+    assert "bs4 loaded: False" in proc.stderr and "parsers.data_validation" in proc.stderr
+
+
+def test_export() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        summary = export_bundle(str(Path(tmp) / "bundle.json"), names=["spells", "monsters"])
+        bundle = json.loads(Path(summary["path"]).read_text(encoding="utf-8"))
+        assert sorted(bundle["datasets"]) == ["monsters", "spells"] and bundle["manifest_digest"]
+
+        summary = export_csv(str(Path(tmp) / "csv"))
+        assert "spell_list" in summary["skipped"] and summary["written"]["monsters"] > 200
+        with open(Path(tmp) / "csv" / "weapons.csv", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == summary["written"]["weapons"] and "price_cp" in rows[0]
+
+        try:
+            export_csv(str(Path(tmp) / "csv"), names=["no_such_dataset"])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown dataset accepted")
+        assert cli.main(["export", "bundle", str(Path(tmp) / "b.json"), "--dataset", "no_such_dataset"]) == 1
+
+
+def main() -> int:
+    tests = [
+        ("resolve_phases", test_resolve_phases),
+        ("validate_skips_html_stack", test_validate_skips_html_stack),
+        ("export", test_export),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
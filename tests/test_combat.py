@@ -0,0 +1,118 @@
+"""Monte Carlo combat simulator tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.combat import (
+    Combatant,
+    balance_report,
+    character_combatant,
+    monster_combatant,
+    parse_damage,
+    parse_hit_dice,
+    simulate,
+    simulate_bouts,
+)
+from engines.lookup_tables import load_rules_arrays
+from parsers.monster_index import load_monster_lookup
+
+
+def test_stat_parsing() -> None:
+    assert parse_hit_dice("4") == ("4d8", 4)
+    assert parse_hit_dice("3+1") == ("3d8+1", 3)
+    assert parse_hit_dice("6**") == ("6d8", 6)
+    assert parse_hit_dice("1-1") == ("1d8-1", 1)
+    assert parse_hit_dice("½ (1d4 hit points)") == ("1d4", 0)
+
+    assert parse_damage("1d4 claw, 1d6 bite") == ("1d4", "1d6")
+    assert parse_damage("1d6 or by weapon") == ("1d6",)
+    assert parse_damage("") == ()
+
+
+def test_combatants() -> None:
+    monsters = load_monster_lookup("data")
+    rules = load_rules_arrays("data")
+
+    goblin = monster_combatant(monsters["goblin"], count=6, rules=rules)
+    assert goblin.hit_points == "1d8-1" and goblin.count == 6
+    assert goblin.armor_class == 14 and goblin.morale == 7
+
+    ogre = monster_combatant(monsters["ogre"], rules=rules)
+    assert (ogre.hit_points, ogre.attack_bonus, ogre.armor_class) == ("4d8+1", 4, 15)
+
+    fighter = character_combatant("fighter", 1, "Longsword", armor_class=16, data_dir="data", rules=rules)
+    assert fighter.attack_bonus == 1 and fighter.attacks == ("1d8",)
+    assert fighter.hit_points == "1d8" and fighter.morale is None
+
+    try:
+        character_combatant("bard", 1, data_dir="data", rules=rules)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown class accepted")
+
+
+def test_simulate_bouts() -> None:
+    a = Combatant("A", 3, "2d8", 14, 2, ("1d8",))
+    b = Combatant("B", 5, "1d8", 13, 1, ("1d6",), morale=8)
+    results = simulate_bouts(a, b, 2000, np.random.default_rng(1))
+    again = simulate_bouts(a, b, 2000, np.random.default_rng(1))
+
+    assert all(np.array_equal(results[k], again[k]) for k in results)
+    assert all(len(v) == 2000 for v in results.values())
+    assert set(np.unique(results["winner"])) <= {-1, 0, 1}
+    assert results["survivors_a"].max() <= 3 and results["survivors_b"].max() <= 5
+    assert (results["rounds"] >= 1).all()
+    # A side that never checks morale never routs.
+    assert not results["routed_a"].any()
+    # Winners always have someone standing.
+    assert (results["survivors_a"][results["winner"] == 0] > 0).all()
+
+
+def test_lopsided_matchup() -> None:
+    monsters = load_monster_lookup("data")
+    ogre = monster_combatant(monsters["ogre"])._replace(morale=None)
+    wizard = character_combatant("magic_user", 1, "Dagger", armor_class=11, data_dir="data")
+    report = balance_report(simulate(wizard, ogre, 5000, seed=3))
+    assert report["win_rate_b"] > 0.9
+    assert report["bouts"] == 5000
+    assert abs(report["win_rate_a"] + report["win_rate_b"] + report["draw_rate"] - 1) < 1e-9
+
+
+def test_chunking_is_reproducible() -> None:
+    a = Combatant("A", 2, "3d8", 15, 3, ("1d8",))
+    b = Combatant("B", 4, "1d8", 12, 1, ("1d6",), morale=7)
+    serial = simulate(a, b, 5000, seed=9, workers=1, chunk_size=1500)
+    pooled = simulate(a, b, 5000, seed=9, workers=2, chunk_size=1500)
+    assert all(np.array_equal(serial[k], pooled[k]) for k in serial)
+    assert len(serial["winner"]) == 5000
+
+
+def main() -> int:
+    tests = [
+        ("stat_parsing", test_stat_parsing),
+        ("combatants", test_combatants),
+        ("simulate_bouts", test_simulate_bouts),
+        ("lopsided_matchup", test_lopsided_matchup),
+        ("chunking_is_reproducible", test_chunking_is_reproducible),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+"""Keyed diff between data builds."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from data_diff import Change, diff_builds, diff_dataset, diff_to_json, diff_values, format_diff, keyed_records
+from data_export import export_bundle
+from data_store import load_dataset
+
+
+def test_keyed_records() -> None:
+    tables = [{"section": "Scrolls", "rows": [1]}, {"section": "Potions"}, {"section": "Scrolls", "rows": [2]}]
+    assert list(keyed_records(tables, ("section",))) == ["Scrolls", "Potions", "Scrolls #2"]
+    items = [{"category": "Rings", "name": "Wishes"}, {"category": "Wands", "name": "Wishes"}]
+    assert list(keyed_records(items, ("category", "name"))) == ["Rings / Wishes", "Wands / Wishes"]
+
+
+def test_diff_values() -> None:
+    old = {"stat_block": {"ac": "14", "hd": "2"}, "paragraphs": ["a", "b"], "tables": [{"table_name": "A", "rows": [1]}, {"table_name": "B"}]}
+    new = {"stat_block": {"ac": "15"}, "paragraphs": ["a", "b", "c"], "tables": [{"table_name": "B"}, {"table_name": "A", "rows": [2]}], "xp": 5}
+    assert diff_values(old, new) == [
+        Change("stat_block.ac", "changed", "14", "15"),
+        Change("stat_block.hd", "removed", "2", None),
+        Change("paragraphs[2]", "added", None, "c"),
+        Change("tables.A.rows[0]", "changed", 1, 2),
+        Change("xp", "added", None, 5),
+    ]
+
+    monsters = [{"name": "Orc", "xp": 10}, {"name": "Goblin", "xp": 5}, {"name": "Ogre", "xp": 80}]
+    edited = [{"name": "Troll", "xp": 350}, {"name": "Ogre", "xp": 80}, {"name": "Orc", "xp": 25}]
+    diff = diff_dataset("monsters", monsters, edited)
+    assert diff.added == ["Troll"] and diff.removed == ["Goblin"] and diff.unchanged == 1
+    assert diff.changed == {"Orc": [Change("xp", "changed", 10, 25)]}
+
+
+def test_attack_bonus_rows() -> None:
+    rows = load_dataset("attack_bonus", "data")
+    inserted = rows[:-1] + [{**rows[-1], "attack_bonus": "+99", "monster_hit_dice": "99"}] + rows[-1:]
+    diff = diff_dataset("attack_bonus", rows, inserted)
+    assert diff.added == ["+99"] and not diff.removed and not diff.changed
+    assert diff.unchanged == len(rows)
+
+
+def test_diff_builds() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        new_dir = Path(tmp) / "new"
+        shutil.copytree("data", new_dir)
+        spells = json.loads((new_dir / "spells.json").read_text(encoding="utf-8"))
+        renamed = spells[0]["name_clean"]
+        spells[0]["name_clean"] = "Zap"
+        spells[1]["range"] = "far"
+        (new_dir / "spells.json").write_text(json.dumps(spells), encoding="utf-8")
+
+        diffs = {d.name: d for d in diff_builds("data", str(new_dir))}
+        assert "manifest" not in diffs and "spell_index" not in diffs
+        assert [name for name, d in diffs.items() if d.status != "unchanged"] == ["spells"]
+        assert diffs["monsters"].unchanged is None  # identical file, not parsed
+        assert diffs["spells"].added == ["Zap"] and diffs["spells"].removed == [renamed]
+        assert [c.path for c in diffs["spells"].changed[spells[1]["name_clean"]]] == ["range"]
+        assert "~ " + spells[1]["name_clean"] in format_diff(list(diffs.values()))
+        json.dumps(diff_to_json(list(diffs.values())))
+
+        bundle = str(Path(tmp) / "bundle.json")
+        export_bundle(bundle, str(new_dir))
+        diffs = diff_builds(bundle, str(new_dir), ["spells", "monsters"])
+        assert [d.status for d in diffs] == ["unchanged", "unchanged"] and diffs[1].unchanged > 0
+
+    try:
+        diff_builds("data", "data", ["nope"])
+    except ValueError as e:
+        assert "nope" in str(e)
+    else:
+        raise AssertionError("unknown dataset accepted")
+
+
+def main() -> int:
+    tests = [
+        ("keyed_records", test_keyed_records),
+        ("diff_values", test_diff_values),
+        ("attack_bonus_rows", test_attack_bonus_rows),
+        ("diff_builds", test_diff_builds),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
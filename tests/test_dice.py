@@ -0,0 +1,130 @@
+"""Dice expression parser, distribution and sampler tests."""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.dice import (
+    BinOp,
+    Const,
+    Dice,
+    Gate,
+    compile_dice,
+    dice_distribution,
+    dice_range,
+    expected_value,
+    find_dice,
+    parse_dice,
+)
+
+
+def test_parse() -> None:
+    assert parse_dice("3d6") == Dice(3, 6)
+    assert parse_dice("d%") == Dice(1, 100)
+    assert parse_dice("1d8+1") == BinOp("+", Dice(1, 8), Const(1))
+    assert parse_dice("4d6x10") == BinOp("*", Dice(4, 6), Const(10))
+    assert parse_dice("1d4 * 1000") == BinOp("*", Dice(1, 4), Const(1000))
+    assert parse_dice("2d4-1+1") == BinOp("+", BinOp("-", Dice(2, 4), Const(1)), Const(1))
+    assert parse_dice("50% 5d6") == Gate(Fraction(50), Dice(5, 6))
+    assert parse_dice("(1d6+1)x10").left == BinOp("+", Dice(1, 6), Const(1))
+    assert compile_dice("3d6") is compile_dice("3d6")
+
+    assert parse_dice("100% 1d6") == Gate(Fraction(100), Dice(1, 6))
+    for bad in ("", "3d", "d0", "0d6", "50%", "2d6 +", "5d6 50%", "goblin", "150% 1d6", "100.5% 1d6"):
+        try:
+            parse_dice(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def test_find_dice() -> None:
+    assert find_dice("1d6, Wild 2d4, Lair 2d4") == ["1d6", "2d4", "2d4"]
+    assert find_dice("50% 5d6 and 90% 4d6x10") == ["50%5d6", "90%4d6x10"]
+    assert find_dice("1d4* bump, 1d8+1 or by weapon, 2d6 x 1000 gp") == ["1d4", "1d8+1", "2d6x1000"]
+    assert find_dice("Wild 10") == []
+    assert find_dice("causes 1d6+1 damage") == ["1d6+1"]
+    assert find_dice("1d8+2 dmg, 1d6 + 1d4") == ["1d8+2", "1d6", "1d4"]
+
+
+def test_exact_distribution() -> None:
+    dist = dice_distribution("3d6")
+    assert sum(dist.values()) == 1
+    assert dist[3] == Fraction(1, 216)
+    assert dist[10] == Fraction(27, 216)
+    assert expected_value("3d6") == Fraction(21, 2)
+
+    gated = dice_distribution("25% 1d4")
+    assert gated[0] == Fraction(3, 4)
+    assert gated[4] == Fraction(1, 16)
+    assert expected_value("25% 1d4") == Fraction(5, 8)
+
+    assert dice_range("4d6x10") == (40, 240)
+    assert dice_range("2d4-1") == (1, 7)
+    for text in ("2d6+1d4", "(1d6+1)x10", "10% 1d4*1000"):
+        dist = dice_distribution(text)
+        assert sum(p * v for v, p in dist.items()) == expected_value(text)
+
+
+def test_samplers() -> None:
+    rng = np.random.default_rng(7)
+    for text in ("3d6", "d%", "50% 5d6", "1d4x1000", "1d8+1", "100d6"):
+        compiled = compile_dice(text)
+        lo, hi = dice_range(text)
+        rolls = compiled.sample(200_000, rng)
+        assert rolls.shape == (200_000,)
+        assert rolls.min() >= lo and rolls.max() <= hi
+        mean = float(expected_value(text))
+        assert abs(rolls.mean() - mean) < 0.02 * max(mean, 1)
+
+        scalar = random.Random(7)
+        assert all(lo <= compiled.roll(scalar) <= hi for _ in range(200))
+
+    a = compile_dice("2d6").sample(1000, np.random.default_rng(1))
+    b = compile_dice("2d6").sample(1000, np.random.default_rng(1))
+    assert (a == b).all()
+
+
+def test_generated_data_dice_parse() -> None:
+    monsters = json.loads(Path("data/monsters.json").read_text(encoding="utf-8"))
+    found = 0
+    for monster in monsters:
+        block = monster.get("stat_block", {})
+        for field in ("no_appearing", "damage"):
+            for text in find_dice(str(block.get(field, ""))):
+                parse_dice(text)
+                found += 1
+    assert found > 300
+
+
+def main() -> int:
+    tests = [
+        ("parse", test_parse),
+        ("find_dice", test_find_dice),
+        ("exact_distribution", test_exact_distribution),
+        ("samplers", test_samplers),
+        ("generated_data_dice_parse", test_generated_data_dice_parse),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
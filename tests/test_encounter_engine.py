@@ -0,0 +1,98 @@
+"""Batch encounter generator tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.encounters import EncounterGenerator, column_key, parse_no_appearing, table_key
+
+
+def test_keys_and_no_appearing() -> None:
+    assert column_key("Level 4-5") == ["dungeon level 4", "dungeon level 5"]
+    assert column_key("Level 8+")[-1] == "dungeon level 8"
+    assert column_key("Woods or Forest") == ["woods or forest", "woods", "forest"]
+    assert table_key(12) == "dungeon level 8"
+    assert table_key("Level 2") == "dungeon level 2"
+
+    assert parse_no_appearing("1d6, Wild 2d4, Lair 2d4") == {"dungeon": "1d6", "wild": "2d4", "lair": "2d4"}
+    assert parse_no_appearing("2d6, Lair 4d6 | 3d6, Lair 4d8", variant=1) == {"dungeon": "3d6", "wild": None, "lair": "4d8"}
+    assert parse_no_appearing("Wild 1d12 | Wild 1d8 | Wild 1", variant=2)["wild"] == "1"
+    assert parse_no_appearing("domestic only") == {"dungeon": None, "wild": None, "lair": None}
+
+
+def test_cell_resolution() -> None:
+    gen = EncounterGenerator("data")
+    by_name = {e.name: e for e in gen.entries}
+
+    assert by_name["Jelly, Green"].starred
+    assert by_name["NPC Party: Bandit"].npc_party == "Bandit"
+    assert by_name["Wolf, Dire"].monster_id == "wolf_and_wolf_dire" and by_name["Wolf, Dire"].variant == 1
+    assert by_name["Alicorn"].monster_id == "unicorn_and_alicorn" and by_name["Alicorn"].variant == 1
+    assert by_name["Hawk, Giant"].match == "head" and by_name["Hawk, Giant"].variant == 1
+    assert by_name["Roc, Large"].variant == 0 and by_name["Roc, Giant"].variant == 2
+    assert set(gen.unresolved()) <= {"Camel", "Snake, Cobra", "Snake, Giant Python"}
+
+    # Every die result of every column maps to an entry.
+    for table in gen.tables.values():
+        lo = 2 if table.die.text == "2d8" else 1
+        assert (table.lookup[lo:] >= 0).all(), table.key
+
+
+def test_generate_arrays() -> None:
+    gen = EncounterGenerator("data")
+    n = 100_000
+    out = gen.generate_arrays(1, n, seed=4)
+    assert out["roll"].min() >= 1 and out["roll"].max() <= 12
+    assert (out["entry"] >= 0).all()
+    assert (out["number"] >= 1).all()
+
+    # Roll 1 on dungeon level 1 is a giant bee: no_appearing 1d6 in the dungeon.
+    bees = out["number"][out["roll"] == 1]
+    assert bees.min() >= 1 and bees.max() <= 6 and abs(bees.mean() - 3.5) < 0.1
+
+    rocs = gen.generate_arrays("mountains", 50_000, seed=1)
+    names = {gen.entries[i].name for i in np.unique(rocs["entry"])}
+    assert {"Roc, Large", "Roc, Huge", "Roc, Giant"} <= names
+    assert "Roc" not in names
+
+    a = gen.generate_arrays("swamp", 1000, seed=8)
+    b = gen.generate_arrays("swamp", 1000, seed=8)
+    assert all((a[k] == b[k]).all() for k in a)
+
+
+def test_streaming() -> None:
+    gen = EncounterGenerator("data")
+    encounters = list(gen.iter_encounters("grassland", 10, seed=2, batch_size=3))
+    assert len(encounters) == 10
+    assert all(2 <= e["roll"] <= 16 and e["name"] for e in encounters)
+
+    endless = gen.iter_encounters(3, seed=2)
+    assert len([next(endless) for _ in range(5000)]) == 5000
+
+
+def main() -> int:
+    tests = [
+        ("keys_and_no_appearing", test_keys_and_no_appearing),
+        ("cell_resolution", test_cell_resolution),
+        ("generate_arrays", test_generate_arrays),
+        ("streaming", test_streaming),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""Encumbrance and movement calculator tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.encumbrance import (
+    HEAVY,
+    LEATHER,
+    LIGHT,
+    METAL,
+    OVERLOADED,
+    UNARMORED,
+    armor_kind,
+    encumbrance,
+    inventory_cost,
+    inventory_load,
+    item_code,
+    load_item_catalog,
+    load_limits,
+)
+
+
+def test_catalog() -> None:
+    catalog = load_item_catalog("data")
+    sword = item_code(catalog, "Longsword")
+    assert catalog.names[sword] == "Longsword/Scimitar" and item_code(catalog, "scimitar") == sword
+    assert catalog.price_cp[sword] == 1000 and catalog.weight_lb[sword] == 4.0
+    assert catalog.weight_lb[item_code(catalog, "Torches, 6")] == 1.0
+    assert catalog.price_cp[item_code(catalog, "Chain Mail")] == 6000
+    assert (catalog.price_cp >= -1).all() and (catalog.weight_lb >= 0).all()
+
+    assert armor_kind("No Armor") == UNARMORED and armor_kind("Leather Armor") == LEATHER
+    assert armor_kind(["Plate Mail", "Chain Mail"]).tolist() == [METAL, METAL]
+    try:
+        item_code(catalog, "Bag of Holding")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown item accepted")
+
+
+def test_inventory_load() -> None:
+    catalog = load_item_catalog("data")
+    owners = [0, 0, 1, 1, 1]
+    items = ["Chain Mail", "Longsword", "Leather Armor", "Dagger", "Rations, Dry, one week"]
+    load = inventory_load(catalog, owners=owners, items=items, quantities=[1, 1, 1, 2, 1], n=3)
+    assert load.tolist() == [44.0, 31.0, 0.0]
+
+    counts = np.zeros((3, len(catalog.names)))
+    for owner, item, quantity in zip(owners, items, [1, 1, 1, 2, 1]):
+        counts[owner, item_code(catalog, item)] += quantity
+    assert inventory_load(catalog, counts=counts).tolist() == load.tolist()
+    assert inventory_cost(catalog, counts).tolist() == [7000, 2000 + 400 + 1000, 0]
+
+
+def test_encumbrance() -> None:
+    light, heavy = load_limits([3, 10, 18], [False, False, True])
+    assert light.tolist() == [25, 60, 65] and heavy.tolist() == [60, 150, 130]
+
+    result = encumbrance([10, 70, 100, 200], [10, 10, 3, 18], ["No Armor", "Chain Mail", "Leather Armor", "Plate Mail"])
+    assert result["status"].tolist() == [LIGHT, HEAVY, OVERLOADED, OVERLOADED]
+    assert result["movement"].tolist() == [40, 10, 0, 0]
+    assert encumbrance(45, 10, LEATHER, small=True)["movement"].tolist() == [30]
+    assert encumbrance(55, 10, LEATHER, small=True)["movement"].tolist() == [20]
+
+    rng = np.random.default_rng(0)
+    n = 10_000
+    load = rng.uniform(0, 250, size=n)
+    strength = rng.integers(3, 19, size=n)
+    batch = encumbrance(load, strength, rng.integers(0, 3, size=n))
+    assert ((batch["status"] == LIGHT) == (load <= batch["light_limit"])).all()
+    assert ((batch["movement"] == 0) == (batch["status"] == OVERLOADED)).all()
+
+
+def main() -> int:
+    tests = [
+        ("catalog", test_catalog),
+        ("inventory_load", test_inventory_load),
+        ("encumbrance", test_encumbrance),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""Local HTTP read API tests (precomputed responses, ETags, gzip)."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, "src")
+
+from api.http_server import accepts_gzip, build_routes, canonical_path, create_server
+
+
+def _request(base: str, path: str, headers: dict[str, str] | None = None):
+    req = urllib.request.Request(base + path, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_routes_precomputed() -> None:
+    routes = build_routes("data")
+    assert "/datasets" in routes
+    assert "/data/monsters" in routes
+    assert "/monsters/basilisk" in routes
+    assert "/spells/cure light wounds" in routes
+    assert "/tables/dungeon encounters 1" in routes
+    assert "/tables/lair treasures" in routes
+    assert routes["/data/monsters"].gzip_body is not None
+
+
+def test_canonical_path() -> None:
+    assert canonical_path("/monsters/Bear,%20Cave") == "/monsters/bear cave"
+    assert canonical_path("/spells/Cure_Light_Wounds/") == "/spells/cure light wounds"
+    assert canonical_path("/data/spells?x=1") == "/data/spells"
+
+
+def test_accepts_gzip() -> None:
+    assert accepts_gzip("gzip") and accepts_gzip("deflate, gzip;q=0.5") and accepts_gzip("*")
+    assert accepts_gzip("GZIP ; Q=1") and accepts_gzip("br, *;q=0.1")
+    assert not accepts_gzip("") and not accepts_gzip("identity") and not accepts_gzip("br")
+    assert not accepts_gzip("gzip;q=0") and not accepts_gzip("identity, gzip;q=0")
+    assert not accepts_gzip("*;q=0") and not accepts_gzip("gzip;q=0, *") and not accepts_gzip("gzip;q=0.0")
+
+
+def test_server_etag_and_gzip() -> None:
+    server = create_server("data", "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        status, headers, body = _request(base, "/monsters/Basilisk")
+        assert status == 200
+        assert json.loads(body)["name"] == "Basilisk"
+        etag = headers["ETag"]
+
+        status, _, body = _request(base, "/monsters/basilisk", {"If-None-Match": etag})
+        assert status == 304
+        assert body == b""
+
+        status, headers, body = _request(base, "/data/spells", {"Accept-Encoding": "gzip"})
+        assert status == 200
+        assert headers["Content-Encoding"] == "gzip"
+        assert len(json.loads(gzip.decompress(body))) >= 90
+
+        status, _, _ = _request(base, "/data/spells", {"If-None-Match": headers["ETag"]})
+        assert status == 304
+
+        status, headers, body = _request(base, "/data/spells", {"Accept-Encoding": "identity, gzip;q=0"})
+        assert status == 200 and "Content-Encoding" not in headers
+        assert not headers["ETag"].endswith('-gzip"')
+        assert len(json.loads(body)) >= 90
+
+        status, _, body = _request(base, "/monsters/no-such-monster")
+        assert status == 404
+        assert json.loads(body)["error"] == "not found"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> int:
+    tests = [
+        ("routes_precomputed", test_routes_precomputed),
+        ("canonical_path", test_canonical_path),
+        ("accepts_gzip", test_accepts_gzip),
+        ("server_etag_and_gzip", test_server_etag_and_gzip),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
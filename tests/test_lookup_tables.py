@@ -0,0 +1,96 @@
+"""Dense attack bonus and saving throw lookup tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from data_store import load_dataset
+from engines.lookup_tables import (
+    CLASS_KEYS,
+    MAX_LEVEL,
+    SAVE_KEYS,
+    class_attack_bonus,
+    class_index,
+    load_rules_arrays,
+    monster_attack_bonus,
+    saving_throw,
+)
+
+
+def test_scalar_lookups() -> None:
+    rules = load_rules_arrays("data")
+    assert rules.attack_bonus.shape == (len(CLASS_KEYS), MAX_LEVEL + 1)
+    assert rules.saving_throws.shape == (len(CLASS_KEYS), MAX_LEVEL + 1, len(SAVE_KEYS))
+
+    assert class_attack_bonus(rules, "fighter", 7) == 5
+    assert class_attack_bonus(rules, "fighter", 1) == 1
+    assert class_attack_bonus(rules, "magic_user", 3) == 1
+    assert class_attack_bonus(rules, "thief", 0) == 0
+    assert class_attack_bonus(rules, "fighter", 40) == class_attack_bonus(rules, "fighter", MAX_LEVEL)
+
+    assert monster_attack_bonus(rules, 0) == 0
+    assert monster_attack_bonus(rules, 9) == 8
+    assert monster_attack_bonus(rules, 50) == 16
+
+    assert saving_throw(rules, "thief", 9, "dragon_breath") == 12
+    assert saving_throw(rules, "cleric", 1).tolist() == [11, 12, 14, 16, 15]
+
+    try:
+        saving_throw(rules, "fighter", 1, "poison")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown save accepted")
+
+
+def test_matches_source_rows() -> None:
+    rules = load_rules_arrays("data")
+    for class_key, rows in load_dataset("saving_throws", "data").items():
+        for row in rows:
+            level = row["level"][0] if isinstance(row["level"], list) else row["level"]
+            level = 0 if level == "NM" else int(level)
+            expected = [int(row[save]) for save in SAVE_KEYS]
+            assert saving_throw(rules, class_key, level).tolist() == expected, (class_key, level)
+
+
+def test_vectorized_lookups() -> None:
+    rules = load_rules_arrays("data")
+    rng = np.random.default_rng(0)
+    classes = rng.choice(CLASS_KEYS, size=500)
+    levels = rng.integers(-2, 25, size=500)
+
+    bonuses = class_attack_bonus(rules, classes, levels)
+    assert bonuses.shape == (500,)
+    assert bonuses.tolist() == [class_attack_bonus(rules, str(c), int(l)) for c, l in zip(classes, levels)]
+
+    codes = class_index(classes)
+    assert np.array_equal(saving_throw(rules, codes, levels, "spells"), saving_throw(rules, classes, levels, "spells"))
+    assert saving_throw(rules, codes, levels).shape == (500, len(SAVE_KEYS))
+    assert monster_attack_bonus(rules, np.arange(40)).tolist()[:3] == [0, 1, 2]
+
+
+def main() -> int:
+    tests = [
+        ("scalar_lookups", test_scalar_lookups),
+        ("matches_source_rows", test_matches_source_rows),
+        ("vectorized_lookups", test_vectorized_lookups),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""Alias-method magic item generation tests."""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from data_store import load_dataset
+from engines.magic_items import (
+    MagicItemGenerator,
+    alias_sample,
+    build_alias_table,
+    compile_subtable,
+    roll_values,
+)
+
+
+def test_alias_table() -> None:
+    table = build_alias_table(["a", "b", "c"], [1, 2, 7])
+    draws = alias_sample(table, 200_000, np.random.default_rng(5))
+    freq = np.bincount(draws, minlength=3) / len(draws)
+    assert np.allclose(freq, [0.1, 0.2, 0.7], atol=0.005)
+
+    assert roll_values([3, 4]) == [3, 4]
+    assert roll_values("09") == [9]
+    assert roll_values("00") == [100]
+    assert roll_values("") == []
+
+    rows = [[[1, 2, 3], "x"], ["4", "y"], ["", "ignored"]]
+    assert compile_subtable(rows, 0, 1).outcomes == ("x", "y")
+
+
+def test_compiled_tables_cover_die() -> None:
+    gen = MagicItemGenerator("data")
+    assert len(gen.by_category["any"].outcomes) == 7
+    assert set(gen.by_category["weapon_or_armor"].outcomes) == {"Weapon", "Armor"}
+    assert "Weapon" not in gen.by_category["any_except_weapons"].outcomes
+    assert len(gen.potions.outcomes) == 27
+    assert len(gen.special_enemy.outcomes) == 6
+    assert set(gen.misc_forms) == set("ABCDEFGH")
+    assert "Roll Again + Special Ability" not in gen.melee_reroll.outcomes
+
+    # d% columns cover 1-100 each, or together when one die is split side by side (Potions).
+    for table in load_dataset("magic_item_tables", "data"):
+        columns = [
+            sorted(v for row in table["rows"] if col < len(row) for v in roll_values(row[col]))
+            for col, header in enumerate(table["headers"])
+            if header == "d%"
+        ]
+        if columns:
+            together = sorted(v for covered in columns for v in covered)
+            assert all(c == list(range(1, 101)) for c in columns) or together == list(range(1, 101)), table["section"]
+
+
+def test_generation_chain() -> None:
+    gen = MagicItemGenerator("data")
+    items = gen.generate(20_000, "any", seed=3)
+    assert len(items) == 20_000
+    types = Counter(item["type"] for item in items)
+    assert abs(types["Weapon"] / 20_000 - 0.25) < 0.02
+    assert abs(types["Rare Items"] / 20_000 - 0.03) < 0.01
+
+    for item in items:
+        details = item["details"]
+        if item["type"] == "Weapon":
+            assert "Special Enemy" not in item["name"]
+            assert "Roll Again" not in details["bonus"]
+            if "Arrow" in details["weapon"]:
+                assert details["bonus"] not in {"+4", "+5"}
+        elif item["type"] == "Potion":
+            assert item["magic_item"] == item["name"].removeprefix("Potion of ")
+        elif item["type"] == "Wand, Staff, or Rod":
+            assert item["magic_item"] == item["name"]
+        elif item["type"] == "Miscellaneous Items":
+            assert item["magic_item"] is not None
+            assert item["name"].startswith(details["form"])
+        elif item["type"] == "Scroll" and "Spell Scroll" in item["name"]:
+            assert item["magic_item"] == "Spell Scrolls"
+            assert details["spell_levels"]
+
+    assert any(item["name"].startswith(("Bowl of", "Stone of", "Rod of Summoning")) for item in items)
+    assert gen.generate(50, seed=9) == gen.generate(50, seed=9)
+    assert {i["type"] for i in gen.generate(500, "weapon_or_armor", seed=1)} == {"Weapon", "Armor"}
+
+
+def test_missile_weapons() -> None:
+    gen = MagicItemGenerator("data")
+    bows = [
+        item["details"]
+        for item in gen.generate(40_000, "weapon_or_armor", seed=11)
+        if item["type"] == "Weapon" and item["details"]["weapon"] in {"Shortbow", "Longbow"}
+    ]
+    assert len(bows) > 1000
+    assert not any("special_ability" in details for details in bows)
+    missile = {str(o).rstrip("*") for o in gen.missile_bonus.outcomes}
+    assert {details["bonus"] for details in bows} <= missile
+    plus_one = sum(details["bonus"] == "+1" for details in bows) / len(bows)
+    assert abs(plus_one - 0.46) < 0.03  # Missile column; Melee gives +1 on 40%
+
+
+def test_generate_counts() -> None:
+    gen = MagicItemGenerator("data")
+    out = gen.generate_counts({"magic_potion": 3, "magic_scroll": 2, "magic_any": 4}, seed=2)
+    assert [len(out[k]) for k in ("potion", "scroll", "any")] == [3, 2, 4]
+    assert all(item["type"] == "Potion" for item in out["potion"])
+
+    summary = gen.benchmark(2000, seed=0)
+    assert summary["items"] == 2000
+    assert summary["items_per_second"] > 0
+
+
+def main() -> int:
+    tests = [
+        ("alias_table", test_alias_table),
+        ("compiled_tables_cover_die", test_compiled_tables_cover_die),
+        ("generation_chain", test_generation_chain),
+        ("missile_weapons", test_missile_weapons),
+        ("generate_counts", test_generate_counts),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""Monster ID, alias and cross-reference resolution tests."""
+
+from __future__ import annotations
+
+import sys
+
+sys.path.insert(0, "src")
+
+from parsers.monster_index import (
+    build_monster_index,
+    load_monster_lookup,
+    lookup_monster,
+    monster_aliases,
+    strip_page_reference,
+)
+
+
+def test_aliases() -> None:
+    aliases = {alias for alias, _ in monster_aliases("Bear, Grizzly (or Brown)")}
+    assert {"bear grizzly or brown", "bear grizzly", "bear brown", "grizzly bear"} <= aliases
+
+    aliases = {alias for alias, _ in monster_aliases("Ant, Giant (and Huge, Large)")}
+    assert {"ant giant", "ant huge", "ant large", "giant ant"} <= aliases
+
+    aliases = {alias for alias, _ in monster_aliases("Cattle (including Aurochs and Bison)")}
+    assert {"cattle", "aurochs", "bison"} <= aliases
+
+
+def test_strip_page_reference() -> None:
+    assert strip_page_reference("Cattle (including Aurochs and Bison) on page 101") == "Cattle (including Aurochs and Bison)"
+    assert strip_page_reference("Ghoul  and Ghast") == "Ghoul and Ghast"
+
+
+def test_cross_reference_resolution() -> None:
+    monsters = [
+        {"name": "Aurochs", "cross_reference_only": True, "cross_reference": "Cattle on page 12"},
+        {"name": "Cattle (including Aurochs and Bison)", "armor_class": "13"},
+        {"name": "Wild Ox", "cross_reference_only": True, "cross_reference": "Aurochs on page 3"},
+        {"name": "Nothing", "cross_reference_only": True, "cross_reference": "No Such Beast"},
+    ]
+    index = build_monster_index(monsters)
+    cattle = "cattle_including_aurochs_and_bison"
+
+    assert monsters[0]["id"] == "aurochs"
+    assert monsters[0]["cross_reference_id"] == cattle
+    # The exact-name claim beats Cattle's parenthetical, but the alias still follows the redirect.
+    assert index["aliases"]["aurochs"] == cattle
+    assert index["aliases"]["wild ox"] == cattle
+    assert index["unresolved"] == ["nothing"]
+
+
+def test_generated_lookup() -> None:
+    lookup = load_monster_lookup("data")
+    assert lookup_monster(lookup, "Aurochs")["id"] == "cattle_including_aurochs_and_bison"
+    assert lookup_monster(lookup, "ghast")["id"] == "ghoul_and_ghast"
+    assert lookup_monster(lookup, "Black Pudding")["id"] == "jelly_black_black_pudding"
+    assert lookup_monster(lookup, "cave bear")["id"] == "bear_cave"
+    assert lookup_monster(lookup, "no such monster") is None
+    assert not any(m.get("cross_reference_only") for m in lookup.values() if m.get("cross_reference_id"))
+
+
+def main() -> int:
+    tests = [
+        ("aliases", test_aliases),
+        ("strip_page_reference", test_strip_page_reference),
+        ("cross_reference_resolution", test_cross_reference_resolution),
+        ("generated_lookup", test_generated_lookup),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,7 +10,7 @@ from tempfile import TemporaryDirectory
 sys.path.insert(0, "src")
 
 from parsers.data_validation import normalize_data_files
-from parsers.output_cleanup import cleanup_payload
+from parsers.output_cleanup import cleanup_payload, parse_price_cp, parse_weight_lb
 
 
 def test_weapon_category_propagation() -> None:
@@ -47,6 +47,26 @@ def test_range_and_comma_numeric_normalization() -> None:
     assert cleaned["threshold"] == "8+"
 
 
+def test_price_and_weight_normalization() -> None:
+    assert parse_price_cp("4 gp") == 400
+    assert parse_price_cp("15 sp") == 150
+    assert parse_price_cp("n/a") is None
+    assert parse_price_cp("") is None
+    assert parse_price_cp(1500, unit="gp") == 150000
+    assert parse_price_cp("8 / 75", unit="gp") is None
+
+    assert parse_weight_lb("5") == 5.0
+    assert parse_weight_lb("½") == 0.5
+    assert parse_weight_lb("*") == 0.1 and parse_weight_lb("**") == 0.0
+    assert parse_weight_lb("2,000 lbs") == 2000.0
+    assert parse_weight_lb("½ ton") == 1000.0
+    assert parse_weight_lb("") is None
+
+    vehicles = cleanup_payload("vehicles", [{"vehicle": "Coach", "weight": 1000, "cargo": "2,000 lbs", "cost_gp": 1500}])
+    assert vehicles[0]["price_cp"] == 150000
+    assert vehicles[0]["weight_lb"] == 1000.0 and vehicles[0]["cargo_lb"] == 2000.0
+
+
 def test_normalize_data_files_integration() -> None:
     with TemporaryDirectory() as td:
         root = Path(td)
@@ -82,6 +102,8 @@ def test_normalize_data_files_integration() -> None:
                 "weight": "3",
                 "dmg": "1d6",
                 "category": "Swords",
+                "price_cp": 600,
+                "weight_lb": 3.0,
             }
         ]
         assert class_tables["fighter"][0]["level"] == [1, 2]
@@ -92,6 +114,7 @@ def main() -> int:
     tests = [
         ("weapon_category_propagation", test_weapon_category_propagation),
         ("range_and_comma_numeric_normalization", test_range_and_comma_numeric_normalization),
+        ("price_and_weight_normalization", test_price_and_weight_normalization),
         ("normalize_data_files_integration", test_normalize_data_files_integration),
     ]
     failed = 0
@@ -0,0 +1,71 @@
+"""Performance regression gate tests."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from perf_gate import compare_metrics, format_report, load_baselines, measure, save_baseline
+
+
+def test_compare_metrics() -> None:
+    baseline = {"phase2_seconds": 1.0, "build_seconds": 10.0, "peak_rss_mb": 100.0, "output_bytes": 1000}
+    current = {"phase2_seconds": 2.0, "build_seconds": 12.0, "peak_rss_mb": 120.0, "output_bytes": 1000}
+    rows = {r["metric"]: r for r in compare_metrics(baseline, current)}
+    assert list(rows) == ["build_seconds", "peak_rss_mb", "output_bytes", "phase2_seconds"]
+    assert not rows["build_seconds"]["regressed"] and abs(rows["build_seconds"]["change"] - 0.2) < 1e-9
+    assert rows["peak_rss_mb"]["regressed"] and not rows["output_bytes"]["regressed"]
+    # Phase timings are reported but never fail the gate.
+    assert rows["phase2_seconds"]["over"] and not rows["phase2_seconds"]["regressed"]
+
+    relaxed = compare_metrics(baseline, current, {"memory": 0.5})
+    assert not any(r["regressed"] for r in relaxed)
+
+    report = format_report(list(rows.values()))
+    assert "peak_rss_mb" in report and "REGRESSED" in report and "+20.0%" in report and "over" in report
+
+
+def test_baselines_and_measure() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "baseline.json")
+        assert load_baselines(path) == {}
+        metrics = measure("manual/missing.html", "data", phases=[7], repeat=1)
+        assert set(metrics) == {"phase7_seconds", "build_seconds", "peak_rss_mb", "output_bytes"}
+        assert metrics["peak_rss_mb"] > 0 and metrics["output_bytes"] > 0
+
+        save_baseline("synthetic-x1-phases-7", metrics, path)
+        stored = load_baselines(path)["synthetic-x1-phases-7"]
+        assert stored["metrics"] == metrics and stored["machine"]["python"]
+        assert not any(r["regressed"] for r in compare_metrics(stored["metrics"], metrics))
+
+        try:
+            measure("manual/missing.html", "data", phases=[2], repeat=1)
+        except RuntimeError as e:
+            assert "missing.html" in str(e)
+        else:
+            raise AssertionError("build without a manual passed")
+
+
+def main() -> int:
+    tests = [
+        ("compare_metrics", test_compare_metrics),
+        ("baselines_and_measure", test_baselines_and_measure),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
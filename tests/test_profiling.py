@@ -0,0 +1,100 @@
+"""Build profiler tests."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+import extract_text
+import parsers.rules_tables as rules_tables
+from build import run_build
+from profiling import Profiler
+
+
+def test_spans() -> None:
+    profiler = Profiler()
+    profiler.start()
+    try:
+        with profiler.span("outer", "phase"):
+            with profiler.span("inner", size=3):
+                block = bytearray(4 * 2**20)
+                del block
+            sum(range(10_000))
+    finally:
+        profiler.stop()
+
+    spans = {s.name: s for s in profiler.spans}
+    assert spans["inner"].depth == 1 and spans["outer"].depth == 0 and spans["inner"].args == {"size": 3}
+    assert spans["inner"].peak_bytes >= 4 * 2**20 and spans["outer"].peak_bytes >= spans["inner"].peak_bytes
+    assert spans["outer"].wall_ns >= spans["inner"].wall_ns and spans["outer"].cpu_ns > 0
+
+    trace = profiler.chrome_trace()["traceEvents"]
+    assert [e["name"] for e in trace] == ["outer", "inner"] and all(e["ph"] == "X" for e in trace)
+    assert "peak_bytes" in trace[1]["args"]
+
+
+def test_instrument() -> None:
+    original = extract_text.table_to_rows
+    profiler = Profiler(memory=False)
+    labels = {"table_to_rows": lambda table: table.name}
+    with profiler.instrument({"table_to_rows": original}, labels):
+        assert rules_tables.table_to_rows is not original and extract_text.table_to_rows is not original
+        soup = extract_text.BeautifulSoup("<table><tr><td>a</td></tr></table>", "lxml")
+        assert rules_tables.table_to_rows(soup.table) == [["a"]]
+        assert extract_text.table_to_rows(soup.table) == [["a"]]
+    assert rules_tables.table_to_rows is original and extract_text.table_to_rows is original
+
+    summary = profiler.summary()
+    assert summary[0]["name"] == "table_to_rows[table]" and summary[0]["calls"] == 2
+    assert "table_to_rows[table]" in profiler.format_summary()
+
+
+def test_profiled_build() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = str(Path(tmp) / "data")
+        shutil.copytree("data", data_dir)
+        profiler = Profiler()
+        results = run_build(data_dir, phases=[7], profiler=profiler)
+        assert results[7]["status"] == "pass"
+
+        names = {row["name"]: row for row in profiler.summary()}
+        assert names["phase7:data_validation"]["calls"] == 1
+        assert names["run_validation"]["calls"] == 1 and names["cleanup_payload[weapons]"]["calls"] == 1
+        trace_path, summary_path = profiler.write(str(Path(tmp) / "profile"))
+        assert json.loads(trace_path.read_text())["traceEvents"] and "run_validation" in summary_path.read_text()
+
+        for phases, error in (([9], ValueError), ([2], FileNotFoundError)):
+            try:
+                run_build(data_dir, html_path=str(Path(tmp) / "missing.html"), phases=phases)
+            except error:
+                pass
+            else:
+                raise AssertionError(f"phases {phases} accepted")
+
+
+def main() -> int:
+    tests = [
+        ("spans", test_spans),
+        ("instrument", test_instrument),
+        ("profiled_build", test_profiled_build),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
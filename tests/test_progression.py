@@ -0,0 +1,97 @@
+"""XP-to-level index and batch level-up tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.progression import apply_xp, level_for_xp, load_progression, xp_for_level
+
+
+def test_level_index() -> None:
+    tables = load_progression("data")
+    assert set(tables) == {"cleric", "fighter", "magic_user"}
+    fighter = tables["fighter"]
+    assert fighter.max_level == 20 and fighter.thresholds[0] == 0
+
+    assert level_for_xp(fighter, 0) == 1
+    assert level_for_xp(fighter, 1999) == 1
+    assert level_for_xp(fighter, 2000) == 2
+    assert level_for_xp(fighter, 10**9) == 20
+    assert level_for_xp(fighter, -5) == 1
+    assert xp_for_level(fighter, 2) == 2000
+    assert xp_for_level(fighter, 99) == xp_for_level(fighter, 20)
+
+    xp = np.array([0, 1999, 2000, 4000, 10**9])
+    assert level_for_xp(fighter, xp).tolist() == [1, 1, 2, 3, 20]
+    # Scalar and vector paths agree everywhere.
+    samples = np.random.default_rng(0).integers(0, 2_000_000, size=2000)
+    assert level_for_xp(fighter, samples).tolist() == [level_for_xp(fighter, int(x)) for x in samples]
+
+    assert tables["cleric"].spell_slots[1].sum() == 0
+    assert tables["cleric"].spell_slots[2, 0] == 1
+    assert tables["magic_user"].spell_slots[20].tolist() == [6, 5, 5, 4, 4, 3]
+
+
+def test_apply_xp() -> None:
+    tables = load_progression("data")
+    result = apply_xp(tables, ["cleric", "fighter", "magic_user"], [1400, 0, 0], [200, 5000, 2500])
+    assert result["xp"].tolist() == [1600, 5000, 2500]
+    assert result["level"].tolist() == [2, 3, 2]
+    assert result["levels_gained"].tolist() == [1, 2, 1]
+    assert result["spell_slots"].shape == (3, 6)
+    assert result["spell_slots"][1].sum() == 0
+
+    bonus = apply_xp(tables, "fighter", 0, 1820, bonus_percent=10)
+    assert bonus["xp"].tolist() == [2002] and bonus["level"].tolist() == [2]
+
+    capped = apply_xp(tables, ["fighter"], [0], [100_000], max_levels_gained=1)
+    assert capped["level"].tolist() == [2] and capped["xp"].tolist() == [3999]
+
+    try:
+        apply_xp(tables, ["thief"], [0], [100])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("class without a table accepted")
+
+
+def test_batch_matches_scalar() -> None:
+    tables = load_progression("data")
+    rng = np.random.default_rng(1)
+    n = 5000
+    classes = rng.choice(["cleric", "fighter", "magic_user"], size=n)
+    xp = rng.integers(0, 500_000, size=n)
+    awards = rng.integers(0, 50_000, size=n)
+    result = apply_xp(tables, classes, xp, awards)
+    for i in range(0, n, 97):
+        table = tables[str(classes[i])]
+        assert result["level"][i] == level_for_xp(table, int(xp[i] + awards[i]))
+        assert result["previous_level"][i] == level_for_xp(table, int(xp[i]))
+        assert (result["spell_slots"][i] == table.spell_slots[result["level"][i]]).all()
+
+
+def main() -> int:
+    tests = [
+        ("level_index", test_level_index),
+        ("apply_xp", test_apply_xp),
+        ("batch_matches_scalar", test_batch_matches_scalar),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Query result cache tests (LRU, manifest invalidation, persistence)."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, "src")
+
+from api.query_cache import QueryCache, normalize_query
+from data_store import write_manifest
+
+
+def _write(root: Path, name: str, payload: object) -> None:
+    (root / name).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_normalize_query() -> None:
+    a = normalize_query({"table": "Dungeon Encounters #1", "level": 3})
+    b = normalize_query({"level": 3, "table": "Dungeon Encounters #1"})
+    assert a == b
+    assert normalize_query(("x", ["Y"])) == ["x", ["Y"]]
+    # Values are not case- or space-folded: these may have different results.
+    assert normalize_query({"name": "Orc"}) != normalize_query({"name": "orc"})
+    assert normalize_query(["a  b"]) != normalize_query(["a b"])
+
+
+def test_lru_and_metrics() -> None:
+    with TemporaryDirectory() as td:
+        root = Path(td)
+        _write(root, "monsters.json", [{"name": "Orc"}])
+        write_manifest(td)
+
+        cache = QueryCache(td, max_entries=2)
+        calls = []
+        for q in ["a", "b", "a", "c", "b"]:
+            cache.get_or_compute({"q": q}, ["monsters"], lambda q=q: calls.append(q) or q.upper())
+
+        # "b" was least recently used when "c" arrived, so it was recomputed.
+        assert calls == ["a", "b", "c", "b"]
+        m = cache.metrics()
+        assert m["hits"] == 1
+        assert m["misses"] == 4
+        assert m["evictions"] == 2
+        assert len(cache) == 2
+
+
+def test_manifest_invalidation_and_persistence() -> None:
+    with TemporaryDirectory() as td:
+        root = Path(td)
+        _write(root, "monsters.json", [{"name": "Orc"}])
+        _write(root, "spells.json", [{"name": "Light"}])
+        write_manifest(td)
+        store = str(root / "cache" / "queries.json")
+
+        cache = QueryCache(td, persist_path=store)
+        cache.put("monster orc", ["monsters"], {"name": "Orc"})
+        cache.put("spell light", ["spells.json"], {"name": "Light"})
+        cache.save()
+
+        reloaded = QueryCache(td, persist_path=store)
+        assert len(reloaded) == 2
+        assert reloaded.get("monster orc", ["monsters"]) == (True, {"name": "Orc"})
+
+        _write(root, "monsters.json", [{"name": "Orc", "hit_dice": "1"}])
+        write_manifest(td)
+        assert reloaded.refresh_manifest() == 1
+        assert reloaded.get("monster orc", ["monsters"])[0] is False
+        assert reloaded.get("spell light", ["spells"])[0] is True
+
+        # A fresh process loading the old file also drops the stale entry.
+        fresh = QueryCache(td, persist_path=store)
+        assert len(fresh) == 1
+        assert fresh.metrics()["invalidations"] == 1
+
+
+def main() -> int:
+    tests = [
+        ("normalize_query", test_normalize_query),
+        ("lru_and_metrics", test_lru_and_metrics),
+        ("manifest_invalidation_and_persistence", test_manifest_invalidation_and_persistence),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""Shared-session test runner tests."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+sys.path.insert(0, "tests")
+
+import extract_text
+from extract_text import load_html, shared_documents
+from run_tests import BUILD_TESTS, discover, run_module, run_session
+
+
+def test_shared_documents() -> None:
+    # run_tests.py calls this inside its own session; start from none.
+    outer, extract_text._shared = extract_text._shared, None
+    try:
+        _check_shared_documents()
+    finally:
+        extract_text._shared = outer
+
+
+def _check_shared_documents() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "doc.html")
+        Path(path).write_text("<html><body><p>x</p></body></html>", encoding="utf-8")
+        assert load_html(path) is not load_html(path)
+        with shared_documents() as cache:
+            soup = load_html(path)
+            assert load_html(path) is soup and len(cache) == 1
+            with shared_documents() as inner:
+                assert inner is cache and load_html(path) is soup
+            assert load_html(path) is soup
+        assert load_html(path) is not soup
+
+
+def test_discover_and_run() -> None:
+    names = discover()
+    assert "test_session_runner" in names and set(BUILD_TESTS) <= set(names)
+    assert discover(["dice", "test_combat"]) == ["test_combat", "test_dice"]
+    try:
+        discover(["no_such_module"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown module accepted")
+
+    result = run_module("test_lookup_tables")
+    assert result.status == "pass" and "[PASS]" in result.output
+
+    results = run_session(["test_lookup_tables", "test_progression", "test_turning_engine"], workers=2)
+    assert sorted(r.name for r in results) == ["test_lookup_tables", "test_progression", "test_turning_engine"]
+    assert all(r.status == "pass" for r in results)
+
+
+def main() -> int:
+    tests = [
+        ("shared_documents", test_shared_documents),
+        ("discover_and_run", test_discover_and_run),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+"""Spell index parsing and lookup tests."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from parsers.spell_index import (
+    build_spell_index,
+    duration_seconds_at,
+    find_spells,
+    get_spell,
+    parse_spell_duration,
+    parse_spell_range,
+    range_feet_at,
+)
+
+
+def test_range_parsing() -> None:
+    assert parse_spell_range("90'")["feet"] == 90
+    scaled = parse_spell_range("100'+10'/level")
+    assert scaled["feet"] == 100
+    assert scaled["per_level_feet"] == 10
+    assert range_feet_at(scaled, 5) == 150
+    assert parse_spell_range("280'+10'/ level")["per_level_feet"] == 10
+    assert parse_spell_range("5' per level")["feet"] == 0
+    assert parse_spell_range("10' radius")["radius"] is True
+    assert parse_spell_range("touch")["kind"] == "touch"
+    assert parse_spell_range("special")["feet"] is None
+
+
+def test_duration_parsing() -> None:
+    per_level = parse_spell_duration("1 round/level")
+    assert per_level["unit"] == "round"
+    assert per_level["base"] == 0
+    assert per_level["per_level"] == 1
+    assert duration_seconds_at(per_level, 6) == 60
+
+    stepped = parse_spell_duration("1 turn/4 levels")
+    assert stepped["levels_per_step"] == 4
+    assert duration_seconds_at(stepped, 8) == 1200
+
+    combined = parse_spell_duration("6 turns + 1/level")
+    assert combined["base"] == 6
+    assert combined["per_level"] == 1
+
+    dice = parse_spell_duration("level+1d4 rounds")
+    assert dice["dice"] == "1d4"
+    assert dice["per_level"] == 1
+
+    assert parse_spell_duration("2d8 turns")["dice"] == "2d8"
+    assert parse_spell_duration("instantaneous")["kind"] == "instantaneous"
+    assert duration_seconds_at(parse_spell_duration("permanent"), 5) is None
+
+
+def test_index_join() -> None:
+    spells = [
+        {
+            "name": "Haste*",
+            "name_clean": "Haste",
+            "reversible": True,
+            "range": "30'",
+            "duration": "1 round/level",
+            "class_levels": {"magic_user": 3},
+        },
+        {
+            "name": "Fly",
+            "name_clean": "Fly",
+            "reversible": False,
+            "range": "touch",
+            "duration": "1 turn/level",
+            "class_levels": {"magic_user": 3},
+        },
+        {
+            "name": "Read Magic",
+            "name_clean": "Read Magic",
+            "reversible": False,
+            "range": "0",
+            "duration": "permanent",
+            "class_levels": {"magic_user": 1},
+        },
+    ]
+    spell_list = {
+        "spell_levels": [
+            {"class": "magic_user", "level": 3, "name": "Haste*", "name_clean": "Haste"},
+            {"class": "magic_user", "level": 3, "name": "Fly", "name_clean": "Fly"},
+            {"class": "magic_user", "level": 3, "name": "Missing", "name_clean": "Missing"},
+        ]
+    }
+
+    index = build_spell_index(spells, spell_list)
+    assert index["unresolved"] == ["Missing"]
+    assert [e["spell_id"] for e in index["by_class_level"]["magic_user"]["3"]] == ["fly", "haste", None]
+    # Spells absent from the lists still land in their class/level bucket.
+    assert index["by_class_level"]["magic_user"]["1"][0]["spell_id"] == "read_magic"
+    assert get_spell(index, "haste*")["id"] == "haste"
+
+    ranged = find_spells(index, "magic_user", 3, min_range_feet=30, scales_per_level=True)
+    assert [s["id"] for s in ranged] == ["haste"]
+
+
+def test_generated_index_covers_spells() -> None:
+    data = Path("data")
+    spells = json.loads((data / "spells.json").read_text(encoding="utf-8"))
+    spell_list = json.loads((data / "spell_list.json").read_text(encoding="utf-8"))
+
+    index = build_spell_index(spells, spell_list)
+    assert len(index["spells"]) == len({s["name_clean"] for s in spells})
+    assert len(index["unresolved"]) <= 15
+    assert all(rec["range"]["kind"] for rec in index["spells"].values())
+
+
+def main() -> int:
+    tests = [
+        ("range_parsing", test_range_parsing),
+        ("duration_parsing", test_duration_parsing),
+        ("index_join", test_index_join),
+        ("generated_index_covers_spells", test_generated_index_covers_spells),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""Synthetic manual generator tests.
+
+Parses generated manuals with the real phase parsers: scale 1 must give
+back the records in data/, and scale 2 twice as many open-ended records.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from bs4 import BeautifulSoup
+
+from extract_text import iter_elements, load_elements, load_html, to_elements
+from parsers.data_validation import _clean_obj
+from parsers.monsters import parse_monsters
+from parsers.output_cleanup import cleanup_payload
+from parsers.rules_tables import parse_attack_bonus, parse_turning_undead, parse_weapons
+from parsers.spells import parse_spell_list, parse_spells
+from parsers.treasure import _collect_part7_blocks, parse_magic_items
+from synthetic_manual import render_manual, write_manual
+
+
+def _load(name: str):
+    return json.loads(Path("data", f"{name}.json").read_text(encoding="utf-8"))
+
+
+def _parse(scale: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "manual.html")
+        assert write_manual(path, scale) > 0
+        return load_elements(path), list(iter_elements(load_html(path)))
+
+
+def test_round_trip() -> None:
+    elements, tags = _parse(1)
+    assert elements == to_elements(BeautifulSoup(render_manual(scale=1), "lxml"))
+    assert parse_turning_undead(tags) == parse_turning_undead(elements)
+    assert parse_spells(tags) == parse_spells(elements)
+    assert 'style="column-count: 2' in render_manual(scale=1)[:5000]
+    for name, parsed in (
+        ("weapons", parse_weapons(elements)),
+        ("attack_bonus", parse_attack_bonus(elements)),
+        ("turning_undead", parse_turning_undead(elements)),
+        ("spells", parse_spells(elements)),
+        ("spell_list", parse_spell_list(elements)),
+        ("magic_items", parse_magic_items(_collect_part7_blocks(elements))),
+    ):
+        assert cleanup_payload(name, _clean_obj(parsed)) == _load(name), name
+
+    monsters = parse_monsters(elements)
+    expected = _load("monsters")
+    assert [m["name"] for m in monsters] == [m["name"] for m in expected]
+    assert [m["stat_block"] for m in cleanup_payload("monsters", monsters)] == [m["stat_block"] for m in expected]
+
+
+def test_scaling() -> None:
+    elements, _ = _parse(2)
+    spells = parse_spells(elements)
+    assert len(spells) == 2 * len(_load("spells")) and not any(s["warnings"] for s in spells)
+    assert {"Light*", "Light 2*"} <= {s["name"] for s in spells}
+    assert len(parse_spell_list(elements)["spell_levels"]) == 2 * len(_load("spell_list")["spell_levels"])
+    assert len(parse_monsters(elements)) == 2 * len(_load("monsters"))
+    assert len(cleanup_payload("weapons", parse_weapons(elements))) == 2 * len(_load("weapons"))
+    assert len(parse_magic_items(_collect_part7_blocks(elements))) == 2 * len(_load("magic_items"))
+    # Fixed rules tables keep their size.
+    assert len(parse_turning_undead(elements)["rows"]) == len(_load("turning_undead")["rows"])
+
+    try:
+        render_manual(scale=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("scale 0 accepted")
+
+
+def main() -> int:
+    tests = [
+        ("round_trip", test_round_trip),
+        ("scaling", test_scaling),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+"""Vectorized treasure hoard generator tests."""
+
+from __future__ import annotations
+
+import sys
+from fractions import Fraction
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.dice import expected_value
+from engines.treasure import (
+    OUTPUT_KEYS,
+    generate_hoards,
+    generate_mixed_hoards,
+    load_treasure_tables,
+    parse_amount_cell,
+    parse_gems_cell,
+    parse_magic_cell,
+    treasure_key,
+)
+
+
+def test_cell_parsing() -> None:
+    assert parse_amount_cell("50% 5d6") == "50% 5d6"
+    assert parse_amount_cell("90% 4d6x10") == "90% 4d6x10"
+    assert parse_amount_cell("* 8d10") == "100% 8d10"
+    assert parse_amount_cell("3d8") == "3d8"
+    assert parse_amount_cell("None") is None
+
+    assert parse_gems_cell("50% 6d6 50% 6d6") == ("50% 6d6", "50% 6d6")
+    assert parse_gems_cell("50% 1d4 None") == ("50% 1d4", None)
+    assert parse_gems_cell("None None") == (None, None)
+    assert parse_gems_cell("* 1d100 * 10d4", star_percent=40) == ("40% 1d100", "40% 10d4")
+
+    assert parse_magic_cell("30% any 3") == (Fraction(30), [("any", "3")])
+    assert parse_magic_cell("10% 1 weapon or armor") == (Fraction(10), [("weapon_or_armor", "1")])
+    assert parse_magic_cell("35% any 1d4 except weapons + 1 potion + 1 scroll") == (
+        Fraction(35),
+        [("any_except_weapons", "1d4"), ("potion", "1"), ("scroll", "1")],
+    )
+    assert parse_magic_cell("40% 2d4 potions") == (Fraction(40), [("potion", "2d4")])
+    assert parse_magic_cell("None") == (Fraction(0), [])
+
+
+def test_treasure_keys() -> None:
+    tables = load_treasure_tables("data")
+    assert treasure_key("h*") == "H"
+    assert treasure_key(5) == "unguarded 5"
+    assert treasure_key("12") == "unguarded 8"
+    for key in list("ABCDEFGHIJKLMNOPQRSTUV") + [f"unguarded {n}" for n in range(1, 9)]:
+        assert key in tables, key
+
+
+def test_generate_hoards() -> None:
+    tables = load_treasure_tables("data")
+    n = 200_000
+    hoards = generate_hoards(tables["A"], n, np.random.default_rng(3))
+    assert set(hoards) == set(OUTPUT_KEYS)
+    assert all(len(values) == n for values in hoards.values())
+
+    # Lair coins are "100's of": 50% 5d6 hundreds of copper.
+    assert hoards["cp"].max() <= 3000 and hoards["cp"].min() == 0
+    assert (hoards["cp"] % 100 == 0).all()
+    expected_cp = float(expected_value("50% 5d6")) * 100
+    assert abs(hoards["cp"].mean() - expected_cp) < 0.02 * expected_cp
+    assert abs((hoards["magic_any"] > 0).mean() - 0.30) < 0.01
+    assert set(np.unique(hoards["magic_any"])) <= {0, 3}
+
+    individual = generate_hoards(tables["P"], 1000, np.random.default_rng(3))
+    assert individual["cp"].min() >= 3 and individual["cp"].max() <= 24
+    assert not individual["gp"].any()
+
+
+def test_mixed_hoards_reproducible() -> None:
+    tables = load_treasure_tables("data")
+    keys = ["A", "P", "H*", 3, "A"] * 100
+    a = generate_mixed_hoards(tables, keys, np.random.default_rng(11))
+    b = generate_mixed_hoards(tables, keys, np.random.default_rng(11))
+    assert all((a[k] == b[k]).all() for k in OUTPUT_KEYS)
+    assert (a["sp"][1::5] == 0).all()
+    assert a["coin_value_gp"][2::5].mean() > a["coin_value_gp"][0::5].mean()
+
+
+def main() -> int:
+    tests = [
+        ("cell_parsing", test_cell_parsing),
+        ("treasure_keys", test_treasure_keys),
+        ("generate_hoards", test_generate_hoards),
+        ("mixed_hoards_reproducible", test_mixed_hoards_reproducible),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
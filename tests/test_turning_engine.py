@@ -0,0 +1,94 @@
+"""Vectorized turning undead resolver tests."""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from engines.turning import (
+    DESTROYED,
+    FAILED,
+    NEVER,
+    TURNED,
+    column_for_hit_dice,
+    load_turning_table,
+    parse_turning_cell,
+    resolve_turning,
+    turn_chance,
+    undead_column,
+)
+
+
+def test_compiled_table() -> None:
+    assert parse_turning_cell("13") == (13, False)
+    assert parse_turning_cell("T") == (1, False)
+    assert parse_turning_cell("D") == (1, True)
+    assert parse_turning_cell("No") == (NEVER, False)
+
+    table = load_turning_table("data")
+    assert table.undead[0] == "Skeleton" and table.undead[-1] == "Ghost"
+    assert table.needed.shape == (21, 9)
+    assert (table.needed[0] == NEVER).all()
+
+    skeleton, ghoul, ghost = (undead_column(table, name) for name in ("Skeleton", "ghoul", "Ghost"))
+    assert table.needed[1, skeleton] == 13 and table.needed[1, ghost] == NEVER
+    assert table.needed[8, skeleton] == 1 and not table.destroys[8, skeleton]
+    assert table.destroys[11, skeleton]
+    assert column_for_hit_dice(table, np.array([0, 1, 3, 9, 15])).tolist() == [skeleton, skeleton, ghoul, ghost, ghost]
+    assert column_for_hit_dice(table, 4) == undead_column(table, "Wight")
+
+    assert turn_chance(table, 1, skeleton) == 0.4
+    assert turn_chance(table, 1, ghost) == 0.0
+    assert turn_chance(table, 40, ghost) == turn_chance(table, 20, ghost)
+
+
+def test_resolve_turning() -> None:
+    table = load_turning_table("data")
+    rng = np.random.default_rng(5)
+    n = 20_000
+    levels = rng.integers(0, 21, size=n)
+    columns = rng.integers(0, len(table.undead), size=n)
+    results = resolve_turning(table, levels, columns, rng)
+
+    outcome = results["outcome"]
+    assert all(len(v) == n for v in results.values())
+    assert set(np.unique(outcome)) <= {FAILED, TURNED, DESTROYED}
+    assert (outcome[levels == 0] == FAILED).all()
+    assert ((results["hit_dice"] >= 2) & (results["hit_dice"] <= 12))[outcome != FAILED].all()
+    assert (results["hit_dice"][outcome == FAILED] == 0).all()
+    assert (results["creatures"][outcome != FAILED] >= 1).all()
+    # Destruction only happens on "D" cells.
+    assert table.destroys[levels[outcome == DESTROYED], columns[outcome == DESTROYED]].all()
+
+    # Observed success rate matches the exact table odds.
+    expected = turn_chance(table, levels, columns).mean()
+    assert abs((outcome != FAILED).mean() - expected) < 0.02
+
+    names = resolve_turning(table, [3, 3], ["Zombie", "Wight"], np.random.default_rng(1))
+    same = resolve_turning(table, [3, 3], [1, 3], np.random.default_rng(1))
+    assert all(np.array_equal(names[k], same[k]) for k in names)
+
+
+def main() -> int:
+    tests = [
+        ("compiled_table", test_compiled_table),
+        ("resolve_turning", test_resolve_turning),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
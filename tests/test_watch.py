@@ -0,0 +1,93 @@
+"""Watch-mode incremental rebuild tests."""
+
+from __future__ import annotations
+
+import filecmp
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from build import run_build
+from extract_text import elements_from_html, shared_documents
+from synthetic_manual import write_manual
+from watch import Watcher, affected_phases, changed_sections, scan_sections
+
+DOC = """<html><body>
+<p>Front matter</p>
+<p><font face="SoutaneBlack">Weapons</font></p>
+<table><tr><td>Dagger</td></tr></table>
+<div><p><font face="SoutaneBlack">Armor</font></p><p>{armor}</p></div>
+</body></html>"""
+
+
+def test_sections() -> None:
+    sections, markup = scan_sections(DOC.format(armor="Leather"))
+    assert [(s.title, s.start, s.end) for s in sections] == [("", 0, 1), ("Weapons", 1, 3), ("Armor", 3, 5)]
+    assert len(markup) == 5 and markup[2].startswith("<table>")
+
+    edited, _ = scan_sections(DOC.format(armor="Chain"))
+    assert changed_sections(sections, edited) == {2}
+    renamed, _ = scan_sections(DOC.format(armor="Leather").replace("Armor", "Shields"))
+    assert changed_sections(sections, renamed) is None
+
+    reads = {2: {1}, 3: {2}, 6: {0}, 7: set()}
+    assert affected_phases(reads, {1}) == [2, 6, 7]
+    assert affected_phases(reads, {2}) == [3, 7]
+    assert affected_phases(reads, set()) == []
+    assert affected_phases(reads, None) == [2, 3, 4, 5, 6, 7]
+
+
+def test_incremental_rebuild() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        html_path = str(Path(tmp) / "manual.html")
+        write_manual(html_path, 1)
+        data_dir = str(Path(tmp) / "data")
+        shutil.copytree("data", data_dir)
+
+        watcher = Watcher(html_path, data_dir)
+        first = watcher.build()
+        assert first.phases == [2, 3, 4, 5, 6, 7] and watcher.incremental
+        assert watcher.reads[4] and not watcher.reads[7]
+        assert watcher.update() is None  # same bytes
+
+        html = Path(html_path).read_text(encoding="utf-8")
+        monster = json.loads(Path(data_dir, "monsters.json").read_text(encoding="utf-8"))[5]
+        word = monster["description"].split()[3]
+        html = html.replace(f" {word} ", f" {word}zz ", 1)
+        Path(html_path).write_text(html, encoding="utf-8")
+        update = watcher.update()
+        assert update.reparsed == "sections" and 2 not in update.phases and update.phases[-1] == 7
+        assert watcher.elements == elements_from_html(html)
+
+        full_dir = str(Path(tmp) / "full")
+        shutil.copytree("data", full_dir)
+        with shared_documents():
+            run_build(full_dir, html_path)
+        comparison = filecmp.dircmp(data_dir, full_dir)
+        assert not comparison.diff_files, comparison.diff_files
+
+
+def main() -> int:
+    tests = [
+        ("sections", test_sections),
+        ("incremental_rebuild", test_incremental_rebuild),
+    ]
+    failed = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[PASS] {name}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())